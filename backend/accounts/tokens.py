@@ -0,0 +1,17 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TenantRefreshToken(RefreshToken):
+    """
+    Refresh token com o tenant e o papel do usuário nas claims.
+    As claims são copiadas para o access token (inclusive no refresh),
+    permitindo resolver tenant e permissões sem consultar o banco.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['tenant_id'] = user.tenant_id
+        token['tenant_slug'] = user.tenant.slug if user.tenant_id else None
+        token['is_tenant_admin'] = user.is_tenant_admin
+        return token
@@ -12,6 +12,7 @@ from .serializers import (
     LoginSerializer,
     ChangePasswordSerializer
 )
+from .tokens import TenantRefreshToken
 
 
 class LoginView(APIView):
@@ -32,7 +33,8 @@ class LoginView(APIView):
         user = authenticate(request, email=email, password=password)
 
         if user is not None:
-            refresh = RefreshToken.for_user(user)
+            # Tenant e papel do usuário vão nas claims do token
+            refresh = TenantRefreshToken.for_user(user)
 
             # Se "lembrar-me" estiver ativo, aumenta a validade dos tokens
             if remember_me:
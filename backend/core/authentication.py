@@ -0,0 +1,63 @@
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+
+from tenant.cache import get_tenant_by_id
+
+
+def is_stateless_token(token):
+    """Indica se o token pode ser usado sem consultar o usuário no banco"""
+    return getattr(settings, 'JWT_STATELESS_USER', False) and token.get('tenant_id') is not None
+
+
+class TenantTokenUser(TokenUser):
+    """
+    Usuário leve montado a partir das claims do token (tenant_id, tenant_slug,
+    is_tenant_admin), sem consultar a tabela de usuários.
+    Apenas para leitura: não pode ser salvo nem usado como FK.
+    """
+
+    @property
+    def tenant(self):
+        return get_tenant_by_id(self.token.get('tenant_id'))
+
+
+class TenantJWTAuthentication(JWTAuthentication):
+    """
+    Autenticação JWT que reaproveita o trabalho do TenantMiddleware:
+    o token já validado (request.jwt_token) e, se carregado, o usuário
+    (request.jwt_auth), evitando validar o token e buscar o usuário duas vezes
+    """
+
+    def authenticate(self, request):
+        django_request = request._request
+        cached = getattr(django_request, 'jwt_auth', None)
+        if cached is not None:
+            return cached
+
+        token = getattr(django_request, 'jwt_token', None)
+        if token is None:
+            return super().authenticate(request)
+
+        user = self.get_token_user(request, token)
+        tenant = getattr(django_request, 'tenant', None)
+        if tenant and getattr(user, 'tenant_id', None) == tenant.pk and not isinstance(user, TokenUser):
+            user.tenant = tenant
+        return user, token
+
+    def get_token_user(self, request, token):
+        return self.get_user(token)
+
+
+class TenantTokenUserAuthentication(TenantJWTAuthentication):
+    """
+    Com JWT_STATELESS_USER ativo, requisições de leitura (GET/HEAD/OPTIONS)
+    usam o TenantTokenUser das claims; escritas carregam o usuário do banco.
+    Usado nas listagens mais acessadas.
+    """
+
+    def get_token_user(self, request, token):
+        if request.method in SAFE_METHODS and is_stateless_token(token):
+            return TenantTokenUser(token)
+        return super().get_token_user(request, token)
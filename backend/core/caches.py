@@ -0,0 +1,59 @@
+"""
+Configuração do cache a partir de variáveis de ambiente
+
+Sem variáveis, usa a memória local de cada processo (desenvolvimento, um
+único processo). Com vários workers (gunicorn/uwsgi), use um cache
+compartilhado: as versões que invalidam dropdowns e análises ficam no cache,
+e em memória local só o worker que gravou enxerga a troca de versão.
+    CACHE_BACKEND=redis CACHE_URL=redis://cache:6379/1
+    CACHE_BACKEND=database   (crie a tabela com: python manage.py createcachetable)
+
+Variáveis:
+- CACHE_BACKEND: locmem (padrão), redis, database ou file
+- CACHE_URL: endereço do Redis (padrão: redis://localhost:6379/1)
+- CACHE_LOCATION: tabela do DatabaseCache (padrão: avila_cache) ou diretório
+  do FileBasedCache (padrão: data/cache)
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'database': 'django.core.cache.backends.db.DatabaseCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+}
+
+
+def cache_backend(env):
+    backend = env.get('CACHE_BACKEND', 'locmem').strip().lower()
+    if backend not in BACKENDS:
+        raise ImproperlyConfigured(
+            f"CACHE_BACKEND inválido: {backend!r}. Use {', '.join(BACKENDS)}."
+        )
+    return backend
+
+
+def cache_config(env, base_dir):
+    """
+    Monta o alias 'default' de CACHES
+
+    Args:
+        env: Variáveis de ambiente (os.environ)
+        base_dir: BASE_DIR do projeto (diretório padrão do cache em arquivo)
+    """
+    backend = cache_backend(env)
+    locations = {
+        'locmem': 'avila-default',
+        'redis': env.get('CACHE_URL') or 'redis://localhost:6379/1',
+        'database': env.get('CACHE_LOCATION') or 'avila_cache',
+        'file': env.get('CACHE_LOCATION') or base_dir / 'data' / 'cache',
+    }
+    return {
+        'BACKEND': BACKENDS[backend],
+        'LOCATION': locations[backend],
+    }
+
+
+def cache_is_shared(env):
+    """O cache é visto por todos os processos? (tudo menos a memória local)"""
+    return cache_backend(env) != 'locmem'
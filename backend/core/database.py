@@ -0,0 +1,150 @@
+"""
+Configuração do banco de dados a partir de variáveis de ambiente
+
+Sem variáveis, usa o SQLite local (desenvolvimento). Em produção:
+    DB_ENGINE=postgresql DB_NAME=avila DB_USER=avila DB_PASSWORD=... DB_HOST=db
+
+Variáveis:
+- DB_ENGINE: sqlite (padrão) ou postgresql
+- DB_NAME: arquivo do SQLite ou nome do banco no PostgreSQL
+- DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_SSLMODE: conexão do PostgreSQL
+- DB_CONN_MAX_AGE: segundos que a conexão fica aberta entre requests
+  (padrão: 0 no SQLite, 60 no PostgreSQL)
+- DB_CONN_HEALTH_CHECKS: testa a conexão persistente antes de reusar
+  (padrão: ligado no PostgreSQL)
+- DB_POOL: pool de conexões do psycopg (psycopg_pool) em cada processo, com
+  DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE e DB_POOL_TIMEOUT. Substitui as conexões
+  persistentes (o Django exige CONN_MAX_AGE = 0 com pool).
+- DB_SQLITE_TUNED: perfil de desempenho do SQLite (padrão: ligado), aplicado em
+  cada conexão nova: journal WAL (leituras não esperam pela importação que está
+  gravando), synchronous=NORMAL, busy_timeout, mmap, cache e temporários em
+  memória. Ajustes: DB_SQLITE_BUSY_TIMEOUT (ms), DB_SQLITE_MMAP_SIZE (bytes),
+  DB_SQLITE_CACHE_SIZE (páginas; negativo = KiB).
+- DB_REPLICA_HOST, DB_REPLICA_PORT, DB_REPLICA_NAME, DB_REPLICA_USER,
+  DB_REPLICA_PASSWORD: réplica de leitura (alias 'replica'); o que não for
+  informado vem do principal. DB_REPLICA=true liga o roteamento mesmo sem
+  elas (a réplica é o próprio banco principal, para testar localmente).
+"""
+import copy
+
+from django.core.exceptions import ImproperlyConfigured
+
+ENGINES = {
+    'sqlite': 'django.db.backends.sqlite3',
+    'postgresql': 'django.db.backends.postgresql',
+}
+
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+REPLICA_KEYS = ['HOST', 'PORT', 'NAME', 'USER', 'PASSWORD']
+
+
+def env_bool(env, name, default=False):
+    value = env.get(name)
+    if value is None or value == '':
+        return default
+    return value.strip().lower() in TRUE_VALUES
+
+
+def env_int(env, name, default):
+    value = env.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ImproperlyConfigured(f'{name} deve ser um número inteiro (recebido: {value!r})')
+
+
+def sqlite_options(env):
+    """
+    OPTIONS do SQLite com o perfil de desempenho (PRAGMAs executados pelo
+    Django a cada conexão nova, via init_command)
+
+    Com WAL, as transações usam BEGIN IMMEDIATE: quem vai gravar pega o lock
+    de escrita no início e espera o busy_timeout, em vez de falhar com
+    "database is locked" ao tentar promover uma leitura para escrita.
+    """
+    if not env_bool(env, 'DB_SQLITE_TUNED', True):
+        return {}
+
+    pragmas = [
+        'PRAGMA journal_mode = WAL',
+        'PRAGMA synchronous = NORMAL',
+        f"PRAGMA busy_timeout = {env_int(env, 'DB_SQLITE_BUSY_TIMEOUT', 20000)}",
+        f"PRAGMA mmap_size = {env_int(env, 'DB_SQLITE_MMAP_SIZE', 268435456)}",
+        f"PRAGMA cache_size = {env_int(env, 'DB_SQLITE_CACHE_SIZE', -65536)}",
+        'PRAGMA temp_store = MEMORY',
+    ]
+    return {
+        'init_command': '; '.join(pragmas),
+        'transaction_mode': 'IMMEDIATE',
+    }
+
+
+def database_config(env, base_dir):
+    """
+    Monta o alias 'default' de DATABASES
+
+    Args:
+        env: Variáveis de ambiente (os.environ)
+        base_dir: BASE_DIR do projeto (local padrão do SQLite)
+    """
+    engine = env.get('DB_ENGINE', 'sqlite').strip().lower()
+    if engine not in ENGINES:
+        raise ImproperlyConfigured(
+            f"DB_ENGINE inválido: {engine!r}. Use {' ou '.join(ENGINES)}."
+        )
+
+    if engine == 'sqlite':
+        return {
+            'ENGINE': ENGINES[engine],
+            'NAME': env.get('DB_NAME') or base_dir / 'db.sqlite3',
+            'CONN_MAX_AGE': env_int(env, 'DB_CONN_MAX_AGE', 0),
+            'CONN_HEALTH_CHECKS': env_bool(env, 'DB_CONN_HEALTH_CHECKS', False),
+            'OPTIONS': sqlite_options(env),
+        }
+
+    config = {
+        'ENGINE': ENGINES[engine],
+        'NAME': env.get('DB_NAME', 'avila'),
+        'USER': env.get('DB_USER', 'avila'),
+        'PASSWORD': env.get('DB_PASSWORD', ''),
+        'HOST': env.get('DB_HOST', 'localhost'),
+        'PORT': env.get('DB_PORT', '5432'),
+        'CONN_MAX_AGE': env_int(env, 'DB_CONN_MAX_AGE', 60),
+        'CONN_HEALTH_CHECKS': env_bool(env, 'DB_CONN_HEALTH_CHECKS', True),
+        'OPTIONS': {},
+    }
+    if env.get('DB_SSLMODE'):
+        config['OPTIONS']['sslmode'] = env['DB_SSLMODE']
+
+    if env_bool(env, 'DB_POOL'):
+        config['CONN_MAX_AGE'] = 0
+        config['OPTIONS']['pool'] = {
+            'min_size': env_int(env, 'DB_POOL_MIN_SIZE', 2),
+            'max_size': env_int(env, 'DB_POOL_MAX_SIZE', 10),
+            'timeout': env_int(env, 'DB_POOL_TIMEOUT', 10),
+        }
+
+    return config
+
+
+def replica_config(env, primary):
+    """
+    Monta o alias 'replica' de DATABASES a partir do principal.
+    Nos testes é espelho do 'default' (TEST MIRROR), sem banco próprio.
+    """
+    config = copy.deepcopy(primary)
+    for key in REPLICA_KEYS:
+        value = env.get(f'DB_REPLICA_{key}')
+        if value:
+            config[key] = value
+    config['TEST'] = {'MIRROR': 'default'}
+    return config
+
+
+def replica_enabled(env):
+    """Leituras pesadas vão para a réplica? (alguma DB_REPLICA_* ou DB_REPLICA=true)"""
+    configured = any(env.get(f'DB_REPLICA_{key}') for key in REPLICA_KEYS)
+    return env_bool(env, 'DB_REPLICA', configured)
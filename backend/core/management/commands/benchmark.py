@@ -0,0 +1,277 @@
+"""
+Benchmark dos endpoints mais usados, pelo test client do Django
+
+Mede cada cenário (listagem com filtros, dashboard, vencidas, fluxo de caixa,
+dropdowns, exportação e importação de planilhas) contra o banco configurado
+e grava p50/p95/p99, quantidade de queries e pico de memória em JSON, para
+comparar entre commits. Use com os dados do seed_data:
+    python manage.py seed_data --payables 50000
+    python manage.py benchmark --tenant bench-1 --output antes.json
+    python manage.py benchmark --tenant bench-1 --compare antes.json
+"""
+import io
+import json
+import math
+import subprocess
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from openpyxl import Workbook
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from accounts.tokens import TenantRefreshToken
+from payables.models import AccountPayable, ImportJob
+from registrations.models import Category, Filial, PaymentMethod, Supplier
+from tenant.models import Tenant
+
+PAYABLES_URL = '/api/payables/accounts-payable/'
+
+
+def percentile(values, pct):
+    """Percentil pelo método nearest-rank"""
+    ordered = sorted(values)
+    index = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Mede p50/p95/p99, queries e memória dos endpoints principais e grava o resultado em JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', required=True, help='Slug do tenant (ex.: bench-1 do seed_data)')
+        parser.add_argument('--iterations', type=int, default=20, help='Execuções medidas por cenário (padrão: 20)')
+        parser.add_argument('--warmup', type=int, default=2, help='Execuções de aquecimento por cenário (padrão: 2)')
+        parser.add_argument('--only', help='Cenários separados por vírgula (padrão: todos)')
+        parser.add_argument('--cold-cache', action='store_true',
+                            help='Limpa os caches antes de cada execução (mede sem cache)')
+        parser.add_argument('--import-rows', type=int, default=200,
+                            help='Linhas da planilha do cenário de importação (padrão: 200)')
+        parser.add_argument('--output', help='Arquivo JSON de saída (padrão: benchmark-<data>.json)')
+        parser.add_argument('--compare', help='JSON de uma execução anterior para comparar o p95')
+
+    def handle(self, *args, **options):
+        tenant = Tenant.objects.filter(slug=options['tenant']).first()
+        if tenant is None:
+            raise CommandError(f"Tenant '{options['tenant']}' não encontrado")
+        user = User.objects.filter(tenant=tenant, is_active=True).order_by('-is_tenant_admin', 'pk').first()
+        if user is None:
+            raise CommandError('O tenant não tem usuários ativos')
+
+        self.options = options
+        self.tenant = tenant
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {TenantRefreshToken.for_user(user).access_token}',
+            HTTP_X_TENANT_ID=tenant.slug,
+        )
+
+        scenarios = self.get_scenarios()
+        if options['only']:
+            names = options['only'].split(',')
+            unknown = set(names) - set(scenarios)
+            if unknown:
+                raise CommandError(f"Cenários desconhecidos: {', '.join(sorted(unknown))}")
+            scenarios = {name: scenarios[name] for name in names}
+
+        results = {}
+        # Sem instrumentação/log de SQL do DEBUG, como em produção
+        with override_settings(DEBUG=False, SQL_INSTRUMENTATION=False):
+            for name, request in scenarios.items():
+                results[name] = self.run_scenario(name, request)
+                self.stdout.write(
+                    f"{name:<22} p50={results[name]['p50_ms']:>8.1f}ms  p95={results[name]['p95_ms']:>8.1f}ms  "
+                    f"p99={results[name]['p99_ms']:>8.1f}ms  queries={results[name]['queries']:>4}  "
+                    f"mem={results[name]['peak_memory_kb']:>8.0f}KB"
+                )
+
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'commit': git_commit(),
+            'database': connection.vendor,
+            'tenant': tenant.slug,
+            'accounts': AccountPayable.objects.filter(tenant=tenant, is_active=True).count(),
+            'iterations': options['iterations'],
+            'cold_cache': options['cold_cache'],
+            'scenarios': results,
+        }
+        output = options['output'] or f"benchmark-{timezone.now():%Y%m%d-%H%M%S}.json"
+        with open(output, 'w') as file:
+            json.dump(report, file, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Resultado gravado em {output}'))
+
+        if options['compare']:
+            self.compare(options['compare'], results)
+
+    def get_scenarios(self):
+        """Cenários: nome -> callable que executa o request e retorna a resposta"""
+        branch = Filial.objects.filter(tenant=self.tenant).values_list('pk', flat=True).first()
+        today = date.today()
+
+        def get(url, params=None, stream=False):
+            def request():
+                response = self.client.get(url, params or {})
+                if stream and response.streaming:
+                    b''.join(response.streaming_content)
+                return response
+            return request
+
+        return {
+            'list': get(PAYABLES_URL),
+            'list_filtered': get(PAYABLES_URL, {
+                'status__in': 'pending,due,overdue',
+                'branch': branch,
+                'due_date__gte': today - timedelta(days=30),
+                'due_date__lte': today + timedelta(days=60),
+                'ordering': 'due_date',
+            }),
+            'list_search': get(PAYABLES_URL, {'search': 'aluguel'}),
+            'list_cursor': get(PAYABLES_URL, {'cursor': '', 'page_size': 100}),
+            'dashboard': get(f'{PAYABLES_URL}dashboard/'),
+            'overdue': get(f'{PAYABLES_URL}overdue/'),
+            'cash_flow': get(f'{PAYABLES_URL}cash_flow/', {'granularity': 'month', 'months': 12}),
+            'dropdown_suppliers': get('/api/registrations/suppliers/dropdown/'),
+            'registrations_bootstrap': get('/api/registrations/bootstrap/'),
+            'export_csv': get(f'{PAYABLES_URL}export/', {
+                'export_format': 'csv', 'due_date__gte': today - timedelta(days=90),
+            }, stream=True),
+            'export_xlsx': get(f'{PAYABLES_URL}export/', {
+                'export_format': 'xlsx', 'due_date__gte': today - timedelta(days=90),
+            }, stream=True),
+            'import_excel': self.import_request,
+        }
+
+    def run_scenario(self, name, request):
+        iterations = max(self.options['iterations'], 1)
+        cleanup = self.start_import() if name == 'import_excel' else None
+
+        for _ in range(self.options['warmup']):
+            self.clear_caches()
+            request()
+
+        timings = []
+        queries = []
+        status_code = None
+        for _ in range(iterations):
+            self.clear_caches()
+            with ExitStack() as stack:
+                # Todos os aliases (inclui as leituras na réplica, se ligada)
+                captured = [stack.enter_context(CaptureQueriesContext(conn)) for conn in connections.all()]
+                started = time.perf_counter()
+                response = request()
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(sum(len(ctx.captured_queries) for ctx in captured))
+            status_code = response.status_code
+
+        # Memória medida em uma execução separada (tracemalloc deixa o código mais lento)
+        self.clear_caches()
+        tracemalloc.start()
+        try:
+            request()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        if cleanup:
+            cleanup()
+
+        return {
+            'status': status_code,
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'p99_ms': round(percentile(timings, 99), 2),
+            'mean_ms': round(sum(timings) / len(timings), 2),
+            'min_ms': round(min(timings), 2),
+            'max_ms': round(max(timings), 2),
+            'queries': max(queries),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+    def clear_caches(self):
+        if self.options['cold_cache']:
+            for cache in caches.all():
+                cache.clear()
+
+    def start_import(self):
+        """
+        Importação síncrona (sem o worker) com a planilha gerada a partir dos
+        cadastros do tenant; as contas e importações criadas são removidas no fim
+        """
+        last_account = AccountPayable.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        last_job = ImportJob.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        self.import_sheet = self.build_import_sheet(self.options['import_rows'])
+        sync_import = override_settings(PAYABLES_IMPORT_ASYNC=False)
+        sync_import.enable()
+
+        def cleanup():
+            sync_import.disable()
+            AccountPayable.objects.filter(tenant=self.tenant, pk__gt=last_account).delete()
+            for job in ImportJob.objects.filter(tenant=self.tenant, pk__gt=last_job):
+                job.file.delete(save=False)
+                job.delete()
+
+        return cleanup
+
+    def import_request(self):
+        upload = io.BytesIO(self.import_sheet)
+        upload.name = 'benchmark.xlsx'
+        return self.client.post('/api/payables/import-jobs/', {'file': upload}, format='multipart')
+
+    def build_import_sheet(self, rows):
+        """Planilha no formato do modelo de importação com cadastros existentes"""
+        branch = Filial.objects.filter(tenant=self.tenant).first()
+        suppliers = list(Supplier.objects.filter(tenant=self.tenant)[:50])
+        category = Category.objects.filter(tenant=self.tenant).first()
+        method = PaymentMethod.objects.filter(tenant=self.tenant).first()
+        if not (branch and suppliers and category and method):
+            raise CommandError('O tenant precisa de filial, fornecedor, categoria e forma de pagamento')
+
+        wb = Workbook()
+        ws = wb.active
+        ws.append(['cabeçalho'] * 21)
+        due_date = date.today() + timedelta(days=30)
+        for i in range(rows):
+            supplier = suppliers[i % len(suppliers)]
+            values = {
+                0: branch.name, 1: branch.cnpj, 2: supplier.name, 3: supplier.cnpj,
+                4: category.name, 5: method.name, 6: f'BENCHMARK {i + 1}', 7: '150.00',
+                13: f'{due_date:%d/%m/%Y}', 15: 'due',
+            }
+            ws.append([values.get(col) for col in range(21)])
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        return buffer.getvalue()
+
+    def compare(self, path, results):
+        """Mostra a variação do p95 em relação a uma execução anterior"""
+        with open(path) as file:
+            baseline = json.load(file)['scenarios']
+        self.stdout.write(f'\nComparação com {path} (p95):')
+        for name, result in results.items():
+            before = baseline.get(name)
+            if not before or not before['p95_ms']:
+                continue
+            delta = (result['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+            style = self.style.ERROR if delta > 10 else self.style.SUCCESS if delta < -10 else str
+            self.stdout.write(style(
+                f"{name:<22} {before['p95_ms']:>8.1f}ms -> {result['p95_ms']:>8.1f}ms ({delta:+.0f}%) "
+                f"queries {before['queries']} -> {result['queries']}"
+            ))
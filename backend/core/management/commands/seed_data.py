@@ -0,0 +1,227 @@
+"""
+Gera dados sintéticos em volume de produção para testes de carga e benchmarks
+
+Cria tenants completos (usuário administrador, filiais, fornecedores,
+categorias, formas de pagamento, contas a pagar com recorrências, pagamentos
+e anexos) usando bulk_create. Exemplo:
+    python manage.py seed_data --tenants 2 --payables 50000
+    python manage.py benchmark --tenant bench-1
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import Attachment
+from payables.models import AccountPayable, PayablePayment
+from payables.services import build_recurrences, recalculate_paid_amounts
+from payables.summary import rebuild_daily_summary
+from registrations.models import Category, Filial, PaymentMethod, Supplier
+from tenant.models import Tenant
+
+User = get_user_model()
+
+DESCRIPTIONS = [
+    'ALUGUEL', 'ENERGIA ELÉTRICA', 'INTERNET', 'MANUTENÇÃO', 'LICENÇA DE SOFTWARE',
+    'FRETE', 'LIMPEZA', 'TELEFONIA', 'SEGURO', 'MATERIAL DE ESCRITÓRIO',
+    'CONSULTORIA', 'MARKETING', 'COMBUSTÍVEL', 'ÁGUA', 'CONTABILIDADE',
+]
+
+PAYMENT_METHODS = ['PIX', 'BOLETO', 'TRANSFERÊNCIA', 'CARTÃO DE CRÉDITO', 'DINHEIRO']
+
+FREQUENCIES = ['weekly', 'monthly', 'monthly', 'monthly', 'quarterly', 'annual']
+
+# Conteúdo dos anexos gerados (PDF mínimo)
+ATTACHMENT_CONTENT = b'%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n'
+
+
+class Command(BaseCommand):
+    help = 'Gera tenants com cadastros, contas a pagar, pagamentos e anexos sintéticos (bulk_create)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenants', type=int, default=1, help='Quantidade de tenants (padrão: 1)')
+        parser.add_argument('--prefix', default='bench', help='Prefixo do slug dos tenants (padrão: bench)')
+        parser.add_argument('--filials', type=int, default=3, help='Filiais por tenant (padrão: 3)')
+        parser.add_argument('--suppliers', type=int, default=100, help='Fornecedores por tenant (padrão: 100)')
+        parser.add_argument('--categories', type=int, default=20, help='Categorias por tenant (padrão: 20)')
+        parser.add_argument('--payables', type=int, default=10000,
+                            help='Contas por tenant, sem contar as recorrências geradas (padrão: 10000)')
+        parser.add_argument('--recurring', type=float, default=0.05,
+                            help='Fração das contas que são recorrentes (padrão: 0.05)')
+        parser.add_argument('--recurrences', type=int, default=12,
+                            help='Ocorrências de cada conta recorrente, incluindo a conta pai (padrão: 12)')
+        parser.add_argument('--payments', type=float, default=0.3,
+                            help='Fração das contas com pagamento, total ou parcial (padrão: 0.3)')
+        parser.add_argument('--attachments', type=float, default=0.02,
+                            help='Fração das contas com anexo (padrão: 0.02)')
+        parser.add_argument('--password', default='benchmark123', help='Senha do usuário administrador')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Registros por bulk_create (padrão: 2000)')
+        parser.add_argument('--seed', type=int, default=42, help='Semente aleatória (dados reproduzíveis)')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.chunk_size = options['chunk_size']
+        self.random = random.Random(options['seed'])
+        self.today = date.today()
+
+        slugs = [f"{options['prefix']}-{i + 1}" for i in range(options['tenants'])]
+        existing = list(Tenant.objects.filter(slug__in=slugs).values_list('slug', flat=True))
+        if existing:
+            raise CommandError(f"Tenants já existem: {', '.join(existing)}. Use outro --prefix.")
+
+        for index, slug in enumerate(slugs):
+            with transaction.atomic():
+                totals = self.seed_tenant(index, slug)
+            self.stdout.write(self.style.SUCCESS(
+                f"{slug}: {totals['accounts']} contas, {totals['payments']} pagamentos, "
+                f"{totals['attachments']} anexos (login: admin@{slug}.local / {options['password']})"
+            ))
+
+    def seed_tenant(self, index, slug):
+        tenant = Tenant.objects.create(
+            name=f'Empresa {slug.upper()}',
+            slug=slug,
+            email=f'contato@{slug}.local',
+        )
+        user = User.objects.create_user(
+            email=f'admin@{slug}.local',
+            password=self.options['password'],
+            first_name='Admin',
+            last_name=slug,
+            tenant=tenant,
+            is_tenant_admin=True,
+        )
+
+        branches = self.create_registrations(Filial, tenant, [
+            {'name': f'FILIAL {i + 1:02d}', 'cnpj': f'{index:02d}1{i:011d}'}
+            for i in range(self.options['filials'])
+        ])
+        suppliers = self.create_registrations(Supplier, tenant, [
+            {'name': f'FORNECEDOR {i + 1:05d}', 'cnpj': f'{index:02d}2{i:011d}'}
+            for i in range(self.options['suppliers'])
+        ])
+        categories = self.create_registrations(Category, tenant, [
+            {'name': f'CATEGORIA {i + 1:03d}'} for i in range(self.options['categories'])
+        ])
+        methods = self.create_registrations(PaymentMethod, tenant, [
+            {'name': name} for name in PAYMENT_METHODS
+        ])
+        registrations = (branches, suppliers, categories, methods)
+
+        accounts = []
+        parents = []
+        for offset in range(0, self.options['payables'], self.chunk_size):
+            size = min(self.chunk_size, self.options['payables'] - offset)
+            batch = [self.build_account(tenant, registrations) for _ in range(size)]
+            AccountPayable.objects.bulk_create(batch)
+            accounts.extend(batch)
+            parents.extend(account for account in batch if account.is_recurring)
+
+        children = []
+        for parent in parents:
+            children.extend(build_recurrences(parent, self.options['recurrences']))
+            if len(children) >= self.chunk_size:
+                AccountPayable.objects.bulk_create(children)
+                accounts.extend(children)
+                children = []
+        AccountPayable.objects.bulk_create(children)
+        accounts.extend(children)
+
+        payments = self.create_payments(tenant, accounts, methods)
+        attachments = self.create_attachments(slug, accounts, user)
+        rebuild_daily_summary(tenant)
+
+        return {'accounts': len(accounts), 'payments': payments, 'attachments': attachments}
+
+    def create_registrations(self, model, tenant, rows):
+        """Cria os cadastros em lote aplicando as regras do save()"""
+        objects = []
+        for row in rows:
+            obj = model(tenant=tenant, **row)
+            obj.apply_uppercase()
+            obj.refresh_normalized_name()
+            objects.append(obj)
+        return model.objects.bulk_create(objects, batch_size=self.chunk_size)
+
+    def build_account(self, tenant, registrations):
+        branches, suppliers, categories, methods = registrations
+        rnd = self.random
+        due_date = self.today + timedelta(days=rnd.randint(-365, 365))
+        is_recurring = rnd.random() < self.options['recurring']
+
+        account = AccountPayable(
+            tenant=tenant,
+            branch=rnd.choice(branches),
+            supplier=rnd.choice(suppliers),
+            category=rnd.choice(categories),
+            payment_method=rnd.choice(methods),
+            description=f'{rnd.choice(DESCRIPTIONS)} {due_date:%m/%Y}',
+            original_amount=Decimal(rnd.randint(1000, 500000)) / 100,
+            discount=Decimal(rnd.choice([0, 0, 0, 500, 1000])) / 100,
+            issue_date=due_date - timedelta(days=rnd.randint(0, 30)),
+            due_date=due_date,
+            status='due',
+            is_recurring=is_recurring,
+            recurrence_frequency=rnd.choice(FREQUENCIES) if is_recurring else None,
+            invoice_numbers=str(rnd.randint(1000, 999999)),
+        )
+        account.apply_uppercase()
+        account.refresh_amounts()
+        account.refresh_status()
+        account.refresh_search_document()
+        return account
+
+    def create_payments(self, tenant, accounts, methods):
+        """Paga (total ou parcialmente) uma fração das contas já vencidas ou próximas"""
+        rnd = self.random
+        horizon = self.today + timedelta(days=15)
+        candidates = [account for account in accounts if account.due_date <= horizon]
+        paid = [account for account in candidates if rnd.random() < self.options['payments']]
+
+        total = 0
+        for offset in range(0, len(paid), self.chunk_size):
+            batch = paid[offset:offset + self.chunk_size]
+            payments = []
+            for account in batch:
+                full = rnd.random() < 0.8
+                payments.append(PayablePayment(
+                    tenant=tenant,
+                    account_payable=account,
+                    payment_date=min(account.due_date + timedelta(days=rnd.randint(-5, 10)), self.today),
+                    amount=account.final_amount if full else (account.final_amount / 2).quantize(Decimal('0.01')),
+                    payment_method=rnd.choice(methods),
+                    paid_by_branch=account.branch,
+                ))
+            PayablePayment.objects.bulk_create(payments)
+            recalculate_paid_amounts(batch)
+            total += len(payments)
+        return total
+
+    def create_attachments(self, slug, accounts, user):
+        """Anexa um PDF pequeno a uma fração das contas"""
+        content_type = ContentType.objects.get_for_model(AccountPayable)
+        selected = [account for account in accounts if self.random.random() < self.options['attachments']]
+
+        attachments = []
+        for account in selected:
+            name = default_storage.save(
+                f'attachments/{slug}/payables/accountpayable/seed/{account.pk}.pdf',
+                ContentFile(ATTACHMENT_CONTENT)
+            )
+            attachments.append(Attachment(
+                content_type=content_type,
+                object_id=account.pk,
+                file=name,
+                original_filename=f'boleto-{account.pk}.pdf',
+                file_size=len(ATTACHMENT_CONTENT),
+                file_type='application/pdf',
+                uploaded_by=user,
+            ))
+        Attachment.objects.bulk_create(attachments, batch_size=self.chunk_size)
+        return len(attachments)
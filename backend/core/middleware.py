@@ -1,12 +1,23 @@
+import heapq
+import json
+import logging
 import threading
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
 from django.http import JsonResponse
 from django.contrib.auth import get_user_model
-from tenant.models import Tenant
+from core.authentication import is_stateless_token
+from core.replicas import get_replica_alias, pin_to_primary
+from tenant.cache import get_tenant_by_id, get_tenant_by_slug
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
 
 _thread_locals = threading.local()
 User = get_user_model()
+sql_logger = logging.getLogger('core.sql')
 
 class TenantMiddleware:
     """Middleware para identificar e validar tenant, suportando JWT antes do DRF processar"""
@@ -18,33 +29,49 @@ class TenantMiddleware:
     def __call__(self, request):
         tenant = None
 
-        # 1️⃣ - Tenta pegar o tenant pelo header customizado
+        # 1️⃣ - Tenta pegar o tenant pelo header customizado (cache por processo)
         tenant_slug = request.headers.get('X-Tenant-ID')
         if tenant_slug:
-            try:
-                tenant = Tenant.objects.get(slug=tenant_slug, is_active=True)
-            except Tenant.DoesNotExist:
+            tenant = get_tenant_by_slug(tenant_slug)
+            if tenant is None:
                 return JsonResponse({'error': 'Tenant não encontrado'}, status=404)
 
-        # 2️⃣ - Se não veio via header, tenta decodificar JWT manualmente
-        elif not getattr(request, 'user', None) or not request.user.is_authenticated:
+        # 2️⃣ - Valida o JWT uma única vez; o resultado fica no request
+        # (jwt_token/jwt_auth) e é reaproveitado pelo TenantJWTAuthentication do DRF
+        if not getattr(request, 'user', None) or not request.user.is_authenticated:
             auth_header = request.headers.get('Authorization')
             if auth_header and auth_header.startswith('Bearer '):
                 raw_token = auth_header.split('Bearer ')[1]
                 try:
                     validated_token = self.jwt_auth.get_validated_token(raw_token)
-                    user = self.jwt_auth.get_user(validated_token)
-                    request.user = user  # define manualmente o usuário autenticado
+                    request.jwt_token = validated_token
+
+                    if is_stateless_token(validated_token):
+                        # Modo stateless: tenant vem das claims, usuário só é carregado se a view precisar
+                        if not tenant:
+                            tenant = get_tenant_by_id(validated_token['tenant_id'])
+                            if tenant is None:
+                                return JsonResponse({'error': 'Tenant do usuário inválido ou inativo'}, status=403)
+                    else:
+                        user = self.jwt_auth.get_user(validated_token)
+                        request.user = user  # define manualmente o usuário autenticado
+                        request.jwt_auth = (user, validated_token)
                 except (InvalidToken, AuthenticationFailed):
-                    return JsonResponse({'error': 'Token inválido ou expirado'}, status=401)
+                    # Com tenant no header, a decisão fica com o DRF (ex.: login com token expirado)
+                    if not tenant_slug:
+                        return JsonResponse({'error': 'Token inválido ou expirado'}, status=401)
 
         # 3️⃣ - Se já tem usuário autenticado (via JWT ou sessão), usa o tenant dele
         if not tenant and getattr(request, 'user', None) and request.user.is_authenticated:
-            if hasattr(request.user, 'tenant') and request.user.tenant and request.user.tenant.is_active:
-                tenant = request.user.tenant
-            else:
+            tenant = get_tenant_by_id(getattr(request.user, 'tenant_id', None))
+            if tenant is None:
                 return JsonResponse({'error': 'Tenant do usuário inválido ou inativo'}, status=403)
 
+        # Reaproveita o tenant do cache no usuário (evita nova query ao acessar user.tenant)
+        user = getattr(request, 'user', None)
+        if tenant and user and user.is_authenticated and getattr(user, 'tenant_id', None) == tenant.pk:
+            user.tenant = tenant
+
         # 4️⃣ - Adiciona tenant ao request e registra na thread
         request.tenant = tenant
         if tenant:
@@ -57,3 +84,120 @@ class TenantMiddleware:
             delattr(_thread_locals, 'request')
 
         return response
+
+
+class QueryMetrics:
+    """
+    Wrapper de execução do banco (connection.execute_wrapper) que acumula
+    quantidade de queries, tempo total de SQL e as queries mais lentas
+    """
+
+    def __init__(self, keep_slowest=3):
+        self.count = 0
+        self.duration = 0.0
+        self.keep_slowest = keep_slowest
+        self.slowest = []  # heap de (duração, ordem, sql)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            item = (duration, self.count, sql)
+            if len(self.slowest) < self.keep_slowest:
+                heapq.heappush(self.slowest, item)
+            elif self.keep_slowest:
+                heapq.heappushpop(self.slowest, item)
+
+    def slowest_queries(self):
+        return [
+            {'ms': round(duration * 1000, 2), 'sql': sql[:500]}
+            for duration, _, sql in sorted(self.slowest, reverse=True)
+        ]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Mede as queries de cada request: quantidade, tempo total de SQL e as mais
+    lentas, identificadas por tenant e view. Os números vão no header
+    Server-Timing (visível no DevTools do navegador) e em uma linha de log
+    JSON no logger 'core.sql'.
+
+    Ativado por SQL_INSTRUMENTATION (None segue o DEBUG); desligado, o
+    middleware não é carregado.
+    Fica antes do TenantMiddleware para contar também as queries de autenticação.
+    """
+
+    def __init__(self, get_response):
+        enabled = getattr(settings, 'SQL_INSTRUMENTATION', None)
+        if enabled is None:
+            enabled = settings.DEBUG
+        if not enabled:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.keep_slowest = getattr(settings, 'SQL_INSTRUMENTATION_SLOWEST', 3)
+        self.query_warning = getattr(settings, 'SQL_INSTRUMENTATION_QUERY_WARNING', 50)
+
+    def __call__(self, request):
+        metrics = QueryMetrics(self.keep_slowest)
+        started = time.perf_counter()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            response = self.get_response(request)
+
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = metrics.duration * 1000
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={db_ms:.1f};desc="SQL ({metrics.count} queries)"',
+            f'app;dur={total_ms - db_ms:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ])
+
+        tenant = getattr(request, 'tenant', None)
+        match = getattr(request, 'resolver_match', None)
+        payload = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'view': match.view_name if match else None,
+            'tenant': tenant.slug if tenant else None,
+            'queries': metrics.count,
+            'db_ms': round(db_ms, 1),
+            'total_ms': round(total_ms, 1),
+            'slowest': metrics.slowest_queries(),
+        }
+        level = logging.WARNING if metrics.count > self.query_warning else logging.INFO
+        sql_logger.log(level, json.dumps(payload), extra={'sql_metrics': payload})
+
+        return response
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Read-your-writes com réplica de leitura: depois de uma gravação bem-sucedida
+    (POST/PUT/PATCH/DELETE), as leituras do usuário ficam no banco principal por
+    REPLICA_STICKY_SECONDS, marcadas em um cookie assinado (ver core.replicas).
+    Sem réplica, não é carregado.
+    """
+
+    def __init__(self, get_response):
+        if not get_replica_alias():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            # O DRF repassa o usuário autenticado (JWT) para o request do Django
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(request, response, user.pk)
+
+        return response
@@ -11,12 +11,19 @@ class UppercaseMixin:
     # Defina esta lista em cada model que usar o mixin
     uppercase_fields = []
 
-    def save(self, *args, **kwargs):
-        """Converte campos especificados para uppercase antes de salvar"""
+    def apply_uppercase(self):
+        """
+        Converte campos especificados para uppercase.
+        Útil em operações em lote (bulk_create), que não chamam save().
+        """
         for field_name in self.uppercase_fields:
             value = getattr(self, field_name, None)
             if value and isinstance(value, str):
                 setattr(self, field_name, value.upper())
+
+    def save(self, *args, **kwargs):
+        """Converte campos especificados para uppercase antes de salvar"""
+        self.apply_uppercase()
         super().save(*args, **kwargs)
 
 
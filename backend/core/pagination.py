@@ -1,7 +1,16 @@
 """
 Configurações customizadas de paginação
 """
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError as DRFValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class LargeResultsSetPagination(PageNumberPagination):
@@ -12,3 +21,160 @@ class LargeResultsSetPagination(PageNumberPagination):
     page_size = 50  # Padrão
     page_size_query_param = 'page_size'  # Permite ?page_size=X
     max_page_size = 2000  # Máximo permitido
+
+
+def estimate_count(queryset):
+    """
+    Quantidade aproximada de registros do queryset.
+    No PostgreSQL usa a estimativa do planejador (EXPLAIN, sem varrer a tabela);
+    nos demais bancos faz o COUNT(*) exato.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]['Plan']['Plan Rows']
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) em (campo, id)
+
+    A view define o campo em `keyset_field` (ex.: 'due_date'). Cada página filtra
+    a partir do último registro da anterior (WHERE campo < x OR (campo = x AND id < y)),
+    então o custo por página é constante, sem OFFSET e sem COUNT(*).
+
+    Parâmetros:
+    - ?cursor= : primeira página; as seguintes usam o link 'next'
+    - ?page_size=X
+    - ?ordering=<campo> : ordem crescente (padrão decrescente)
+    - ?count=exact|estimate : inclui o total (opcional)
+
+    Outras ordenações (inclusive a relevância da busca) não cabem no cursor
+    e são rejeitadas com 400, em vez de ignoradas.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 2000
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Cursor inválido'
+    invalid_ordering_message = (
+        'A paginação por cursor só ordena por {field}. '
+        'Use ?page=N para ordenar por outros campos ou pela relevância da busca.'
+    )
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def encode_cursor(self, value, pk):
+        raw = json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value, pk])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            return model._meta.get_field(self.field).to_python(value), int(pk)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def is_descending(self, queryset):
+        """
+        Direção do cursor a partir da ordenação já aplicada ao queryset
+        (OrderingFilter). Só aceita o campo do cursor, com o id de desempate.
+        """
+        ordering = list(queryset.query.order_by)
+        if not ordering:
+            return True
+        tiebreak = {'id', '-id', 'pk', '-pk'}
+        first, rest = ordering[0], ordering[1:]
+        if first not in (self.field, f'-{self.field}') or not set(rest) <= tiebreak:
+            raise DRFValidationError({'ordering': self.invalid_ordering_message.format(field=self.field)})
+        return first.startswith('-')
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == 'exact':
+            return queryset.count()
+        if mode == 'estimate':
+            return estimate_count(queryset)
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field = getattr(view, 'keyset_field', 'created_at')
+        self.descending = self.is_descending(queryset)
+        self.count = self.get_count(queryset, request)
+
+        prefix = '-' if self.descending else ''
+        queryset = queryset.order_by(f'{prefix}{self.field}', f'{prefix}id')
+
+        cursor = self.decode_cursor(request, queryset.model)
+        if cursor:
+            value, pk = cursor
+            lookup = 'lt' if self.descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value}) |
+                Q(**{self.field: value, f'id__{lookup}': pk})
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        results = results[:self.page_size]
+        self.last = results[-1] if results else None
+        return results
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            self.encode_cursor(getattr(self.last, self.field), self.last.pk)
+        )
+
+    def get_paginated_response(self, data):
+        response = {'next': self.get_next_link(), 'results': data}
+        if self.count is not None:
+            response['count'] = self.count
+        return Response(response)
+
+
+class CursorOrPageNumberPagination(LargeResultsSetPagination):
+    """
+    Paginação por página (padrão) ou por cursor quando ?cursor está presente.
+    Tabelas com scroll infinito e exportações usam o cursor; as telas
+    paginadas continuam usando ?page=N.
+    """
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,141 @@
+"""
+Leituras pesadas na réplica do banco
+
+O ReplicaRouter só envia leituras para a réplica (settings.REPLICA_DATABASE)
+dentro de read_from_replica(); fora disso, e em transações abertas no banco
+principal, tudo vai para o 'default'. Cada view escolhe quais ações podem ler
+da réplica com ReplicaReadMixin (apenas GET/HEAD/OPTIONS).
+
+Read-your-writes: o ReplicaStickinessMiddleware marca o usuário que acabou de
+gravar com um cookie assinado, e por REPLICA_STICKY_SECONDS as leituras dele
+continuam no principal (a réplica pode estar atrasada). O cookie vai junto com
+o request, então vale em qualquer worker ou servidor, sem estado compartilhado.
+
+Respostas guardadas em cache com chave por versão (dropdowns, fluxo de caixa)
+são montadas com read_from_primary(): uma leitura atrasada da réplica ficaria
+no cache sob a versão nova até expirar.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+# Alias usado nas leituras do request atual (None: banco principal)
+_read_alias = ContextVar('replica_read_alias', default=None)
+
+
+def get_replica_alias():
+    """Alias da réplica configurada (None quando desligada)"""
+    return getattr(settings, 'REPLICA_DATABASE', None)
+
+
+@contextmanager
+def read_from_replica(alias=None):
+    """Envia as leituras do bloco para a réplica"""
+    token = _read_alias.set(alias or get_replica_alias())
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def read_from_primary():
+    """Força as leituras do bloco no banco principal (ex.: antes de gravar)"""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+STICKY_COOKIE_SALT = 'core.replicas.pinned'
+
+
+def _sticky_cookie():
+    return getattr(settings, 'REPLICA_STICKY_COOKIE', 'replica_pinned')
+
+
+def _sticky_seconds():
+    return getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+
+
+def pin_to_primary(request, response, user_id):
+    """Mantém as leituras do usuário no principal por REPLICA_STICKY_SECONDS"""
+    timeout = _sticky_seconds()
+    if timeout:
+        response.set_signed_cookie(
+            _sticky_cookie(), str(user_id), salt=STICKY_COOKIE_SALT,
+            max_age=timeout, httponly=True, samesite='Lax', secure=request.is_secure(),
+        )
+
+
+def is_pinned(request, user_id):
+    """O cookie do request marca este usuário e ainda está no prazo?"""
+    timeout = _sticky_seconds()
+    if not timeout:
+        return False
+    value = request.get_signed_cookie(
+        _sticky_cookie(), default=None, salt=STICKY_COOKIE_SALT, max_age=timeout
+    )
+    return value == str(user_id)
+
+
+class ReplicaRouter:
+    """Roteador: leituras na réplica apenas quando ativado pelo request"""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        # Tabela do DatabaseCache: as versões de invalidação vêm do principal
+        if model._meta.app_label == 'django_cache':
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, get_replica_alias()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # A réplica recebe o schema pela replicação
+        if db != DEFAULT_DB_ALIAS and db == get_replica_alias():
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Mixin de views DRF: as ações em `replica_actions` leem da réplica nos
+    métodos seguros, exceto logo depois de o usuário gravar (read-your-writes).
+    Em APIView (sem ações), use o nome do método: replica_actions = ('get',).
+    """
+    replica_actions = ()
+
+    def should_read_from_replica(self, request):
+        action = getattr(self, 'action', None) or request.method.lower()
+        if not get_replica_alias() or request.method not in SAFE_METHODS:
+            return False
+        if action not in self.replica_actions:
+            return False
+        user = getattr(request, 'user', None)
+        return not (user and user.is_authenticated and is_pinned(request, user.pk))
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.should_read_from_replica(request):
+            self._replica_token = _read_alias.set(get_replica_alias())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _read_alias.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
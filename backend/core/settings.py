@@ -14,6 +14,9 @@ from pathlib import Path
 from datetime import timedelta
 import os
 
+from core.caches import cache_config, cache_is_shared
+from core.database import database_config, replica_config, replica_enabled
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -70,6 +73,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.QueryInstrumentationMiddleware',  # Métricas de SQL (SQL_INSTRUMENTATION)
+    'core.middleware.ReplicaStickinessMiddleware',  # Read-your-writes da réplica (REPLICA_DATABASE)
     'core.middleware.TenantMiddleware',  # Middleware de tenant
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -97,13 +102,16 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# Configurado por variáveis de ambiente (DB_ENGINE, DB_NAME, DB_HOST, DB_POOL...),
+# ver core/database.py. Sem variáveis, usa o SQLite local.
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(os.environ, BASE_DIR),
 }
+DATABASES['replica'] = replica_config(os.environ, DATABASES['default'])  # Ver "Réplica de leitura"
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    INSTALLED_APPS.append('django.contrib.postgres')  # Busca full-text e trigram
 
 
 # Password validation
@@ -157,7 +165,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # ========================================
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.TenantJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -176,6 +184,75 @@ REST_FRAMEWORK = {
     'MAX_PAGE_SIZE': 2000,  # Limite máximo de registros por página
 }
 
+# ========================================
+# Multi-tenancy
+# ========================================
+TENANT_CACHE_TTL = 300  # Segundos que um tenant fica no cache do TenantMiddleware
+
+# ========================================
+# Réplica de leitura
+# ========================================
+# Listagens, dashboard, vencidas e exportações leem da réplica (ReplicaReadMixin);
+# o resto, as respostas guardadas em cache e todas as gravações usam o 'default'.
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+REPLICA_DATABASE = 'replica' if replica_enabled(os.environ) else None  # None: tudo no principal
+REPLICA_STICKY_SECONDS = 15  # Após gravar, o usuário lê do principal por esse tempo
+REPLICA_STICKY_COOKIE = 'replica_pinned'  # Cookie assinado que guarda essa marcação
+
+# ========================================
+# Instrumentação de SQL
+# ========================================
+# Header Server-Timing e log JSON (logger 'core.sql') com queries e tempo de SQL
+# de cada request. Desligado, o middleware não é carregado (custo zero).
+SQL_INSTRUMENTATION = None  # None: segue o DEBUG; True/False força por ambiente
+SQL_INSTRUMENTATION_SLOWEST = 3  # Queries mais lentas incluídas no log
+SQL_INSTRUMENTATION_QUERY_WARNING = 50  # Acima disso o log sai como WARNING (provável N+1)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.sql': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+# ========================================
+# Cache
+# ========================================
+# Configurado por variáveis de ambiente (CACHE_BACKEND, CACHE_URL...), ver
+# core/caches.py. Sem variáveis, memória local de cada processo.
+CACHES = {
+    'default': cache_config(os.environ, BASE_DIR),
+}
+# Em memória local a invalidação só vale no processo que gravou: com vários
+# workers os outros servem a cópia antiga até expirar, então as entradas
+# duram segundos. Com cache compartilhado (Redis, banco) podem durar mais.
+SHARED_CACHE = cache_is_shared(os.environ)
+REGISTRATIONS_CACHE = 'default'  # Alias usado pelos dropdowns de cadastros
+REGISTRATIONS_CACHE_TIMEOUT = 3600 if SHARED_CACHE else 30  # Segundos
+PAYABLES_CACHE = 'default'  # Alias usado pelas análises de contas a pagar (fluxo de caixa)
+PAYABLES_CACHE_TIMEOUT = 900 if SHARED_CACHE else 30  # Segundos
+
+# ========================================
+# Importação de Contas a Pagar (Excel)
+# ========================================
+PAYABLES_IMPORT_CHUNK_SIZE = 1000  # Contas inseridas por bulk_create
+PAYABLES_IMPORT_MAX_ROWS = 100000  # Limite de linhas por planilha
+PAYABLES_IMPORT_ASYNC = True  # Processa importações em segundo plano
+PAYABLES_IMPORT_WORKERS = 2  # Threads do worker de importação
+PAYABLES_IMPORT_EXTERNAL_WORKER = False  # True: só o comando process_imports processa (sem threads no web)
+PAYABLES_IMPORT_STALE_AFTER = 900  # Segundos sem progresso para considerar uma importação interrompida
+PAYABLES_EXPORT_CHUNK_SIZE = 2000  # Linhas lidas do banco por vez na exportação
+
 # ========================================
 # JWT Configuration
 # ========================================
@@ -201,6 +278,11 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Leituras nas listagens usam o usuário das claims do token (tenant_id,
+# is_tenant_admin), sem consultar a tabela de usuários. Alterações no usuário
+# só valem a partir do próximo token.
+JWT_STATELESS_USER = False
+
 # ========================================
 # CORS Configuration
 # ========================================
@@ -0,0 +1,398 @@
+import io
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.core.cache import caches
+from django.db import OperationalError, connections, transaction
+from django.db.utils import ConnectionHandler
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.caches import cache_config, cache_is_shared
+from core.database import database_config, replica_config, replica_enabled
+from core.models import Attachment
+from core.replicas import read_from_replica
+from payables.models import AccountPayable, PayableDailySummary, PayablePayment
+from payables.services import sweep_overdue
+from registrations.models import Category
+from tenant.models import Tenant
+
+User = get_user_model()
+
+
+@override_settings(SQL_INSTRUMENTATION=True)
+class QueryInstrumentationTests(TestCase):
+    """Testes do QueryInstrumentationMiddleware (Server-Timing + log de SQL)"""
+
+    url = '/api/registrations/categories/'
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(
+            name='Empresa Metricas', slug='empresa-metricas', email='metricas@teste.com'
+        )
+        self.user = User.objects.create_user(
+            email='metricas@teste.com', password='senha123',
+            first_name='Usuario', last_name='Metricas', tenant=self.tenant
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client.credentials(HTTP_X_TENANT_ID=self.tenant.slug)
+
+    def test_header_e_log_por_request(self):
+        """A resposta traz Server-Timing e o log identifica tenant, view e queries"""
+        with self.assertLogs('core.sql', logging.INFO) as logs:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+        payload = json.loads(logs.records[0].getMessage())
+        self.assertEqual(payload['tenant'], 'empresa-metricas')
+        self.assertEqual(payload['view'], 'category-list')
+        self.assertGreater(payload['queries'], 0)
+        self.assertLessEqual(len(payload['slowest']), 3)
+        self.assertIn(f"{payload['queries']} queries", response['Server-Timing'])
+
+    @override_settings(SQL_INSTRUMENTATION_QUERY_WARNING=0)
+    def test_alerta_acima_do_limite(self):
+        """Requests com muitas queries são registrados como WARNING"""
+        with self.assertLogs('core.sql', logging.INFO) as logs:
+            self.client.get(self.url)
+        self.assertEqual(logs.records[0].levelno, logging.WARNING)
+
+    @override_settings(SQL_INSTRUMENTATION=False)
+    def test_desligado(self):
+        """Desligado, o middleware não é carregado"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class SeedAndBenchmarkTests(TestCase):
+    """Testes dos comandos seed_data e benchmark"""
+
+    def seed(self, **options):
+        defaults = {
+            'tenants': 1, 'payables': 40, 'suppliers': 5, 'categories': 3, 'filials': 2,
+            'recurring': 0.2, 'recurrences': 3, 'payments': 0.5, 'attachments': 0.1,
+            'stdout': io.StringIO(),
+        }
+        defaults.update(options)
+        call_command('seed_data', **defaults)
+
+    def test_seed_data(self):
+        """Gera cadastros, contas com recorrências, pagamentos, anexos e o resumo diário"""
+        self.seed()
+
+        tenant = Tenant.objects.get(slug='bench-1')
+        self.assertTrue(User.objects.filter(email='admin@bench-1.local', is_tenant_admin=True).exists())
+
+        accounts = AccountPayable.objects.filter(tenant=tenant)
+        parents = accounts.filter(is_recurring=True, recurring_parent__isnull=True).count()
+        self.assertEqual(accounts.count(), 40 + parents * 2)
+        self.assertTrue(PayablePayment.objects.filter(tenant=tenant).exists())
+        self.assertTrue(Attachment.objects.filter(object_id__in=accounts.values('pk')).exists())
+
+        # Valores pagos recalculados e resumo diário consistente com as contas
+        paid = accounts.filter(paid_amount__gt=0).first()
+        self.assertEqual(paid.remaining_amount, max(paid.final_amount - paid.paid_amount, 0))
+        summary = PayableDailySummary.objects.filter(tenant=tenant)
+        self.assertEqual(sum(summary.values_list('count', flat=True)), accounts.count())
+
+    def test_seed_data_prefixo_existente(self):
+        """Não sobrescreve tenants já gerados"""
+        self.seed(payables=5)
+        with self.assertRaises(CommandError):
+            self.seed(payables=5)
+
+    def test_benchmark(self):
+        """Mede os cenários e grava p50/p95/queries/memória em JSON"""
+        self.seed(payables=30, attachments=0)
+        output = os.path.join(tempfile.mkdtemp(), 'benchmark.json')
+
+        call_command(
+            'benchmark', tenant='bench-1', iterations=2, warmup=0,
+            only='list,dashboard,import_excel', import_rows=5,
+            output=output, stdout=io.StringIO()
+        )
+
+        with open(output) as file:
+            report = json.load(file)
+        self.assertEqual(report['tenant'], 'bench-1')
+        self.assertEqual(set(report['scenarios']), {'list', 'dashboard', 'import_excel'})
+        for result in report['scenarios'].values():
+            self.assertIn(result['status'], (200, 201, 202))
+            for key in ('p50_ms', 'p95_ms', 'p99_ms', 'queries', 'peak_memory_kb'):
+                self.assertIn(key, result)
+
+        # A importação do benchmark remove as contas que criou
+        self.assertEqual(AccountPayable.objects.filter(description__startswith='BENCHMARK').count(), 0)
+
+    def test_benchmark_cenario_desconhecido(self):
+        self.seed(payables=5)
+        with self.assertRaises(CommandError):
+            call_command('benchmark', tenant='bench-1', only='nada', stdout=io.StringIO())
+
+
+class DatabaseConfigTests(TestCase):
+    """Testes da configuração do banco por variáveis de ambiente"""
+
+    base_dir = Path('/srv/avila')
+
+    def test_padrao_sqlite(self):
+        """Sem variáveis, usa o SQLite local sem conexão persistente e com o perfil de desempenho"""
+        config = database_config({}, self.base_dir)
+        self.assertEqual(config['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(config['NAME'], self.base_dir / 'db.sqlite3')
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+        self.assertIn('PRAGMA journal_mode = WAL', config['OPTIONS']['init_command'])
+        self.assertEqual(config['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+
+        config = database_config({'DB_SQLITE_TUNED': 'false'}, self.base_dir)
+        self.assertEqual(config['OPTIONS'], {})
+
+    def test_postgresql_conexoes_persistentes(self):
+        config = database_config({
+            'DB_ENGINE': 'postgresql', 'DB_NAME': 'financeiro', 'DB_HOST': 'db',
+            'DB_PASSWORD': 'segredo', 'DB_SSLMODE': 'require',
+        }, self.base_dir)
+        self.assertEqual(config['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual((config['NAME'], config['HOST'], config['PORT']), ('financeiro', 'db', '5432'))
+        self.assertEqual(config['CONN_MAX_AGE'], 60)
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])
+        self.assertEqual(config['OPTIONS'], {'sslmode': 'require'})
+
+    def test_postgresql_pool(self):
+        """Com pool, CONN_MAX_AGE fica em 0 (exigência do Django)"""
+        config = database_config({
+            'DB_ENGINE': 'postgresql', 'DB_POOL': 'true', 'DB_CONN_MAX_AGE': '300',
+            'DB_POOL_MAX_SIZE': '20',
+        }, self.base_dir)
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+        self.assertEqual(config['OPTIONS']['pool'], {'min_size': 2, 'max_size': 20, 'timeout': 10})
+
+    def test_replica(self):
+        """A réplica herda do principal o que não for informado e é espelho nos testes"""
+        env = {'DB_ENGINE': 'postgresql', 'DB_POOL': 'true', 'DB_REPLICA_HOST': 'db-replica'}
+        primary = database_config(env, self.base_dir)
+        replica = replica_config(env, primary)
+        self.assertEqual((replica['HOST'], replica['NAME']), ('db-replica', 'avila'))
+        self.assertEqual(replica['OPTIONS']['pool'], primary['OPTIONS']['pool'])
+        self.assertEqual(replica['TEST'], {'MIRROR': 'default'})
+        self.assertTrue(replica_enabled(env))
+        self.assertFalse(replica_enabled({}))
+        self.assertTrue(replica_enabled({'DB_REPLICA': 'true'}))
+
+    def test_valores_invalidos(self):
+        with self.assertRaises(ImproperlyConfigured):
+            database_config({'DB_ENGINE': 'oracle'}, self.base_dir)
+        with self.assertRaises(ImproperlyConfigured):
+            database_config({'DB_CONN_MAX_AGE': 'sempre'}, self.base_dir)
+
+
+class CacheConfigTests(TestCase):
+    """Testes da configuração do cache por variáveis de ambiente"""
+
+    base_dir = Path('/srv/avila')
+
+    def test_padrao_memoria_local(self):
+        config = cache_config({}, self.base_dir)
+        self.assertEqual(config['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache')
+        self.assertFalse(cache_is_shared({}))
+
+    def test_backends_compartilhados(self):
+        env = {'CACHE_BACKEND': 'redis', 'CACHE_URL': 'redis://cache:6379/2'}
+        config = cache_config(env, self.base_dir)
+        self.assertEqual(config['BACKEND'], 'django.core.cache.backends.redis.RedisCache')
+        self.assertEqual(config['LOCATION'], 'redis://cache:6379/2')
+        self.assertTrue(cache_is_shared(env))
+
+        config = cache_config({'CACHE_BACKEND': 'database'}, self.base_dir)
+        self.assertEqual(config['LOCATION'], 'avila_cache')
+        config = cache_config({'CACHE_BACKEND': 'file'}, self.base_dir)
+        self.assertEqual(config['LOCATION'], self.base_dir / 'data' / 'cache')
+
+    def test_backend_invalido(self):
+        with self.assertRaises(ImproperlyConfigured):
+            cache_config({'CACHE_BACKEND': 'memcached'}, self.base_dir)
+
+
+class SQLiteTuningTests(TestCase):
+    """
+    Perfil de desempenho do SQLite: com WAL, uma importação com a transação de
+    escrita aberta não bloqueia as leituras (dashboard, listagens)
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.handlers = []
+
+    def tearDown(self):
+        for handler in self.handlers:
+            handler.close_all()
+        self.directory.cleanup()
+
+    def connect(self, env):
+        """Duas conexões independentes (escrita e leitura) no mesmo arquivo"""
+        config = database_config({**env, 'DB_NAME': os.path.join(self.directory.name, 'db.sqlite3')}, None)
+        config['OPTIONS'].setdefault('timeout', 0.2)  # Sem o perfil: falha rápido em vez de esperar 5s
+        handler = ConnectionHandler({'default': config, 'reader': {**config, 'OPTIONS': dict(config['OPTIONS'])}})
+        self.handlers.append(handler)
+        with handler['default'].cursor() as cursor:
+            cursor.execute('CREATE TABLE conta (id INTEGER PRIMARY KEY, valor TEXT)')
+            cursor.execute("INSERT INTO conta (valor) VALUES ('inicial')")
+        return handler['default'], handler['reader']
+
+    def read_during_import(self, env):
+        """
+        Lê enquanto outra conexão mantém uma transação exclusiva aberta com
+        dados não confirmados (como a importação no commit de um lote grande)
+        """
+        writer, reader = self.connect(env)
+        with writer.cursor() as cursor:
+            cursor.execute('BEGIN EXCLUSIVE')
+            cursor.execute("INSERT INTO conta (valor) VALUES ('importada')")
+            try:
+                with reader.cursor() as read:
+                    read.execute('SELECT COUNT(*) FROM conta')
+                    return read.fetchone()[0]
+            finally:
+                cursor.execute('ROLLBACK')
+
+    def test_leitura_nao_bloqueada_pela_importacao(self):
+        self.assertEqual(self.read_during_import({}), 1)  # Vê o último estado confirmado
+
+    def test_sem_perfil_leitura_bloqueada(self):
+        """Referência: no journal padrão a mesma leitura falha com 'database is locked'"""
+        with self.assertRaisesMessage(OperationalError, 'database is locked'):
+            self.read_during_import({'DB_SQLITE_TUNED': 'false'})
+
+    def test_pragmas_aplicados(self):
+        writer, _ = self.connect({})
+        with writer.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 20000)
+            cursor.execute('PRAGMA temp_store')
+            self.assertEqual(cursor.fetchone()[0], 2)  # MEMORY
+
+
+@override_settings(REPLICA_DATABASE='replica', SQL_INSTRUMENTATION=False)
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Roteamento de leituras para a réplica com dois aliases ('replica' é espelho
+    do 'default' nos testes; TransactionTestCase para a réplica enxergar os
+    dados confirmados)
+    """
+
+    databases = {'default', 'replica'}
+    payables_url = '/api/payables/accounts-payable/'
+    categories_url = '/api/registrations/categories/'
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.tenant = Tenant.objects.create(
+            name='Empresa Replica', slug='empresa-replica', email='replica@teste.com'
+        )
+        self.user = User.objects.create_user(
+            email='replica@teste.com', password='senha123',
+            first_name='Usuario', last_name='Replica', tenant=self.tenant
+        )
+        Category.objects.create(tenant=self.tenant, name='Aluguel')
+        sweep_overdue()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client.credentials(HTTP_X_TENANT_ID=self.tenant.slug)
+
+    def request(self, method, url, data=None):
+        """Executa o request e retorna (resposta, SQL no principal, SQL na réplica)"""
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = getattr(self.client, method)(url, data, format='json')
+            if response.streaming:
+                b''.join(response.streaming_content)
+        return response, [q['sql'] for q in primary], [q['sql'] for q in replica]
+
+    def test_leituras_pesadas_na_replica(self):
+        """Listagem, dashboard, vencidas e exportação leem da réplica"""
+        for path in ['', 'dashboard/', 'overdue/', 'export/']:
+            with self.subTest(path=path):
+                response, primary, replica = self.request('get', self.payables_url + path)
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(any('payables_' in sql for sql in replica))
+                self.assertFalse(any('payables_' in sql for sql in primary))
+
+    def test_respostas_em_cache_montadas_no_principal(self):
+        """Dropdowns, bootstrap e fluxo de caixa ficam no cache sob a versão atual: leem do principal"""
+        urls = [
+            f'{self.categories_url}dropdown/',
+            '/api/registrations/bootstrap/',
+            f'{self.payables_url}cash_flow/',
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response, primary, replica = self.request('get', url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(replica, [])
+                self.assertTrue(primary)
+
+    def test_le_do_principal_apos_gravar(self):
+        """Read-your-writes: depois de gravar, o usuário lê do principal"""
+        response, _, _ = self.request('post', self.categories_url, {'name': 'Energia'})
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('replica_pinned', response.cookies)
+
+        # A marcação vem no cookie do request, não do cache do processo
+        for cache in caches.all():
+            cache.clear()
+        response, primary, replica = self.request('get', self.payables_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(replica, [])
+        self.assertTrue(any('payables_' in sql for sql in primary))
+
+    def test_cookie_de_outro_usuario_ignorado(self):
+        self.request('post', self.categories_url, {'name': 'Energia'})
+        other = User.objects.create_user(
+            email='outro@teste.com', password='senha123',
+            first_name='Outro', last_name='Usuario', tenant=self.tenant
+        )
+        self.client.force_authenticate(other)
+
+        _, _, replica = self.request('get', self.payables_url)
+        self.assertTrue(any('payables_' in sql for sql in replica))
+
+    def test_acoes_fora_da_politica(self):
+        """Detalhes e CRUD continuam no principal"""
+        _, _, replica = self.request('get', self.categories_url)
+        self.assertEqual(replica, [])
+
+    @override_settings(REPLICA_DATABASE=None)
+    def test_desligado(self):
+        _, _, replica = self.request('get', self.payables_url)
+        self.assertEqual(replica, [])
+
+    def test_roteador(self):
+        """Gravações e transações abertas ficam no principal"""
+        with read_from_replica():
+            self.assertEqual(Category.objects.all().db, 'replica')
+            category = Category.objects.get(name='ALUGUEL')
+            with transaction.atomic():
+                self.assertEqual(Category.objects.all().db, 'default')
+        self.assertEqual(Category.objects.all().db, 'default')
+
+        category.color = '#000000'
+        category.save()
+        self.assertEqual(category._state.db, 'default')
@@ -0,0 +1,21 @@
+"""
+Funções utilitárias compartilhadas entre os apps
+"""
+import unicodedata
+
+
+def normalize_text(value):
+    """
+    Normaliza texto para busca: remove acentos, converte para minúsculas e
+    colapsa espaços. Ex.: 'Manutenção  Elétrica' -> 'manutencao eletrica'
+    """
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(value))
+    without_accents = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(without_accents.lower().split())
+
+
+def normalize_name(value):
+    """Nome normalizado para autocomplete: sem acentos e em maiúsculo"""
+    return normalize_text(value).upper()
@@ -7,8 +7,10 @@ from django.shortcuts import render, redirect
 from django.http import HttpResponseRedirect
 
 from core.admin import BaseAdmin
-from .models import AccountPayable, PayablePayment
-from .excel_import import export_template_excel, import_excel
+from .models import AccountPayable, PayablePayment, ImportJob
+from .excel_import import export_template_excel
+from .jobs import enqueue_import
+from .services import bulk_mark_as_paid, bulk_cancel
 
 
 @admin.register(AccountPayable)
@@ -98,18 +100,14 @@ class AccountPayableAdmin(BaseAdmin):
     actions = ['mark_as_paid_action', 'cancel_accounts']
 
     def mark_as_paid_action(self, request, queryset):
-        """Marca contas selecionadas como pagas"""
-        updated = 0
-        for account in queryset:
-            if account.status != 'paid':
-                account.mark_as_paid()
-                updated += 1
+        """Marca contas selecionadas como pagas (um único UPDATE)"""
+        updated = bulk_mark_as_paid(queryset)
         messages.success(request, f'{updated} contas marcadas como pagas com sucesso.')
     mark_as_paid_action.short_description = 'Marcar como Paga'
 
     def cancel_accounts(self, request, queryset):
-        """Cancela contas selecionadas"""
-        updated = queryset.update(status='cancelled')
+        """Cancela contas selecionadas (um único UPDATE)"""
+        updated = bulk_cancel(queryset)
         messages.warning(request, f'{updated} contas canceladas.')
     cancel_accounts.short_description = 'Cancelar Contas Selecionadas'
 
@@ -127,45 +125,37 @@ class AccountPayableAdmin(BaseAdmin):
         return export_template_excel(request)
 
     def importar_excel_view(self, request):
-        """View para importação do Excel"""
+        """
+        View para importação do Excel.
+        A planilha é processada em segundo plano; o resultado fica
+        disponível em "Importações de Contas".
+        """
         if request.method == 'POST' and request.FILES.get('excel_file'):
             excel_file = request.FILES['excel_file']
 
             # Valida extensão
-            if not excel_file.name.endswith(('.xlsx', '.xls')):
-                messages.error(request, 'Por favor, envie um arquivo Excel (.xlsx ou .xls)')
+            if not excel_file.name.endswith('.xlsx'):
+                messages.error(request, 'Por favor, envie um arquivo Excel (.xlsx)')
                 return redirect('..')
 
             # Obtém o tenant do usuário logado
-            if not hasattr(request.user, 'tenant'):
+            if not getattr(request.user, 'tenant', None):
                 messages.error(request, 'Usuário sem tenant associado. Entre em contato com o administrador.')
                 return redirect('..')
 
-            tenant = request.user.tenant
-
-            # Processa importação
-            resultado = import_excel(request, excel_file, tenant)
-
-            # Exibe mensagens
-            if resultado['sucesso'] > 0:
-                messages.success(request, f"{resultado['sucesso']} contas importadas com sucesso!")
-
-            for aviso in resultado['avisos']:
-                messages.warning(request, aviso)
-
-            for erro in resultado['erros']:
-                messages.error(request, erro)
-
-            # Mostra resumo de criações
-            if resultado['criados']['filiais']:
-                messages.info(request, f"Filiais criadas: {', '.join(resultado['criados']['filiais'])}")
-            if resultado['criados']['fornecedores']:
-                messages.info(request, f"Fornecedores criados: {', '.join(resultado['criados']['fornecedores'])}")
-            if resultado['criados']['categorias']:
-                messages.info(request, f"Categorias criadas: {', '.join(resultado['criados']['categorias'])}")
-            if resultado['criados']['metodos_pagamento']:
-                messages.info(request, f"Métodos de pagamento criados: {', '.join(resultado['criados']['metodos_pagamento'])}")
+            job = ImportJob.objects.create(
+                tenant=request.user.tenant,
+                file=excel_file,
+                original_filename=excel_file.name,
+                created_by=request.user,
+            )
+            enqueue_import(job)
 
+            messages.info(
+                request,
+                f"Importação de '{excel_file.name}' iniciada em segundo plano. "
+                f"Acompanhe o andamento em Importações de Contas."
+            )
             return redirect('..')
 
         # Se não for POST, redireciona
@@ -206,3 +196,31 @@ class PayablePaymentAdmin(BaseAdmin):
         return f"R$ {obj.amount:,.2f}"
     amount_display.short_description = "Valor Pago"
 
+
+@admin.register(ImportJob)
+class ImportJobAdmin(BaseAdmin):
+    list_display = [
+        'original_filename', 'status', 'percent_display', 'success_count',
+        'errors_count', 'created_by', 'started_at', 'finished_at'
+    ]
+    list_filter = ['status']
+    search_fields = ['original_filename']
+    readonly_fields = [
+        'file', 'original_filename', 'status', 'total_rows', 'processed_rows',
+        'success_count', 'errors', 'warnings', 'created_records', 'created_by',
+        'started_at', 'finished_at', 'created_at', 'updated_at'
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_search_fields(self, request):
+        return self.search_fields
+
+    def percent_display(self, obj):
+        return f"{obj.percent}%"
+    percent_display.short_description = "Progresso"
+
+    def errors_count(self, obj):
+        return len(obj.errors or [])
+    errors_count.short_description = "Erros"
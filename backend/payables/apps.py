@@ -1,7 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class PayablesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'payables'
     verbose_name = 'Contas a Pagar'
+
+    def ready(self):
+        from . import signals
+
+        post_migrate.connect(signals.create_search_index, sender=self)
@@ -0,0 +1,41 @@
+"""
+Cache das análises de contas a pagar (fluxo de caixa)
+
+As respostas ficam no cache configurado em PAYABLES_CACHE, separadas por
+tenant e parâmetros. Cada tenant tem uma versão, trocada a cada escrita em
+contas (payables.summary.refresh_daily_summary, chamado por todos os caminhos
+de escrita), o que torna as entradas antigas inacessíveis.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def get_cache():
+    return caches[getattr(settings, 'PAYABLES_CACHE', 'default')]
+
+
+def get_timeout():
+    return getattr(settings, 'PAYABLES_CACHE_TIMEOUT', 900)
+
+
+def _version_key(tenant_id):
+    return f'payables:version:{tenant_id}'
+
+
+def get_version(tenant_id):
+    """Versão atual das análises do tenant (criada se ainda não existir)"""
+    cache = get_cache()
+    key = _version_key(tenant_id)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key)
+    return version
+
+
+def invalidate(tenant_id):
+    """Troca a versão das análises do tenant (descarta o cache)"""
+    get_cache().set(_version_key(tenant_id), uuid.uuid4().hex, None)
@@ -0,0 +1,208 @@
+"""
+Agregações do dashboard de contas a pagar
+
+Todas as estatísticas são calculadas no banco com agregação condicional
+(Count/Sum com filter=Q), evitando uma query por indicador e evitando que o
+frontend precise baixar todas as contas para montar os gráficos.
+
+Quando recebe o resumo diário (PayableDailySummary), os indicadores de
+contas em aberto, o top de fornecedores e os vencimentos por dia são lidos
+dele; só os pagamentos por data de pagamento continuam nas contas.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import PayableDailySummary
+
+OPEN_STATUSES = ['pending', 'due', 'overdue']
+
+ZERO = Decimal('0.00')
+
+
+def _sum(expression, condition):
+    """Soma condicional que retorna 0 em vez de NULL"""
+    return Coalesce(
+        Sum(expression, filter=condition),
+        ZERO,
+        output_field=DecimalField(max_digits=14, decimal_places=2)
+    )
+
+
+def _count(source, condition=None):
+    """Quantidade de contas: COUNT nas contas ou soma de `count` no resumo"""
+    if source.model is PayableDailySummary:
+        return Coalesce(Sum('count', filter=condition), 0)
+    return Count('id', filter=condition)
+
+
+def _due_date(source):
+    """Campo de vencimento da origem (contas ou resumo)"""
+    return 'date' if source.model is PayableDailySummary else 'due_date'
+
+
+def get_period(start=None, end=None, today=None):
+    """
+    Retorna o período (início, fim) dos gráficos.
+    Padrão: mês corrente.
+    """
+    today = today or date.today()
+    if not start:
+        start = today.replace(day=1)
+    if not end:
+        next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        end = next_month - timedelta(days=1)
+    return start, end
+
+
+def get_kpis(queryset, today=None, summary=None):
+    """
+    Calcula todos os indicadores do dashboard em uma única query
+    (duas com o resumo: aberto no resumo, pagos no mês nas contas)
+    """
+    today = today or date.today()
+    month_start = today.replace(day=1)
+    next_7_days = today + timedelta(days=7)
+    source = queryset if summary is None else summary
+    due_date = _due_date(source)
+
+    open_q = Q(status__in=OPEN_STATUSES)
+    overdue_q = Q(status='overdue')
+    paid_month_q = Q(status='paid', payment_date__gte=month_start, payment_date__lte=today)
+    next_7_q = Q(status__in=['pending', 'due'], **{f'{due_date}__gte': today, f'{due_date}__lte': next_7_days})
+
+    open_kpis = dict(
+        total_pending=_count(source, open_q),
+        total_overdue=_count(source, overdue_q),
+        amount_pending=_sum('remaining_amount', open_q),
+        amount_overdue=_sum('remaining_amount', overdue_q),
+        due_next_7_days=_count(source, next_7_q),
+        amount_due_next_7_days=_sum('remaining_amount', next_7_q),
+    )
+    paid_kpis = dict(
+        total_paid_this_month=Count('id', filter=paid_month_q),
+        amount_paid_this_month=_sum('paid_amount', paid_month_q),
+    )
+
+    if summary is None:
+        return queryset.aggregate(**open_kpis, **paid_kpis)
+
+    stats = summary.aggregate(**open_kpis)
+    stats.update(queryset.aggregate(**paid_kpis))
+    return stats
+
+
+def get_top_suppliers(queryset, limit=5):
+    """Top fornecedores com mais valor a pagar (das contas ou do resumo)"""
+    return list(
+        queryset.filter(
+            status__in=OPEN_STATUSES
+        ).values(
+            'supplier__id',
+            'supplier__name'
+        ).annotate(
+            count=_count(queryset),
+            total_amount=Sum('remaining_amount')
+        ).order_by('-total_amount')[:limit]
+    )
+
+
+def get_daily_buckets(queryset, start, end, summary=None):
+    """
+    Agrupa por dia os valores a vencer (por data de vencimento) e os valores
+    pagos (por data de pagamento) dentro do período.
+
+    Usa duas queries agrupadas (GROUP BY due_date / GROUP BY payment_date);
+    com o resumo, os vencimentos vêm dele.
+    """
+    buckets = {}
+
+    def bucket(day):
+        if day not in buckets:
+            buckets[day] = {
+                'date': day,
+                'due_count': 0,
+                'due_amount': ZERO,
+                'paid_count': 0,
+                'paid_amount': ZERO,
+            }
+        return buckets[day]
+
+    due_source = queryset if summary is None else summary
+    due_date = _due_date(due_source)
+
+    due_rows = due_source.filter(**{
+        f'{due_date}__gte': start,
+        f'{due_date}__lte': end,
+    }).exclude(
+        status='cancelled'
+    ).values(day=F(due_date)).annotate(
+        count=_count(due_source),
+        amount=Sum('final_amount')
+    ).order_by()
+
+    for row in due_rows:
+        item = bucket(row['day'])
+        item['due_count'] = row['count']
+        item['due_amount'] = row['amount'] or ZERO
+
+    paid_rows = queryset.filter(
+        payment_date__gte=start,
+        payment_date__lte=end,
+        paid_amount__gt=0
+    ).values('payment_date').annotate(
+        count=Count('id'),
+        amount=Sum('paid_amount')
+    ).order_by()
+
+    for row in paid_rows:
+        item = bucket(row['payment_date'])
+        item['paid_count'] = row['count']
+        item['paid_amount'] = row['amount'] or ZERO
+
+    return [buckets[day] for day in sorted(buckets)]
+
+
+def get_weekly_buckets(daily):
+    """Consolida os buckets diários em semanas (segunda a domingo)"""
+    weeks = {}
+    for item in daily:
+        week_start = item['date'] - timedelta(days=item['date'].weekday())
+        week = weeks.setdefault(week_start, {
+            'week_start': week_start,
+            'week_end': week_start + timedelta(days=6),
+            'due_count': 0,
+            'due_amount': ZERO,
+            'paid_count': 0,
+            'paid_amount': ZERO,
+        })
+        for key in ('due_count', 'due_amount', 'paid_count', 'paid_amount'):
+            week[key] += item[key]
+    return [weeks[key] for key in sorted(weeks)]
+
+
+def build_dashboard(queryset, start=None, end=None, today=None, summary=None):
+    """
+    Monta a resposta completa do dashboard:
+    - Indicadores (1 query com agregação condicional; 2 com o resumo)
+    - Top fornecedores (1 query)
+    - Buckets diários e semanais de vencimentos e pagamentos (2 queries)
+
+    Args:
+        queryset: Contas do tenant
+        summary: Linhas de PayableDailySummary do mesmo tenant (opcional)
+    """
+    today = today or date.today()
+    start, end = get_period(start, end, today)
+
+    stats = get_kpis(queryset, today, summary)
+    stats['top_suppliers'] = get_top_suppliers(queryset if summary is None else summary)
+
+    daily = get_daily_buckets(queryset, start, end, summary)
+    stats['period'] = {'start': start, 'end': end}
+    stats['daily'] = daily
+    stats['weekly'] = get_weekly_buckets(daily)
+
+    return stats
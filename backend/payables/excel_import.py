@@ -1,17 +1,51 @@
 """
 Módulo para importação e exportação de contas a pagar via Excel
 """
-from django.http import HttpResponse
-from django.contrib import messages
+import csv
+import tempfile
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.db import transaction
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment
-from datetime import datetime
-from decimal import Decimal
+from contextlib import nullcontext
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 
 from .models import AccountPayable
+from .summary import account_keys, refresh_daily_summary
+from registrations.cache import invalidate as invalidate_dropdown
 from registrations.models import Supplier, Filial, Category, PaymentMethod
 
 
+# Cabeçalhos da planilha modelo (a exportação usa as mesmas colunas,
+# permitindo reimportar o arquivo exportado)
+TEMPLATE_HEADERS = [
+    "Nome da Filial",
+    "CNPJ da Filial (opcional)",
+    "Nome do Fornecedor",
+    "CNPJ do Fornecedor (opcional)",
+    "Categoria",
+    "Método Pagamento",
+    "Descrição",
+    "Valor Original",
+    "Desconto",
+    "Juros",
+    "Multa",
+    "Valor Pago",
+    "Data Emissão (DD/MM/AAAA)",
+    "Data Vencimento (DD/MM/AAAA)",
+    "Data Pagamento (DD/MM/AAAA)",
+    "Status",
+    "Nº Nota Fiscal",
+    "Nº Boleto",
+    "Observações",
+    "É Recorrente? (SIM/NAO)",
+    "Frequência Recorrência",
+]
+
+
 def export_template_excel(request):
     """
     Gera e exporta uma planilha modelo para importação de contas a pagar
@@ -25,33 +59,8 @@ def export_template_excel(request):
     header_font = Font(bold=True, color="FFFFFF")
     header_alignment = Alignment(horizontal="center", vertical="center")
 
-    # Cabeçalhos
-    headers = [
-        "Nome da Filial",
-        "CNPJ da Filial (opcional)",
-        "Nome do Fornecedor",
-        "CNPJ do Fornecedor (opcional)",
-        "Categoria",
-        "Método Pagamento",
-        "Descrição",
-        "Valor Original",
-        "Desconto",
-        "Juros",
-        "Multa",
-        "Valor Pago",
-        "Data Emissão (DD/MM/AAAA)",
-        "Data Vencimento (DD/MM/AAAA)",
-        "Data Pagamento (DD/MM/AAAA)",
-        "Status",
-        "Nº Nota Fiscal",
-        "Nº Boleto",
-        "Observações",
-        "É Recorrente? (SIM/NAO)",
-        "Frequência Recorrência",
-    ]
-
     # Escreve cabeçalhos
-    for col_num, header in enumerate(headers, 1):
+    for col_num, header in enumerate(TEMPLATE_HEADERS, 1):
         cell = ws.cell(row=1, column=col_num)
         cell.value = header
         cell.fill = header_fill
@@ -196,313 +205,546 @@ def export_template_excel(request):
     return response
 
 
-def import_excel(request, file, tenant):
-    """
-    Importa contas a pagar de um arquivo Excel
+# Quantidade de contas inseridas por bulk_create
+IMPORT_CHUNK_SIZE = getattr(settings, 'PAYABLES_IMPORT_CHUNK_SIZE', 1000)
 
-    Args:
-        request: Request do Django
-        file: Arquivo Excel enviado
-        tenant: Instância do Tenant para o qual importar
+# Quantidade máxima de linhas aceitas por planilha (None = sem limite)
+IMPORT_MAX_ROWS = getattr(settings, 'PAYABLES_IMPORT_MAX_ROWS', None)
+
+STATUS_VALIDOS = [choice[0] for choice in AccountPayable.STATUS_CHOICES]
 
-    Returns:
-        dict: Resultado da importação com sucesso, erros e avisos
-    """
-    try:
-        wb = load_workbook(file)
-        ws = wb.active
 
-        resultado = {
-            'sucesso': 0,
-            'erros': [],
-            'avisos': [],
-            'criados': {
-                'filiais': [],
-                'fornecedores': [],
-                'categorias': [],
-                'metodos_pagamento': []
-            }
+def _novo_resultado():
+    return {
+        'sucesso': 0,
+        'erros': [],
+        'avisos': [],
+        'criados': {
+            'filiais': [],
+            'fornecedores': [],
+            'categorias': [],
+            'metodos_pagamento': []
         }
+    }
 
-        # Pula o cabeçalho (linha 1)
-        for row_num, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
-            # Pula linhas vazias
-            if not any(row):
-                continue
-
-            try:
-                # Extrai dados da linha (colunas atualizadas)
-                filial_nome = row[0]
-                filial_cnpj = row[1] if row[1] else None  # CNPJ agora é opcional
-                fornecedor_nome = row[2]
-                fornecedor_cnpj = row[3] if row[3] else None  # CNPJ agora é opcional
-                categoria_nome = row[4]
-                metodo_pagamento_nome = row[5]
-                descricao = row[6]
-                valor_original = row[7]
-                desconto = row[8] if row[8] not in [None, ''] else 0
-                juros = row[9] if row[9] not in [None, ''] else 0
-                multa = row[10] if row[10] not in [None, ''] else 0
-                valor_pago = row[11] if row[11] not in [None, ''] else 0
-                data_emissao = row[12] if row[12] else None
-                data_vencimento = row[13]
-                data_pagamento = row[14] if row[14] else None
-                status = row[15] if row[15] else 'due'  # Status padrão: 'due' (À Vencer)
-                nf_numero = row[16] if row[16] else ''
-                boleto_numero = row[17] if row[17] else ''
-                observacoes = row[18] if row[18] else ''
-                is_recurring = row[19] if row[19] else None
-                recurrence_frequency = row[20] if row[20] else None
-
-                # Validações básicas - apenas campos obrigatórios
-                if not all([filial_nome, fornecedor_nome, categoria_nome, metodo_pagamento_nome, descricao, valor_original, data_vencimento]):
-                    resultado['erros'].append(
-                        f"Linha {row_num}: Campos obrigatórios faltando. "
-                        f"Verifique: Nome Filial, Nome Fornecedor, Categoria, Método Pagamento, Descrição, Valor Original e Data Vencimento"
-                    )
-                    continue
-
-                # === BUSCA OU CRIA FILIAL ===
-                filial = get_or_create_filial(filial_nome, filial_cnpj, tenant, resultado)
-
-                # === BUSCA OU CRIA FORNECEDOR ===
-                fornecedor = get_or_create_supplier(fornecedor_nome, fornecedor_cnpj, tenant, resultado)
-
-                # === BUSCA OU CRIA CATEGORIA ===
-                categoria = get_or_create_category(categoria_nome, tenant, resultado)
-
-                # === BUSCA OU CRIA MÉTODO DE PAGAMENTO ===
-                metodo_pagamento = get_or_create_payment_method(metodo_pagamento_nome, tenant, resultado)
-
-                # Valida status
-                status_validos = ['pending', 'due', 'overdue', 'paid', 'partially_paid', 'cancelled']
-                if status.lower() not in status_validos:
-                    resultado['avisos'].append(
-                        f"Linha {row_num}: Status '{status}' inválido. Usando 'due' (À Vencer). "
-                        f"Valores válidos: {', '.join(status_validos)}"
-                    )
-                    status = 'due'
-                else:
-                    status = status.lower()
-
-                # Processa datas
-                if isinstance(data_vencimento, str):
-                    data_vencimento = datetime.strptime(data_vencimento, "%d/%m/%Y").date()
-                elif hasattr(data_vencimento, 'date'):
-                    # Se for datetime do Excel, converte para date
-                    data_vencimento = data_vencimento.date()
-
-                if data_emissao:
-                    if isinstance(data_emissao, str):
-                        data_emissao = datetime.strptime(data_emissao, "%d/%m/%Y").date()
-                    elif hasattr(data_emissao, 'date'):
-                        # Se for datetime do Excel, converte para date
-                        data_emissao = data_emissao.date()
-                else:
-                    data_emissao = datetime.now().date()
-
-                if data_pagamento:
-                    if isinstance(data_pagamento, str):
-                        data_pagamento = datetime.strptime(data_pagamento, "%d/%m/%Y").date()
-                    elif hasattr(data_pagamento, 'date'):
-                        # Se for datetime do Excel, converte para date
-                        data_pagamento = data_pagamento.date()
-                else:
-                    data_pagamento = None
-
-                # Processa recorrência
-                is_recurring_bool = False
-                if isinstance(is_recurring, str):
-                    is_recurring_bool = is_recurring.upper() in ['SIM', 'YES', 'S', 'Y']
-
-                # Cria a conta a pagar
-                account = AccountPayable.objects.create(
-                    tenant=tenant,
-                    branch=filial,
-                    supplier=fornecedor,
-                    category=categoria,
-                    payment_method=metodo_pagamento,
-                    description=descricao,
-                    original_amount=Decimal(str(valor_original)),
-                    discount=Decimal(str(desconto)),
-                    interest=Decimal(str(juros)),
-                    fine=Decimal(str(multa)),
-                    paid_amount=Decimal(str(valor_pago)),
-                    issue_date=data_emissao,
-                    due_date=data_vencimento,
-                    payment_date=data_pagamento,
-                    status=status,
-                    invoice_numbers=nf_numero or '',
-                    bank_slip_number=boleto_numero or '',
-                    notes=observacoes or '',
-                    is_recurring=is_recurring_bool,
-                    recurrence_frequency=recurrence_frequency if is_recurring_bool else None,
-                )
 
-                resultado['sucesso'] += 1
+def _limpa_cnpj(cnpj, mensagem):
+    """Remove caracteres não numéricos e valida os 14 dígitos"""
+    if not cnpj:
+        return None
+    cnpj_clean = ''.join(filter(str.isdigit, str(cnpj)))
+    if len(cnpj_clean) != 14:
+        raise ValueError(mensagem.format(cnpj=cnpj))
+    return cnpj_clean
 
-            except Exception as e:
-                resultado['erros'].append(f"Linha {row_num}: {str(e)}")
-                continue
 
-        return resultado
+def _converte_data(valor):
+    """
+    Converte string DD/MM/AAAA ou data/datetime do Excel para date.
+    Lança ValueError para qualquer outro valor (ex.: número de série de data
+    em célula sem formato de data), rejeitando só a linha.
+    """
+    if isinstance(valor, str):
+        try:
+            return datetime.strptime(valor.strip(), "%d/%m/%Y").date()
+        except ValueError:
+            raise ValueError(f"Data inválida: {valor}. Use o formato DD/MM/AAAA.")
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    raise ValueError(f"Data inválida: {valor}. Use o formato DD/MM/AAAA ou uma célula de data.")
 
-    except Exception as e:
-        return {
-            'sucesso': 0,
-            'erros': [f"Erro ao processar arquivo: {str(e)}"],
-            'avisos': [],
-            'criados': {}
-        }
+
+def _texto(valor):
+    """Normaliza células de texto (números do Excel viram string)"""
+    if valor is None:
+        return ''
+    return str(valor).strip()
+
+
+def _texto_limitado(valor, model, campo, rotulo):
+    """Texto da célula validado contra o max_length do campo no modelo"""
+    texto = _texto(valor)
+    max_length = model._meta.get_field(campo).max_length
+    if max_length and len(texto) > max_length:
+        raise ValueError(f"{rotulo} excede o limite de {max_length} caracteres ({len(texto)} informados).")
+    return texto
+
+
+def _limite_decimal(campo):
+    """Maior valor absoluto aceito pelo DecimalField (max_digits/decimal_places)"""
+    field = AccountPayable._meta.get_field(campo)
+    return Decimal(10) ** (field.max_digits - field.decimal_places), Decimal(10) ** -field.decimal_places
 
 
-def get_or_create_filial(nome, cnpj, tenant, resultado):
+def _converte_valor(celula, campo, rotulo):
     """
-    Busca ou cria uma filial.
-    - Se CNPJ fornecido: busca por CNPJ (único por tenant)
-    - Se CNPJ não fornecido: busca por nome (case-insensitive)
-    - Se não encontrar: cria nova filial
+    Converte a célula em Decimal arredondado às casas do campo, como o banco
+    faria, e rejeita valores que não cabem nos dígitos do campo (no PostgreSQL
+    o erro derrubaria o lote inteiro).
     """
-    cnpj_clean = None
+    if celula in [None, '']:
+        return Decimal('0')
+    try:
+        valor = Decimal(str(celula).strip())
+    except InvalidOperation:
+        raise ValueError(f"{rotulo} inválido: {celula}")
 
-    # Se CNPJ fornecido, limpa e valida
-    if cnpj:
-        cnpj_clean = ''.join(filter(str.isdigit, str(cnpj)))
+    limite, casas = _limite_decimal(campo)
+    if not valor.is_finite() or abs(valor) >= limite:
+        raise ValueError(f"{rotulo} fora do limite: {celula}. O valor deve ser menor que {limite:,.0f}.")
+    return valor.quantize(casas, rounding=ROUND_HALF_UP)
 
-        # Valida que o CNPJ tem 14 dígitos
-        if len(cnpj_clean) != 14:
-            raise ValueError(f"CNPJ inválido: {cnpj}. Deve conter exatamente 14 dígitos numéricos.")
 
-        # Busca por CNPJ e tenant
-        filial = Filial.objects.filter(tenant=tenant, cnpj=cnpj_clean).first()
+def parse_row(row_num, row, resultado):
+    """
+    Converte uma linha da planilha em um dicionário com os dados da conta.
+    Lança ValueError se a linha for inválida.
+    """
+    row = tuple(row) + (None,) * (21 - len(row))
+
+    filial_nome = _texto_limitado(row[0], Filial, 'name', 'Nome da filial')
+    fornecedor_nome = _texto_limitado(row[2], Supplier, 'name', 'Nome do fornecedor')
+    categoria_nome = _texto_limitado(row[4], Category, 'name', 'Categoria')
+    metodo_pagamento_nome = _texto_limitado(row[5], PaymentMethod, 'name', 'Método de pagamento')
+    descricao = _texto_limitado(row[6], AccountPayable, 'description', 'Descrição')
+    valor_original = row[7]
+    data_vencimento = row[13]
+
+    # Validações básicas - apenas campos obrigatórios
+    if not all([filial_nome, fornecedor_nome, categoria_nome, metodo_pagamento_nome, descricao, valor_original, data_vencimento]):
+        raise ValueError(
+            "Campos obrigatórios faltando. "
+            "Verifique: Nome Filial, Nome Fornecedor, Categoria, Método Pagamento, Descrição, Valor Original e Data Vencimento"
+        )
+
+    filial_cnpj = _limpa_cnpj(row[1], "CNPJ inválido: {cnpj}. Deve conter exatamente 14 dígitos numéricos.")
+    fornecedor_cnpj = _limpa_cnpj(row[3], "CNPJ do fornecedor inválido: {cnpj}. Deve conter exatamente 14 dígitos numéricos.")
+
+    # Valida status
+    status = _texto(row[15]) or 'due'  # Status padrão: 'due' (À Vencer)
+    if status.lower() not in STATUS_VALIDOS:
+        resultado['avisos'].append(
+            f"Linha {row_num}: Status '{status}' inválido. Usando 'due' (À Vencer). "
+            f"Valores válidos: {', '.join(STATUS_VALIDOS)}"
+        )
+        status = 'due'
+    else:
+        status = status.lower()
+
+    # Processa recorrência
+    is_recurring = row[19]
+    is_recurring_bool = isinstance(is_recurring, str) and is_recurring.strip().upper() in ['SIM', 'YES', 'S', 'Y']
+    recurrence_frequency = _texto_limitado(
+        row[20], AccountPayable, 'recurrence_frequency', 'Frequência de recorrência'
+    ) or None
+
+    valores = {
+        'original_amount': _converte_valor(valor_original, 'original_amount', 'Valor original'),
+        'discount': _converte_valor(row[8], 'discount', 'Desconto'),
+        'interest': _converte_valor(row[9], 'interest', 'Juros'),
+        'fine': _converte_valor(row[10], 'fine', 'Multa'),
+        'paid_amount': _converte_valor(row[11], 'paid_amount', 'Valor pago'),
+    }
+    # O valor final é calculado no build_account e também precisa caber no campo
+    valor_final = valores['original_amount'] - valores['discount'] + valores['interest'] + valores['fine']
+    limite, _ = _limite_decimal('final_amount')
+    if abs(valor_final) >= limite:
+        raise ValueError(f"Valor final (original - desconto + juros + multa) deve ser menor que {limite:,.0f}.")
+
+    return {
+        'filial': (filial_nome, filial_cnpj),
+        'fornecedor': (fornecedor_nome, fornecedor_cnpj),
+        'categoria': categoria_nome,
+        'metodo_pagamento': metodo_pagamento_nome,
+        'conta': {
+            'description': descricao,
+            **valores,
+            'issue_date': _converte_data(row[12]) if row[12] else datetime.now().date(),
+            'due_date': _converte_data(data_vencimento),
+            'payment_date': _converte_data(row[14]) if row[14] else None,
+            'status': status,
+            'invoice_numbers': _texto_limitado(row[16], AccountPayable, 'invoice_numbers', 'Nº nota fiscal'),
+            'bank_slip_number': _texto_limitado(row[17], AccountPayable, 'bank_slip_number', 'Nº boleto'),
+            'notes': _texto(row[18]),
+            'is_recurring': is_recurring_bool,
+            'recurrence_frequency': recurrence_frequency if is_recurring_bool else None,
+        },
+    }
+
+
+class RegistrationCache:
+    """
+    Cache em memória dos cadastros de um tenant, indexado por CNPJ e por
+    nome em uppercase. Evita uma query por linha durante a importação e
+    cria os cadastros que faltam em lote.
+    """
 
-        if filial:
-            # Se já existe, verifica se o nome é diferente
-            if filial.name.upper() != nome.upper():
+    def __init__(self, model, tenant, use_cnpj, criados_key, labels):
+        self.model = model
+        self.tenant = tenant
+        self.use_cnpj = use_cnpj
+        self.criados_key = criados_key
+        self.labels = labels
+        self.by_cnpj = {}
+        self.by_name = {}
+        self.avisados = set()
+
+        fields = ['id', 'name', 'cnpj'] if use_cnpj else ['id', 'name']
+        for obj in model.objects.filter(tenant=tenant).only(*fields).iterator():
+            self._add(obj)
+
+    def _add(self, obj):
+        if self.use_cnpj and obj.cnpj:
+            self.by_cnpj.setdefault(obj.cnpj, obj)
+        self.by_name.setdefault(obj.name.upper(), obj)
+
+    @staticmethod
+    def key(nome, cnpj=None):
+        return cnpj or nome.upper()
+
+    def get(self, nome, cnpj, resultado):
+        """Busca por CNPJ (se fornecido) ou por nome. Retorna None se não existir."""
+        if cnpj:
+            obj = self.by_cnpj.get(cnpj)
+            if obj and obj.name.upper() != nome.upper() and ('cnpj', cnpj) not in self.avisados:
+                self.avisados.add(('cnpj', cnpj))
                 resultado['avisos'].append(
-                    f"Filial com CNPJ {cnpj_clean} já existe como '{filial.name}'. "
+                    f"{self.labels['nome']} com CNPJ {cnpj} já existe como '{obj.name}'. "
                     f"Nome informado '{nome}' foi ignorado."
                 )
-            return filial
-    else:
-        # Se CNPJ não fornecido, busca por nome
-        filial = Filial.objects.filter(tenant=tenant, name__iexact=nome).first()
+            return obj
 
-        if filial:
+        obj = self.by_name.get(nome.upper())
+        if obj and self.use_cnpj and ('nome', obj.pk) not in self.avisados:
+            self.avisados.add(('nome', obj.pk))
             resultado['avisos'].append(
-                f"Filial '{filial.name}' encontrada pelo nome (sem CNPJ fornecido)."
+                f"{self.labels['nome']} '{obj.name}' {self.labels['encontrado']} pelo nome (sem CNPJ fornecido)."
             )
-            return filial
-
-    # Cria nova filial
-    # Usa um CNPJ único gerado se não for fornecido (evita UNIQUE constraint)
-    if not cnpj_clean:
-        import time
-        # Gera um "CNPJ" único de 14 dígitos baseado em timestamp
-        cnpj_temp = str(int(time.time() * 1000000))[-14:].zfill(14)
-    else:
-        cnpj_temp = cnpj_clean
+        return obj
+
+    def create_missing(self, pendentes, resultado):
+        """Cria em lote os cadastros que não existem: {chave: (nome, cnpj)}"""
+        if not pendentes:
+            return
+
+        novos = []
+        for nome, cnpj in pendentes.values():
+            obj = self.model(tenant=self.tenant, name=nome)
+            if self.use_cnpj:
+                obj.cnpj = cnpj
+            obj.apply_uppercase()
+            obj.refresh_normalized_name()
+            novos.append(obj)
+
+        self.model.objects.bulk_create(novos)
+        invalidate_dropdown(self.model, self.tenant.pk)
+
+        for (nome, cnpj), obj in zip(pendentes.values(), novos):
+            self._add(obj)
+            if not self.use_cnpj:
+                resultado['criados'][self.criados_key].append(nome)
+                resultado['avisos'].append(f"{self.labels['nome']} '{nome}' {self.labels['criado']} automaticamente")
+            elif cnpj:
+                resultado['criados'][self.criados_key].append(f"{nome} (CNPJ: {cnpj})")
+                resultado['avisos'].append(f"{self.labels['nome']} '{nome}' (CNPJ: {cnpj}) {self.labels['criado']} automaticamente")
+            else:
+                resultado['criados'][self.criados_key].append(f"{nome} (sem CNPJ)")
+                resultado['avisos'].append(f"{self.labels['nome']} '{nome}' (sem CNPJ) {self.labels['criado']} automaticamente")
+
+
+class ImportLookups:
+    """Agrupa os caches de filiais, fornecedores, categorias e métodos de pagamento"""
+
+    def __init__(self, tenant):
+        self.caches = {
+            'filial': RegistrationCache(
+                Filial, tenant, True, 'filiais',
+                {'nome': 'Filial', 'encontrado': 'encontrada', 'criado': 'criada'}
+            ),
+            'fornecedor': RegistrationCache(
+                Supplier, tenant, True, 'fornecedores',
+                {'nome': 'Fornecedor', 'encontrado': 'encontrado', 'criado': 'criado'}
+            ),
+            'categoria': RegistrationCache(
+                Category, tenant, False, 'categorias',
+                {'nome': 'Categoria', 'encontrado': 'encontrada', 'criado': 'criada'}
+            ),
+            'metodo_pagamento': RegistrationCache(
+                PaymentMethod, tenant, False, 'metodos_pagamento',
+                {'nome': 'Método de pagamento', 'encontrado': 'encontrado', 'criado': 'criado'}
+            ),
+        }
 
-    filial = Filial.objects.create(
+    @staticmethod
+    def _nome_cnpj(valor):
+        return valor if isinstance(valor, tuple) else (valor, None)
+
+    def resolve(self, linhas, resultado):
+        """
+        Resolve as FKs de um lote de linhas, criando em lote os cadastros
+        que ainda não existem. Retorna as linhas com os objetos resolvidos.
+        """
+        for campo, cache in self.caches.items():
+            pendentes = {}
+            for linha in linhas:
+                nome, cnpj = self._nome_cnpj(linha[campo])
+                if cache.get(nome, cnpj, resultado) is None:
+                    pendentes.setdefault(cache.key(nome, cnpj), (nome, cnpj))
+            cache.create_missing(pendentes, resultado)
+
+            for linha in linhas:
+                nome, cnpj = self._nome_cnpj(linha[campo])
+                linha[campo] = cache.get(nome, cnpj, resultado)
+
+        return linhas
+
+
+def build_account(tenant, linha):
+    """Monta (sem salvar) a conta a pagar aplicando as regras do save()"""
+    account = AccountPayable(
         tenant=tenant,
-        name=nome,
-        cnpj=cnpj_temp
+        branch=linha['filial'],
+        supplier=linha['fornecedor'],
+        category=linha['categoria'],
+        payment_method=linha['metodo_pagamento'],
+        **linha['conta']
     )
+    account.apply_uppercase()
+    account.refresh_amounts()
+    account.refresh_status()
+    account.refresh_search_document()
+    return account
 
-    if cnpj_clean:
-        resultado['criados']['filiais'].append(f"{nome} (CNPJ: {cnpj_clean})")
-        resultado['avisos'].append(f"Filial '{nome}' (CNPJ: {cnpj_clean}) criada automaticamente")
-    else:
-        resultado['criados']['filiais'].append(f"{nome} (sem CNPJ)")
-        resultado['avisos'].append(f"Filial '{nome}' (sem CNPJ) criada automaticamente com identificador temporário")
 
-    return filial
+class ImportLimitExceeded(Exception):
+    """Planilha com mais linhas que o limite configurado"""
+
 
+# === PIPELINE DE IMPORTAÇÃO ===
+# Cada etapa é um gerador: leitura → parse/validação → lotes → resolução
+# das FKs → inserção. Apenas um lote fica em memória por vez.
 
-def get_or_create_supplier(nome, cnpj, tenant, resultado):
+def check_row_limit(ws, max_rows):
     """
-    Busca ou cria um fornecedor.
-    - Se CNPJ fornecido: busca por CNPJ (único por tenant)
-    - Se CNPJ não fornecido: busca por nome (case-insensitive)
-    - Se não encontrar: cria novo fornecedor
+    Valida o limite de linhas antes de gravar qualquer coisa.
+    As dimensões da planilha (ws.max_row) incluem linhas vazias e podem faltar,
+    então as linhas preenchidas só são contadas quando a estimativa passa do limite.
     """
-    cnpj_clean = None
+    if not max_rows or (ws.max_row is not None and ws.max_row - 1 <= max_rows):
+        return
+    count = sum(1 for row in ws.iter_rows(min_row=2, values_only=True) if any(row))
+    if count > max_rows:
+        raise ImportLimitExceeded(
+            f"A planilha excede o limite de {max_rows} linhas. Divida o arquivo e importe novamente."
+        )
+
+
+def iter_sheet_rows(ws, max_rows=None):
+    """Lê as linhas da planilha (sem o cabeçalho), pulando linhas vazias"""
+    count = 0
+    for row_num, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+        if not any(row):
+            continue
+        count += 1
+        if max_rows and count > max_rows:
+            raise ImportLimitExceeded(
+                f"A planilha excede o limite de {max_rows} linhas. Divida o arquivo e importe novamente."
+            )
+        yield row_num, row
 
-    # Se CNPJ fornecido, limpa e valida
-    if cnpj:
-        cnpj_clean = ''.join(filter(str.isdigit, str(cnpj)))
 
-        # Valida que o CNPJ tem 14 dígitos
-        if len(cnpj_clean) != 14:
-            raise ValueError(f"CNPJ do fornecedor inválido: {cnpj}. Deve conter exatamente 14 dígitos numéricos.")
+def parse_rows(rows, resultado):
+    """Converte e valida as linhas, registrando as inválidas em resultado['erros']"""
+    for row_num, row in rows:
+        try:
+            yield parse_row(row_num, row, resultado)
+        except Exception as e:
+            resultado['erros'].append(f"Linha {row_num}: {str(e)}")
 
-        # Busca por CNPJ e tenant
-        supplier = Supplier.objects.filter(tenant=tenant, cnpj=cnpj_clean).first()
 
-        if supplier:
-            # Se já existe, verifica se o nome é diferente
-            if supplier.name.upper() != nome.upper():
-                resultado['avisos'].append(
-                    f"Fornecedor com CNPJ {cnpj_clean} já existe como '{supplier.name}'. "
-                    f"Nome informado '{nome}' foi ignorado."
-                )
-            return supplier
-    else:
-        # Se CNPJ não fornecido, busca por nome
-        supplier = Supplier.objects.filter(tenant=tenant, name__iexact=nome).first()
+def chunked(items, size):
+    """Agrupa um iterável em listas de até `size` itens"""
+    lote = []
+    for item in items:
+        lote.append(item)
+        if len(lote) >= size:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
 
-        if supplier:
-            resultado['avisos'].append(
-                f"Fornecedor '{supplier.name}' encontrado pelo nome (sem CNPJ fornecido)."
-            )
-            return supplier
-
-    # Cria novo fornecedor
-    # Usa um CNPJ único gerado se não for fornecido (evita UNIQUE constraint)
-    if not cnpj_clean:
-        import time
-        # Gera um "CNPJ" único de 14 dígitos baseado em timestamp
-        cnpj_temp = str(int(time.time() * 1000000))[-14:].zfill(14)
-    else:
-        cnpj_temp = cnpj_clean
 
-    supplier = Supplier.objects.create(
-        tenant=tenant,
-        name=nome,
-        cnpj=cnpj_temp
-    )
+def resolve_chunks(lotes, lookups, resultado):
+    """Resolve as FKs de cada lote, criando em lote os cadastros que faltam"""
+    for lote in lotes:
+        yield lookups.resolve(lote, resultado)
 
-    if cnpj_clean:
-        resultado['criados']['fornecedores'].append(f"{nome} (CNPJ: {cnpj_clean})")
-        resultado['avisos'].append(f"Fornecedor '{nome}' (CNPJ: {cnpj_clean}) criado automaticamente")
-    else:
-        resultado['criados']['fornecedores'].append(f"{nome} (sem CNPJ)")
-        resultado['avisos'].append(f"Fornecedor '{nome}' (sem CNPJ) criado automaticamente com identificador temporário")
 
-    return supplier
+def insert_chunks(lotes, tenant, resultado, progress=None):
+    """Insere cada lote de contas com bulk_create"""
+    for lote in lotes:
+        contas = [build_account(tenant, linha) for linha in lote]
+        with transaction.atomic():
+            AccountPayable.objects.bulk_create(contas)
+            refresh_daily_summary(account_keys(contas))
+        resultado['sucesso'] += len(contas)
+        if progress:
+            progress(resultado)
+
+
+def import_excel(request, file, tenant, chunk_size=None, max_rows=None, progress=None, atomic=True):
+    """
+    Importa contas a pagar de um arquivo Excel
+
+    A planilha é lida em modo read-only (streaming) e processada em lotes:
+    os cadastros do tenant são carregados uma única vez em memória, os que
+    faltam são criados em lote e as contas são inseridas com bulk_create,
+    tudo dentro de uma única transação. O uso de memória não cresce com o
+    número de linhas.
 
+    Args:
+        request: Request do Django
+        file: Arquivo Excel enviado
+        tenant: Instância do Tenant para o qual importar
+        chunk_size: Quantidade de contas por bulk_create (padrão: PAYABLES_IMPORT_CHUNK_SIZE)
+        max_rows: Limite de linhas da planilha (padrão: PAYABLES_IMPORT_MAX_ROWS)
+        progress: Callable(resultado, total_linhas) chamado após cada lote
+        atomic: Se False, cada lote é gravado em sua própria transação
+            (usado pelas importações em segundo plano para expor o progresso)
 
-def get_or_create_category(nome, tenant, resultado):
-    """Busca ou cria uma categoria por nome"""
-    category = Category.objects.filter(tenant=tenant, name__iexact=nome).first()
-    if category:
-        return category
+    Returns:
+        dict: Resultado da importação com sucesso, erros e avisos
+    """
+    chunk_size = chunk_size or IMPORT_CHUNK_SIZE
+    max_rows = max_rows or IMPORT_MAX_ROWS
+    wb = None
+    resultado = _novo_resultado()
 
-    # Cria nova categoria
-    category = Category.objects.create(tenant=tenant, name=nome)
-    resultado['criados']['categorias'].append(nome)
-    resultado['avisos'].append(f"Categoria '{nome}' criada automaticamente")
-    return category
+    try:
+        wb = load_workbook(file, read_only=True, data_only=True)
+        ws = wb.active
 
+        # Estimativa pelas dimensões da planilha (inclui linhas vazias)
+        total_linhas = max((ws.max_row or 1) - 1, 0)
+        on_progress = (lambda r: progress(r, total_linhas)) if progress else None
+        check_row_limit(ws, max_rows)
 
-def get_or_create_payment_method(nome, tenant, resultado):
-    """Busca ou cria um método de pagamento por nome"""
-    method = PaymentMethod.objects.filter(tenant=tenant, name__iexact=nome).first()
-    if method:
-        return method
+        with transaction.atomic() if atomic else nullcontext():
+            lookups = ImportLookups(tenant)
+            linhas = parse_rows(iter_sheet_rows(ws, max_rows), resultado)
+            lotes = resolve_chunks(chunked(linhas, chunk_size), lookups, resultado)
+            insert_chunks(lotes, tenant, resultado, on_progress)
+
+        return resultado
 
-    # Cria novo método
-    method = PaymentMethod.objects.create(tenant=tenant, name=nome)
-    resultado['criados']['metodos_pagamento'].append(nome)
-    resultado['avisos'].append(f"Método de pagamento '{nome}' criado automaticamente")
-    return method
+    except Exception as e:
+        # Em modo atômico nada foi gravado; caso contrário mantém o parcial
+        if atomic:
+            resultado = _novo_resultado()
+        resultado['erros'].append(f"Erro ao processar arquivo: {str(e)}")
+        return resultado
+
+    finally:
+        if wb is not None:
+            wb.close()
+
+
+# === EXPORTAÇÃO ===
+
+# Linhas lidas do banco por vez durante a exportação
+EXPORT_CHUNK_SIZE = getattr(settings, 'PAYABLES_EXPORT_CHUNK_SIZE', 2000)
+
+EXPORT_FIELDS = [
+    'branch__name',
+    'branch__cnpj',
+    'supplier__name',
+    'supplier__cnpj',
+    'category__name',
+    'payment_method__name',
+    'description',
+    'original_amount',
+    'discount',
+    'interest',
+    'fine',
+    'paid_amount',
+    'issue_date',
+    'due_date',
+    'payment_date',
+    'status',
+    'invoice_numbers',
+    'bank_slip_number',
+    'notes',
+    'is_recurring',
+    'recurrence_frequency',
+]
+
+
+def _formata_data(valor):
+    return valor.strftime("%d/%m/%Y") if valor else ''
+
+
+def iter_export_rows(queryset, chunk_size=None):
+    """
+    Gera as linhas da exportação (mesmas colunas da planilha modelo).
+    Usa .values_list() + .iterator() para não instanciar models nem
+    carregar o resultado inteiro em memória.
+    """
+    rows = queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size or EXPORT_CHUNK_SIZE)
+    for row in rows:
+        row = list(row)
+        for index in (12, 13, 14):
+            row[index] = _formata_data(row[index])
+        for index in (7, 8, 9, 10, 11):
+            row[index] = str(row[index])
+        row[19] = 'SIM' if row[19] else 'NAO'
+        yield ['' if value is None else value for value in row]
+
+
+class _Echo:
+    """Pseudo-buffer para o csv.writer devolver a linha em vez de gravar"""
+
+    def write(self, value):
+        return value
+
+
+def export_csv(queryset, chunk_size=None):
+    """
+    Exporta contas a pagar em CSV via StreamingHttpResponse.
+    O download começa imediatamente e o uso de memória é constante.
+    """
+    writer = csv.writer(_Echo(), delimiter=';')
+
+    def stream():
+        yield '\ufeff'  # BOM para o Excel reconhecer UTF-8
+        yield writer.writerow(TEMPLATE_HEADERS)
+        for row in iter_export_rows(queryset, chunk_size):
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(stream(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename=contas_pagar_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    return response
+
+
+def export_excel(queryset, chunk_size=None):
+    """
+    Exporta contas a pagar em Excel usando workbook write-only do openpyxl,
+    que grava as linhas em disco à medida que são escritas.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Contas a Pagar")
+    ws.append(TEMPLATE_HEADERS)
+    for row in iter_export_rows(queryset, chunk_size):
+        ws.append(row)
+
+    tmp = tempfile.TemporaryFile()
+    wb.save(tmp)
+    tmp.seek(0)
+
+    return FileResponse(
+        tmp,
+        as_attachment=True,
+        filename=f'contas_pagar_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx',
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
@@ -1,6 +1,9 @@
 import django_filters
 from django.db.models import Q
+from rest_framework import filters
+
 from .models import AccountPayable
+from .search import search_accounts
 
 
 class AccountPayableFilter(django_filters.FilterSet):
@@ -16,7 +19,7 @@ class AccountPayableFilter(django_filters.FilterSet):
     - Data de Vencimento (range)
     - Data de Pagamento (range)
     - Data de Emissão (range)
-    - Valor (range)
+    - Valores original, final, pago e restante (range)
     - Busca global (procura em múltiplos campos)
     - Contas vencidas
     - Contas a vencer em X dias
@@ -70,6 +73,12 @@ class AccountPayableFilter(django_filters.FilterSet):
     paid_amount__gte = django_filters.NumberFilter(field_name='paid_amount', lookup_expr='gte')
     paid_amount__lte = django_filters.NumberFilter(field_name='paid_amount', lookup_expr='lte')
 
+    final_amount__gte = django_filters.NumberFilter(field_name='final_amount', lookup_expr='gte')
+    final_amount__lte = django_filters.NumberFilter(field_name='final_amount', lookup_expr='lte')
+
+    remaining_amount__gte = django_filters.NumberFilter(field_name='remaining_amount', lookup_expr='gte')
+    remaining_amount__lte = django_filters.NumberFilter(field_name='remaining_amount', lookup_expr='lte')
+
     # Filtro de recorrência
     is_recurring = django_filters.BooleanFilter(field_name='is_recurring')
     recurrence_frequency = django_filters.ChoiceFilter(
@@ -105,14 +114,12 @@ class AccountPayableFilter(django_filters.FilterSet):
 
     def filter_is_overdue(self, queryset, name, value):
         """
-        Filtra contas vencidas (status pendente/due/overdue e data < hoje)
+        Filtra contas vencidas.
+        O status é mantido pela rotina de vencimento (sweep_overdue), então
+        basta filtrar por status e usar o índice (tenant, status, due_date).
         """
-        from datetime import date
         if value:
-            return queryset.filter(
-                status__in=['pending', 'due', 'overdue'],
-                due_date__lt=date.today()
-            )
+            return queryset.filter(status='overdue')
         return queryset
 
     def filter_due_in_days(self, queryset, name, value):
@@ -133,28 +140,26 @@ class AccountPayableFilter(django_filters.FilterSet):
 
     def filter_search(self, queryset, name, value):
         """
-        Busca global - procura em múltiplos campos:
-        - Descrição
-        - Nome do fornecedor
-        - Nome da categoria
-        - Nome da filial
-        - Números de nota fiscal
-        - Número do boleto
-        - Observações
+        Busca global no documento de busca da conta (descrição, fornecedor,
+        categoria, filial, notas fiscais, boleto e observações), usando o
+        índice de texto do banco (FTS5 no SQLite, tsvector/trigram no PostgreSQL).
+        Anota 'search_rank' para ordenar por relevância.
         """
         if value:
-            return queryset.filter(
-                Q(description__icontains=value) |
-                Q(supplier__name__icontains=value) |
-                Q(category__name__icontains=value) |
-                Q(branch__name__icontains=value) |
-                Q(invoice_numbers__icontains=value) |
-                Q(bank_slip_number__icontains=value) |
-                Q(notes__icontains=value)
-            )
+            return search_accounts(queryset, value)
         return queryset
 
 
+class SearchRankOrderingFilter(filters.OrderingFilter):
+    """Sem ?ordering explícito, ordena a busca global por relevância"""
+
+    def get_default_ordering(self, view):
+        ordering = super().get_default_ordering(view)
+        if view.request.query_params.get('search', '').strip():
+            return ['-search_rank', *(ordering or [])]
+        return ordering
+
+
 class PayablePaymentFilter(django_filters.FilterSet):
     """
     Filtros para Pagamentos
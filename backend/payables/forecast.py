@@ -0,0 +1,163 @@
+"""
+Projeção de fluxo de caixa (saídas previstas) das contas a pagar
+
+As contas em aberto são agrupadas no banco por data de vencimento truncada
+(dia, semana ou mês) com o valor restante a pagar. Às contas já criadas
+somam-se as próximas ocorrências ainda não geradas das contas recorrentes
+(calculadas em memória a partir de cada conta pai).
+"""
+from datetime import date, timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+
+from .dashboard import ZERO, _sum
+from .services import RECURRENCE_STEPS
+
+# Status das contas que ainda geram saída de caixa
+FORECAST_STATUSES = ['pending', 'due', 'overdue', 'partially_paid']
+
+GRANULARITIES = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+DEFAULT_GRANULARITY = 'week'
+DEFAULT_MONTHS = 3
+MAX_MONTHS = 24
+
+
+def bucket_start(day, granularity):
+    """Início do bucket (mesma truncagem do banco)"""
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def bucket_end(start, granularity):
+    if granularity == 'week':
+        return start + timedelta(days=6)
+    if granularity == 'month':
+        return start + relativedelta(months=1) - timedelta(days=1)
+    return start
+
+
+def get_horizon(start=None, months=None, today=None):
+    """
+    Retorna o período (início, fim) da projeção.
+    Padrão: de hoje até DEFAULT_MONTHS meses à frente.
+    """
+    start = start or today or date.today()
+    months = DEFAULT_MONTHS if months is None else months
+    if not 1 <= months <= MAX_MONTHS:
+        raise ValueError(f'O horizonte deve ser de 1 a {MAX_MONTHS} meses.')
+    return start, start + relativedelta(months=months) - timedelta(days=1)
+
+
+def get_overdue(queryset, start):
+    """Contas em aberto vencidas antes do início da projeção (1 query)"""
+    overdue_q = Q(due_date__lt=start)
+    return queryset.filter(status__in=FORECAST_STATUSES).aggregate(
+        count=Count('id', filter=overdue_q),
+        amount=_sum('remaining_amount', overdue_q),
+    )
+
+
+def get_scheduled_buckets(queryset, start, end, granularity):
+    """Valor restante das contas existentes por bucket (1 query com GROUP BY)"""
+    trunc = GRANULARITIES[granularity]
+    return queryset.filter(
+        status__in=FORECAST_STATUSES,
+        due_date__gte=start,
+        due_date__lte=end,
+    ).annotate(
+        bucket=trunc('due_date')
+    ).values('bucket').annotate(
+        count=Count('id'),
+        amount=Sum('remaining_amount')
+    ).order_by()
+
+
+def iter_recurring_occurrences(queryset, start, end):
+    """
+    Próximas ocorrências ainda não geradas das contas recorrentes (1 query)
+
+    A conta pai é a 1ª ocorrência e suas filhas as seguintes, então a próxima
+    a gerar é a de índice (filhas + 1). Séries com quantidade definida
+    (recurrence_count) param na última ocorrência; as já geradas por completo
+    não projetam nada. Sem quantidade (ex.: importadas), a série não tem fim.
+
+    Yields:
+        tuple: (vencimento, valor)
+    """
+    parents = queryset.filter(
+        is_recurring=True,
+        recurring_parent__isnull=True,
+        recurrence_frequency__in=list(RECURRENCE_STEPS),
+    ).exclude(
+        status='cancelled'
+    ).annotate(
+        generated=Count('recurring_children'),
+    ).values_list(
+        'due_date', 'recurrence_frequency', 'recurrence_count', 'generated', 'final_amount'
+    ).order_by()
+
+    for due_date, frequency, total, generated, amount in parents:
+        step = RECURRENCE_STEPS[frequency]
+        n = generated + 1
+        occurrence = step(due_date, n)
+        while occurrence <= end and (total is None or n < total):
+            if occurrence >= start:
+                yield occurrence, amount
+            n += 1
+            occurrence = step(due_date, n)
+
+
+def build_cash_flow(queryset, granularity=DEFAULT_GRANULARITY, start=None, end=None):
+    """
+    Monta a projeção de saídas por bucket:
+    - Vencidas antes do início (1 query)
+    - Contas existentes por bucket (1 query agrupada)
+    - Recorrências ainda não geradas (1 query)
+    """
+    buckets = {}
+
+    def bucket(day):
+        key = bucket_start(day, granularity)
+        if key not in buckets:
+            buckets[key] = {
+                'start': key,
+                'end': bucket_end(key, granularity),
+                'scheduled_count': 0,
+                'scheduled_amount': ZERO,
+                'recurring_count': 0,
+                'recurring_amount': ZERO,
+                'total_amount': ZERO,
+            }
+        return buckets[key]
+
+    for row in get_scheduled_buckets(queryset, start, end, granularity):
+        item = bucket(row['bucket'])
+        item['scheduled_count'] = row['count']
+        item['scheduled_amount'] = row['amount'] or ZERO
+        item['total_amount'] += item['scheduled_amount']
+
+    for day, amount in iter_recurring_occurrences(queryset, start, end):
+        item = bucket(day)
+        item['recurring_count'] += 1
+        item['recurring_amount'] += amount
+        item['total_amount'] += amount
+
+    items = [buckets[key] for key in sorted(buckets)]
+    return {
+        'granularity': granularity,
+        'start': start,
+        'end': end,
+        'overdue': get_overdue(queryset, start),
+        'total_amount': sum((item['total_amount'] for item in items), ZERO),
+        'buckets': items,
+    }
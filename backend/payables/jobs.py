@@ -0,0 +1,153 @@
+"""
+Processamento de importações de planilhas em segundo plano
+
+Usa um pool de threads local ao processo (sem broker externo). O upload cria
+um ImportJob e retorna imediatamente; o worker processa a planilha em lotes e
+grava o progresso no próprio ImportJob, que o frontend consulta via API.
+
+Com PAYABLES_IMPORT_ASYNC = False a importação roda de forma síncrona
+(útil em testes e em ambientes sem threads).
+
+O pool não sobrevive a um reinício do processo: o comando process_imports
+(worker contínuo ou agendado com --once) retoma as importações pendentes e
+encerra como falhas as que ficaram em processamento sem progresso. Com
+PAYABLES_IMPORT_EXTERNAL_WORKER = True o upload só cria o ImportJob e todo o
+processamento fica com esse comando.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .excel_import import import_excel
+from .models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+# Máximo de erros/avisos guardados no ImportJob
+MAX_MESSAGES = 500
+
+_executor = None
+
+
+def get_executor():
+    """Cria o pool de threads sob demanda"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'PAYABLES_IMPORT_WORKERS', 2),
+            thread_name_prefix='payables-import'
+        )
+    return _executor
+
+
+def enqueue_import(job):
+    """
+    Agenda o processamento do ImportJob após o commit da transação atual
+    (garante que o worker enxergue o registro e o arquivo)
+    """
+    if getattr(settings, 'PAYABLES_IMPORT_EXTERNAL_WORKER', False):
+        return
+    if getattr(settings, 'PAYABLES_IMPORT_ASYNC', True):
+        transaction.on_commit(lambda: get_executor().submit(run_import_job, job.pk))
+    else:
+        transaction.on_commit(lambda: run_import_job(job.pk))
+
+
+def claim_job(job_id):
+    """
+    Marca o ImportJob como 'processing' se ainda estiver pendente.
+    UPDATE condicional: entre threads e processos, apenas um worker vence.
+    """
+    now = timezone.now()
+    return ImportJob.objects.filter(pk=job_id, status='pending').update(
+        status='processing', started_at=now, updated_at=now
+    ) == 1
+
+
+def claim_next_job():
+    """Reserva a importação pendente mais antiga (None se não houver)"""
+    with transaction.atomic():
+        job_id = ImportJob.objects.select_for_update(skip_locked=True).filter(
+            status='pending'
+        ).order_by('created_at', 'pk').values_list('pk', flat=True).first()
+        if job_id is None or not claim_job(job_id):
+            return None
+    return job_id
+
+
+def fail_interrupted_jobs(stale_after=None):
+    """
+    Encerra como falhas as importações em processamento sem progresso há mais
+    de PAYABLES_IMPORT_STALE_AFTER segundos (worker reiniciado no meio).
+    Não são reprocessadas: os lotes já gravados continuam no banco.
+
+    Returns:
+        int: Quantidade de importações encerradas
+    """
+    if stale_after is None:
+        stale_after = getattr(settings, 'PAYABLES_IMPORT_STALE_AFTER', 900)
+    now = timezone.now()
+    return ImportJob.objects.filter(
+        status='processing',
+        updated_at__lt=now - timedelta(seconds=stale_after),
+    ).update(
+        status='failed',
+        errors=[
+            "Importação interrompida (reinício do servidor). As contas dos lotes já "
+            "processados foram mantidas; confira-as antes de reenviar a planilha."
+        ],
+        finished_at=now,
+        updated_at=now,
+    )
+
+
+def run_import_job(job_id, claimed=False):
+    """
+    Processa um ImportJob (executado pelo worker)
+
+    Args:
+        claimed: True se o job já foi reservado (claim_next_job)
+    """
+    try:
+        if not claimed and not claim_job(job_id):
+            return
+        job = ImportJob.objects.select_related('tenant').get(pk=job_id)
+
+        def progress(resultado, total_linhas):
+            ImportJob.objects.filter(pk=job.pk).update(
+                total_rows=total_linhas,
+                processed_rows=resultado['sucesso'] + len(resultado['erros']),
+                success_count=resultado['sucesso'],
+                updated_at=timezone.now(),
+            )
+
+        with job.file.open('rb') as file:
+            resultado = import_excel(None, file, job.tenant, progress=progress, atomic=False)
+
+        job.refresh_from_db(fields=['total_rows'])
+        job.success_count = resultado['sucesso']
+        job.processed_rows = resultado['sucesso'] + len(resultado['erros'])
+        job.total_rows = max(job.total_rows, job.processed_rows)
+        job.errors = resultado['erros'][:MAX_MESSAGES]
+        job.warnings = resultado['avisos'][:MAX_MESSAGES]
+        job.created_records = resultado['criados']
+        job.status = 'failed' if resultado['erros'] and not resultado['sucesso'] else 'completed'
+        job.finished_at = timezone.now()
+        job.save()
+
+    except Exception as e:
+        logger.exception('Erro ao processar importação %s', job_id)
+        ImportJob.objects.filter(pk=job_id).update(
+            status='failed',
+            errors=[f"Erro ao processar arquivo: {str(e)}"],
+            finished_at=timezone.now(),
+        )
+
+    finally:
+        # Cada thread do pool tem suas próprias conexões
+        if getattr(settings, 'PAYABLES_IMPORT_ASYNC', True):
+            connections.close_all()
@@ -0,0 +1,54 @@
+"""
+Processa as importações de planilhas pendentes (worker fora do servidor web)
+
+Retoma as importações que ficaram pendentes quando o processo web reiniciou e
+encerra como falhas as que pararam no meio do processamento. Rode como
+serviço contínuo ou agende com --once (cron), por exemplo:
+    python manage.py process_imports
+    */5 * * * * cd /app/backend && python manage.py process_imports --once
+
+Vários workers podem rodar ao mesmo tempo: cada importação é reservada por
+apenas um deles.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from payables.jobs import claim_next_job, fail_interrupted_jobs, run_import_job
+from payables.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = 'Processa as importações de planilhas pendentes (worker contínuo ou --once)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Processa as pendentes e termina (para agendamento)')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Segundos entre as verificações no modo contínuo (padrão: 5)')
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                self.process_pending()
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Worker encerrado')
+
+    def process_pending(self):
+        interrupted = fail_interrupted_jobs()
+        if interrupted:
+            self.stdout.write(self.style.WARNING(f'{interrupted} importações interrompidas marcadas como falha'))
+
+        while True:
+            job_id = claim_next_job()
+            if job_id is None:
+                return
+            run_import_job(job_id, claimed=True)
+            job = ImportJob.objects.get(pk=job_id)
+            self.stdout.write(
+                f'Importação {job_id} ({job.original_filename}): {job.status}, '
+                f'{job.success_count} contas, {len(job.errors)} erros'
+            )
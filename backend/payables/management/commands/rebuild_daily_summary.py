@@ -0,0 +1,31 @@
+"""
+Reconstrói o resumo diário das contas a pagar (PayableDailySummary)
+
+O resumo é mantido automaticamente; use após alterações feitas direto no
+banco ou se os totais do dashboard parecerem divergentes:
+    python manage.py rebuild_daily_summary
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from payables.summary import rebuild_daily_summary
+from tenant.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói o resumo diário das contas a pagar usado pelos dashboards'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            help='Slug do tenant (padrão: todos)'
+        )
+
+    def handle(self, *args, **options):
+        tenant = None
+        if options['tenant']:
+            tenant = Tenant.objects.filter(slug=options['tenant']).first()
+            if tenant is None:
+                raise CommandError(f"Tenant '{options['tenant']}' não encontrado")
+
+        total = rebuild_daily_summary(tenant)
+        self.stdout.write(self.style.SUCCESS(f'{total} linhas de resumo geradas'))
@@ -0,0 +1,35 @@
+"""
+Recalcula o documento de busca das contas a pagar e reconstrói o índice
+
+Use após importações feitas fora da aplicação ou se a busca parecer
+desatualizada:
+    python manage.py rebuild_search_index
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from payables.models import AccountPayable
+from payables.search import SEARCH_TABLE, ensure_search_index, rebuild_search_documents
+
+
+class Command(BaseCommand):
+    help = 'Recalcula o documento de busca das contas a pagar e reconstrói o índice de texto'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            help='Slug do tenant (padrão: todos)'
+        )
+
+    def handle(self, *args, **options):
+        queryset = AccountPayable.objects.all()
+        if options['tenant']:
+            queryset = queryset.filter(tenant__slug=options['tenant'])
+
+        total = rebuild_search_documents(queryset)
+
+        if not ensure_search_index(connection) and connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+
+        self.stdout.write(self.style.SUCCESS(f'{total} contas reindexadas'))
@@ -0,0 +1,37 @@
+"""
+Marca como vencidas as contas pendentes/a vencer com vencimento passado
+
+Os requests não executam a rotina (apenas avisam no log quando está
+atrasada): agende diariamente logo após a meia-noite, por exemplo (cron):
+    5 0 * * * cd /app/backend && python manage.py sweep_overdue
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payables.services import sweep_overdue
+
+
+class Command(BaseCommand):
+    help = 'Marca como vencidas (overdue) as contas com vencimento anterior à data de referência'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            help='Data de referência no formato YYYY-MM-DD (padrão: hoje)'
+        )
+
+    def handle(self, *args, **options):
+        reference_date = None
+        if options['date']:
+            try:
+                reference_date = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('Data inválida. Use o formato YYYY-MM-DD.')
+
+        run = sweep_overdue(reference_date)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{run.updated_count} contas marcadas como vencidas '
+            f'(referência {run.reference_date}, {run.duration_ms}ms)'
+        ))
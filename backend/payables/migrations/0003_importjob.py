@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payables', '0002_remove_payablepayment_bank_account_and_more'),
+        ('tenant', '0002_alter_tenant_logo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('file', models.FileField(max_length=500, upload_to='imports/%Y/%m/', verbose_name='Arquivo')),
+                ('original_filename', models.CharField(blank=True, max_length=255, verbose_name='Nome Original')),
+                ('status', models.CharField(choices=[('pending', 'Na Fila'), ('processing', 'Processando'), ('completed', 'Concluída'), ('failed', 'Falhou')], default='pending', max_length=20, verbose_name='Status')),
+                ('total_rows', models.PositiveIntegerField(default=0, verbose_name='Total de Linhas')),
+                ('processed_rows', models.PositiveIntegerField(default=0, verbose_name='Linhas Processadas')),
+                ('success_count', models.PositiveIntegerField(default=0, verbose_name='Contas Importadas')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Erros')),
+                ('warnings', models.JSONField(blank=True, default=list, verbose_name='Avisos')),
+                ('created_records', models.JSONField(blank=True, default=dict, verbose_name='Cadastros Criados')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Iniciada em')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finalizada em')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payable_import_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Enviado por')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(app_label)s_%(class)s_related', to='tenant.tenant', verbose_name='Empresa')),
+            ],
+            options={
+                'verbose_name': 'Importação de Contas',
+                'verbose_name_plural': 'Importações de Contas',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['tenant', 'status'], name='payables_im_tenant__7df215_idx')],
+            },
+        ),
+    ]
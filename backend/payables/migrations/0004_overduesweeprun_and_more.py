@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payables', '0003_importjob'),
+        ('registrations', '0004_alter_filial_unique_together_and_more'),
+        ('tenant', '0002_alter_tenant_logo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OverdueSweepRun',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('reference_date', models.DateField(db_index=True, verbose_name='Data de Referência')),
+                ('updated_count', models.PositiveIntegerField(default=0, verbose_name='Contas Atualizadas')),
+                ('duration_ms', models.PositiveIntegerField(default=0, verbose_name='Duração (ms)')),
+            ],
+            options={
+                'verbose_name': 'Execução da Rotina de Vencimento',
+                'verbose_name_plural': 'Execuções da Rotina de Vencimento',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='accountpayable',
+            index=models.Index(fields=['status', 'due_date'], name='payables_ac_status_e5eb7a_idx'),
+        ),
+    ]
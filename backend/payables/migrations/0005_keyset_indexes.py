@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payables', '0004_overduesweeprun_and_more'),
+        ('registrations', '0004_alter_filial_unique_together_and_more'),
+        ('tenant', '0002_alter_tenant_logo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accountpayable',
+            index=models.Index(fields=['tenant', 'due_date', 'id'], name='payables_ac_tenant__ea94a1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payablepayment',
+            index=models.Index(fields=['tenant', 'payment_date', 'id'], name='payables_pa_tenant__6ce1ea_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:59
+
+import django.db.models.deletion
+import payables.search
+from django.db import migrations, models
+
+from core.utils import normalize_text
+
+
+def populate_search_documents(apps, schema_editor):
+    """Preenche o documento de busca das contas existentes"""
+    AccountPayable = apps.get_model('payables', 'AccountPayable')
+    batch = []
+    queryset = AccountPayable.objects.select_related('supplier', 'category', 'branch').order_by('pk')
+    for account in queryset.iterator(chunk_size=1000):
+        parts = [
+            account.description,
+            account.invoice_numbers,
+            account.bank_slip_number,
+            account.notes,
+            account.supplier.name if account.supplier_id else '',
+            account.category.name if account.category_id else '',
+            account.branch.name if account.branch_id else '',
+        ]
+        account.search_document = normalize_text(' '.join(part for part in parts if part))
+        batch.append(account)
+        if len(batch) >= 1000:
+            AccountPayable.objects.bulk_update(batch, ['search_document'])
+            batch = []
+    if batch:
+        AccountPayable.objects.bulk_update(batch, ['search_document'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payables', '0005_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayableSearchEntry',
+            fields=[
+                ('account', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='payables.accountpayable')),
+                ('search_document', payables.search.SearchDocumentField()),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'payables_search',
+                'managed': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='accountpayable',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Documento de Busca'),
+        ),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.7 on 2026-10-17 19:06
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+
+
+def populate_daily_summary(apps, schema_editor):
+    """Gera o resumo diário das contas existentes"""
+    AccountPayable = apps.get_model('payables', 'AccountPayable')
+    PayableDailySummary = apps.get_model('payables', 'PayableDailySummary')
+    final_amount = ExpressionWrapper(
+        F('original_amount') - F('discount') + F('interest') + F('fine'),
+        output_field=DecimalField(max_digits=14, decimal_places=2)
+    )
+    rows = AccountPayable.objects.filter(is_active=True).values(
+        'tenant_id', 'branch_id', 'category_id', 'supplier_id', 'due_date', 'status'
+    ).annotate(
+        total=Count('id'),
+        original=Sum('original_amount'),
+        final=Sum(final_amount),
+        paid=Sum('paid_amount'),
+    ).order_by()
+
+    batch = []
+    for row in rows.iterator(chunk_size=1000):
+        batch.append(PayableDailySummary(
+            tenant_id=row['tenant_id'],
+            branch_id=row['branch_id'],
+            category_id=row['category_id'],
+            supplier_id=row['supplier_id'],
+            date=row['due_date'],
+            status=row['status'],
+            count=row['total'],
+            original_amount=row['original'],
+            final_amount=row['final'],
+            paid_amount=row['paid'],
+        ))
+        if len(batch) >= 1000:
+            PayableDailySummary.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        PayableDailySummary.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payables', '0006_search_document'),
+        ('registrations', '0005_normalized_name'),
+        ('tenant', '0002_alter_tenant_logo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayableDailySummary',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('date', models.DateField(verbose_name='Vencimento')),
+                ('status', models.CharField(choices=[('pending', 'Pendente'), ('due', 'À Vencer'), ('overdue', 'Vencida'), ('paid', 'Paga'), ('partially_paid', 'Paga Parcialmente'), ('cancelled', 'Cancelada')], max_length=20, verbose_name='Status')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Quantidade')),
+                ('original_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Valor Original')),
+                ('final_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Valor Final')),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Valor Pago')),
+                ('branch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='registrations.filial', verbose_name='Filial')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='registrations.category', verbose_name='Categoria')),
+                ('supplier', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='registrations.supplier', verbose_name='Fornecedor')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(app_label)s_%(class)s_related', to='tenant.tenant', verbose_name='Empresa')),
+            ],
+            options={
+                'verbose_name': 'Resumo Diário de Contas a Pagar',
+                'verbose_name_plural': 'Resumos Diários de Contas a Pagar',
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['tenant', 'date'], name='payables_pa_tenant__411b16_idx'), models.Index(fields=['tenant', 'status', 'date'], name='payables_pa_tenant__a4d27e_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tenant', 'branch', 'category', 'supplier', 'date', 'status'), name='payables_daily_summary_key')],
+            },
+        ),
+        migrations.RunPython(populate_daily_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.7 on 2026-10-17 19:12
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, F, Sum, Value, When
+
+
+def populate_amounts(apps, schema_editor):
+    """Preenche valor final/restante das contas e o restante do resumo diário"""
+    AccountPayable = apps.get_model('payables', 'AccountPayable')
+    PayableDailySummary = apps.get_model('payables', 'PayableDailySummary')
+
+    AccountPayable.objects.update(
+        final_amount=F('original_amount') - F('discount') + F('interest') + F('fine')
+    )
+    AccountPayable.objects.update(
+        remaining_amount=Case(
+            When(paid_amount__gte=F('final_amount'), then=Value(Decimal('0.00'))),
+            default=F('final_amount') - F('paid_amount'),
+        )
+    )
+
+    keys = ['tenant_id', 'branch_id', 'category_id', 'supplier_id', 'due_date', 'status']
+    rows = AccountPayable.objects.filter(is_active=True).values(*keys).annotate(
+        remaining=Sum('remaining_amount')
+    ).order_by()
+    for row in rows.iterator(chunk_size=1000):
+        PayableDailySummary.objects.filter(
+            tenant_id=row['tenant_id'],
+            branch_id=row['branch_id'],
+            category_id=row['category_id'],
+            supplier_id=row['supplier_id'],
+            date=row['due_date'],
+            status=row['status'],
+        ).update(remaining_amount=row['remaining'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payables', '0007_daily_summary'),
+        ('registrations', '0005_normalized_name'),
+        ('tenant', '0002_alter_tenant_logo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accountpayable',
+            name='final_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=12, verbose_name='Valor Final'),
+        ),
+        migrations.AddField(
+            model_name='accountpayable',
+            name='remaining_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=12, verbose_name='Valor Restante'),
+        ),
+        migrations.AddField(
+            model_name='payabledailysummary',
+            name='remaining_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Valor Restante'),
+        ),
+        migrations.RunPython(populate_amounts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='accountpayable',
+            index=models.Index(fields=['tenant', 'final_amount'], name='payables_ac_tenant__a9ac13_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='accountpayable',
+            index=models.Index(fields=['tenant', 'status', 'remaining_amount'], name='payables_ac_tenant__f2131f_idx'),
+        ),
+    ]
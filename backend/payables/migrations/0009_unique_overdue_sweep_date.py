@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-17 21:40
+
+from django.db import migrations, models
+
+
+def remove_duplicate_runs(apps, schema_editor):
+    """Mantém apenas a execução mais recente de cada data de referência"""
+    OverdueSweepRun = apps.get_model('payables', 'OverdueSweepRun')
+    seen = set()
+    duplicates = []
+    for run in OverdueSweepRun.objects.order_by('reference_date', '-created_at', '-pk').only('pk', 'reference_date'):
+        if run.reference_date in seen:
+            duplicates.append(run.pk)
+        seen.add(run.reference_date)
+    OverdueSweepRun.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payables', '0008_stored_amounts'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_runs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='overduesweeprun',
+            name='reference_date',
+            field=models.DateField(unique=True, verbose_name='Data de Referência'),
+        ),
+    ]
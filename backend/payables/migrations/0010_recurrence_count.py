@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-17 21:52
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_recurrence_count(apps, schema_editor):
+    """
+    Séries criadas pela API já tinham todas as ocorrências geradas na criação:
+    a quantidade é pai + filhas. Pais sem filhas (ex.: importados) ficam sem fim.
+    """
+    AccountPayable = apps.get_model('payables', 'AccountPayable')
+    parents = AccountPayable.objects.filter(
+        is_recurring=True,
+        recurring_parent__isnull=True,
+    ).annotate(
+        generated=Count('recurring_children'),
+    ).filter(generated__gt=0).values_list('pk', 'generated').order_by()
+
+    for pk, generated in parents.iterator(chunk_size=1000):
+        AccountPayable.objects.filter(pk=pk).update(recurrence_count=generated + 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payables', '0009_unique_overdue_sweep_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accountpayable',
+            name='recurrence_count',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Total de ocorrências da série, contando a conta pai (vazio: sem fim definido)', null=True, verbose_name='Quantidade de Recorrências'),
+        ),
+        migrations.RunPython(populate_recurrence_count, migrations.RunPython.noop),
+    ]
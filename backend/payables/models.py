@@ -1,13 +1,19 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, RegexValidator
 from django.contrib.contenttypes.fields import GenericRelation
 from django.utils import timezone
 from decimal import Decimal
 from datetime import date
 
-from core.models import TenantAwareModel, SoftDeleteModel, UppercaseMixin
+from core.models import BaseModel, TenantAwareModel, SoftDeleteModel, UppercaseMixin
+from core.utils import normalize_text
 from registrations.models import Supplier, Category, PaymentMethod, Filial
 
+from .search import SearchDocumentField
+
+# Campos que alteram final_amount/remaining_amount
+AMOUNT_SOURCE_FIELDS = frozenset(['original_amount', 'discount', 'interest', 'fine', 'paid_amount'])
+
 
 class AccountPayable(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
     """
@@ -115,6 +121,22 @@ class AccountPayable(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
         default=Decimal('0.00'),
         validators=[MinValueValidator(Decimal('0'))]
     )
+    # Calculados a partir dos valores acima (refresh_amounts), para filtrar,
+    # ordenar e somar no banco
+    final_amount = models.DecimalField(
+        'Valor Final',
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        editable=False
+    )
+    remaining_amount = models.DecimalField(
+        'Valor Restante',
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        editable=False
+    )
 
     # Datas
     issue_date = models.DateField(
@@ -149,6 +171,12 @@ class AccountPayable(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
         null=True,
         blank=True
     )
+    recurrence_count = models.PositiveSmallIntegerField(
+        'Quantidade de Recorrências',
+        null=True,
+        blank=True,
+        help_text='Total de ocorrências da série, contando a conta pai (vazio: sem fim definido)'
+    )
     recurring_parent = models.ForeignKey(
         'self',
         on_delete=models.SET_NULL,
@@ -188,6 +216,10 @@ class AccountPayable(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
     # Outros
     notes = models.TextField('Observações', blank=True)
 
+    # Documento de busca (desnormalizado: textos da conta + nomes dos cadastros),
+    # mantido via signals e indexado por FTS5 (SQLite) ou tsvector/trigram (PostgreSQL)
+    search_document = models.TextField('Documento de Busca', blank=True, default='', editable=False)
+
     # Anexos (usa o modelo genérico Attachment do core)
     attachments = GenericRelation('core.Attachment', related_query_name='account_payable')
 
@@ -200,14 +232,47 @@ class AccountPayable(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
             models.Index(fields=['tenant', 'branch', 'due_date']),
             models.Index(fields=['tenant', 'branch', 'supplier']),
             models.Index(fields=['tenant', 'status', 'due_date']),
+            # Usado pela rotina de vencimento (varre todos os tenants)
+            models.Index(fields=['status', 'due_date']),
+            # Paginação por cursor (keyset) em (due_date, id)
+            models.Index(fields=['tenant', 'due_date', 'id']),
+            # Filtros e ordenação por valor devido
+            models.Index(fields=['tenant', 'final_amount']),
+            models.Index(fields=['tenant', 'status', 'remaining_amount']),
         ]
 
     def __str__(self):
         branch_info = f"[{self.branch.name}]" if self.branch else ""
         return f"{branch_info} {self.description}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Vencimento carregado: se mudar, o resumo diário do dia antigo também é recalculado
+        instance._loaded_due_date = instance.__dict__.get('due_date')
+        return instance
+
     def save(self, *args, **kwargs):
-        # Atualizar status baseado no valor pago
+        self.refresh_amounts()
+        self.refresh_status()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and AMOUNT_SOURCE_FIELDS.intersection(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'final_amount', 'remaining_amount'}
+        super().save(*args, **kwargs)
+
+    def refresh_amounts(self):
+        """
+        Atualiza o valor final (original - desconto + juros + multa) e o
+        restante a pagar. Chamado no save() e pelas operações em lote.
+        """
+        self.final_amount = self.original_amount - self.discount + self.interest + self.fine
+        self.remaining_amount = max(self.final_amount - (self.paid_amount or Decimal('0')), Decimal('0'))
+
+    def refresh_status(self):
+        """
+        Atualiza o status baseado no valor pago e no vencimento.
+        Chamado no save() e pelas operações em lote (bulk_create).
+        """
         if self.paid_amount is not None and self.paid_amount > 0:
             if self.final_amount is not None and self.paid_amount >= self.final_amount:
                 self.status = 'paid'
@@ -218,19 +283,22 @@ class AccountPayable(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
         elif self.status in ['pending', 'due'] and self.due_date and self.due_date < date.today():
             self.status = 'overdue'
 
-        super().save(*args, **kwargs)
-
-    @property
-    def final_amount(self):
-        """Calcula: Valor Original - Desconto + Juros + Multa"""
-        return self.original_amount - self.discount + self.interest + self.fine
-
-    @property
-    def remaining_amount(self):
-        """Retorna o valor restante a pagar"""
-        final = Decimal(str(self.final_amount)) if self.final_amount else Decimal('0')
-        paid = Decimal(str(self.paid_amount)) if self.paid_amount else Decimal('0')
-        return max(final - paid, Decimal('0'))
+    def refresh_search_document(self):
+        """
+        Monta o documento de busca: descrição, notas fiscais, boleto, observações
+        e nomes de fornecedor, categoria e filial (sem acentos, minúsculo).
+        Chamado pelo signal pre_save e pelas operações em lote (bulk_create).
+        """
+        parts = [
+            self.description,
+            self.invoice_numbers,
+            self.bank_slip_number,
+            self.notes,
+            self.supplier.name if self.supplier_id else '',
+            self.category.name if self.category_id else '',
+            self.branch.name if self.branch_id else '',
+        ]
+        self.search_document = normalize_text(' '.join(part for part in parts if part))
 
     @property
     def is_overdue(self):
@@ -254,6 +322,7 @@ class AccountPayable(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
 
     def mark_as_paid(self, payment_date=None, payment_method=None):
         """Marca a conta como paga"""
+        self.refresh_amounts()
         self.paid_amount = self.final_amount
         self.payment_date = payment_date or date.today()
         if payment_method:
@@ -326,6 +395,7 @@ class PayablePayment(TenantAwareModel):
         indexes = [
             models.Index(fields=['tenant', 'account_payable']),
             models.Index(fields=['tenant', 'payment_date']),
+            models.Index(fields=['tenant', 'payment_date', 'id']),
         ]
 
     def __str__(self):
@@ -337,10 +407,162 @@ class PayablePayment(TenantAwareModel):
         self.update_account_paid_amount()
 
     def update_account_paid_amount(self):
-        """Atualiza o valor total pago na conta a pagar"""
-        total_paid = self.account_payable.payments.aggregate(
-            total=models.Sum('amount')
-        )['total'] or Decimal('0.00')
+        """
+        Atualiza o valor total pago na conta a pagar.
+        A conta fica bloqueada durante o cálculo (pagamentos simultâneos).
+        """
+        with transaction.atomic():
+            list(AccountPayable.objects.select_for_update().filter(
+                pk=self.account_payable_id
+            ).values_list('pk', flat=True))
+            total_paid = self.account_payable.payments.aggregate(
+                total=models.Sum('amount')
+            )['total'] or Decimal('0.00')
+
+            self.account_payable.paid_amount = total_paid
+            self.account_payable.save()
+
+
+class ImportJob(TenantAwareModel):
+    """
+    Importação de planilha de contas a pagar processada em segundo plano.
+    O progresso é atualizado a cada lote para que o frontend possa consultar
+    o andamento sem bloquear a requisição de upload.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Na Fila'),
+        ('processing', 'Processando'),
+        ('completed', 'Concluída'),
+        ('failed', 'Falhou'),
+    ]
+
+    file = models.FileField('Arquivo', upload_to='imports/%Y/%m/', max_length=500)
+    original_filename = models.CharField('Nome Original', max_length=255, blank=True)
+    status = models.CharField('Status', max_length=20, choices=STATUS_CHOICES, default='pending')
+
+    # Progresso
+    total_rows = models.PositiveIntegerField('Total de Linhas', default=0)
+    processed_rows = models.PositiveIntegerField('Linhas Processadas', default=0)
+    success_count = models.PositiveIntegerField('Contas Importadas', default=0)
+
+    # Resultado (mesmo formato retornado por excel_import.import_excel)
+    errors = models.JSONField('Erros', default=list, blank=True)
+    warnings = models.JSONField('Avisos', default=list, blank=True)
+    created_records = models.JSONField('Cadastros Criados', default=dict, blank=True)
 
-        self.account_payable.paid_amount = total_paid
-        self.account_payable.save()
+    created_by = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='payable_import_jobs',
+        verbose_name='Enviado por'
+    )
+    started_at = models.DateTimeField('Iniciada em', null=True, blank=True)
+    finished_at = models.DateTimeField('Finalizada em', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Importação de Contas'
+        verbose_name_plural = 'Importações de Contas'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['tenant', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.original_filename} ({self.get_status_display()})"
+
+    @property
+    def percent(self):
+        """Percentual processado (0-100)"""
+        if self.status == 'completed':
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(int(self.processed_rows * 100 / self.total_rows), 99)
+
+    @property
+    def is_finished(self):
+        return self.status in ['completed', 'failed']
+
+
+class OverdueSweepRun(BaseModel):
+    """
+    Registro de cada execução da rotina que marca contas vencidas
+    (payables.services.sweep_overdue). Uma por data de referência.
+    """
+    reference_date = models.DateField('Data de Referência', unique=True)
+    updated_count = models.PositiveIntegerField('Contas Atualizadas', default=0)
+    duration_ms = models.PositiveIntegerField('Duração (ms)', default=0)
+
+    class Meta:
+        verbose_name = 'Execução da Rotina de Vencimento'
+        verbose_name_plural = 'Execuções da Rotina de Vencimento'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.reference_date}: {self.updated_count} contas vencidas"
+
+
+class PayableSearchEntry(models.Model):
+    """
+    Índice FTS5 das contas a pagar (tabela virtual, apenas no SQLite).
+    Não é gerenciado pelas migrações: criado e mantido por triggers
+    (ver payables.search.ensure_search_index).
+    """
+    account = models.OneToOneField(
+        AccountPayable,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        on_delete=models.DO_NOTHING,
+        related_name='search_entry'
+    )
+    search_document = SearchDocumentField()
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'payables_search'
+
+
+class PayableDailySummary(TenantAwareModel):
+    """
+    Resumo diário das contas a pagar: uma linha por
+    (tenant, filial, categoria, fornecedor, vencimento, status)
+    com a quantidade de contas e a soma dos valores.
+
+    Mantido incrementalmente a cada escrita em contas/pagamentos e
+    reconstruído pelo comando rebuild_daily_summary (ver payables.summary).
+    Considera apenas contas ativas.
+    """
+    branch = models.ForeignKey(Filial, on_delete=models.CASCADE, related_name='+', verbose_name='Filial')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='+', verbose_name='Categoria')
+    supplier = models.ForeignKey(Supplier, on_delete=models.CASCADE, related_name='+', verbose_name='Fornecedor')
+    date = models.DateField('Vencimento')
+    status = models.CharField('Status', max_length=20, choices=AccountPayable.STATUS_CHOICES)
+
+    count = models.PositiveIntegerField('Quantidade', default=0)
+    original_amount = models.DecimalField('Valor Original', max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    final_amount = models.DecimalField('Valor Final', max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    paid_amount = models.DecimalField('Valor Pago', max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    remaining_amount = models.DecimalField('Valor Restante', max_digits=14, decimal_places=2, default=Decimal('0.00'))
+
+    class Meta:
+        verbose_name = 'Resumo Diário de Contas a Pagar'
+        verbose_name_plural = 'Resumos Diários de Contas a Pagar'
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tenant', 'branch', 'category', 'supplier', 'date', 'status'],
+                name='payables_daily_summary_key'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['tenant', 'date']),
+            models.Index(fields=['tenant', 'status', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.date} [{self.status}]: {self.count} contas"
@@ -0,0 +1,184 @@
+"""
+Busca textual de contas a pagar
+
+Cada conta guarda um documento de busca desnormalizado (search_document:
+descrição, notas fiscais, boleto, observações e nomes de fornecedor,
+categoria e filial, sem acentos e em minúsculo), mantido via signals.
+
+Índices por banco:
+- SQLite: tabela virtual FTS5 'payables_search' (conteúdo externo) mantida
+  por triggers; busca por prefixo de palavras com ranking bm25.
+- PostgreSQL: índice GIN de tsvector ('simple') + índice GIN trigram
+  (pg_trgm) para trechos no meio das palavras; ranking com ts_rank.
+- Outros bancos: LIKE em uma única coluna.
+
+Os índices são criados/recriados por ensure_search_index() no post_migrate
+(idempotente: recria os triggers se o SQLite reconstruir a tabela).
+"""
+import logging
+import re
+
+from django.db import connections
+from django.db.models import F, FloatField, Lookup, Q, TextField, Value
+from django.db.models.functions import Cast
+
+from core.utils import normalize_text
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = 'payables_search'
+
+SQLITE_TRIGGERS = {
+    'payables_search_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS payables_search_ai AFTER INSERT ON payables_accountpayable BEGIN
+            INSERT INTO {SEARCH_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+        END
+    """,
+    'payables_search_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS payables_search_ad AFTER DELETE ON payables_accountpayable BEGIN
+            INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, search_document)
+            VALUES ('delete', old.id, old.search_document);
+        END
+    """,
+    'payables_search_au': f"""
+        CREATE TRIGGER IF NOT EXISTS payables_search_au AFTER UPDATE OF search_document ON payables_accountpayable BEGIN
+            INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, search_document)
+            VALUES ('delete', old.id, old.search_document);
+            INSERT INTO {SEARCH_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+        END
+    """,
+}
+
+POSTGRES_INDEXES = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    """
+    CREATE INDEX IF NOT EXISTS payables_ap_search_vector ON payables_accountpayable
+    USING gin (to_tsvector('simple'::regconfig, COALESCE(search_document, '')))
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS payables_ap_search_trgm ON payables_accountpayable
+    USING gin (search_document gin_trgm_ops)
+    """,
+]
+
+
+class FullTextMatch(Lookup):
+    """Lookup `match` do FTS5: coluna MATCH 'consulta'"""
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class SearchDocumentField(TextField):
+    """Coluna da tabela FTS5 (aceita o lookup __match)"""
+
+
+SearchDocumentField.register_lookup(FullTextMatch)
+
+
+def get_terms(value):
+    """Palavras normalizadas da busca"""
+    return re.findall(r'\w+', normalize_text(value))
+
+
+def search_accounts(queryset, value):
+    """
+    Filtra o queryset pela busca e anota 'search_rank' (maior = mais relevante).
+    Todas as palavras precisam aparecer (prefixo de palavra).
+    """
+    terms = get_terms(value)
+    if not terms:
+        return queryset.annotate(search_rank=Cast(Value(0), FloatField()))
+
+    vendor = connections[queryset.db].vendor
+
+    if vendor == 'sqlite':
+        query = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.filter(
+            search_entry__search_document__match=query
+        ).annotate(
+            search_rank=F('search_entry__rank') * -1
+        )
+
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        vector = SearchVector('search_document', config='simple')
+        query = SearchQuery(' & '.join(f'{term}:*' for term in terms), config='simple', search_type='raw')
+        return queryset.annotate(
+            search_vector=vector,
+            search_rank=SearchRank(vector, query),
+        ).filter(
+            Q(search_vector=query) | Q(search_document__contains=' '.join(terms))
+        )
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(search_document__contains=term)
+    return queryset.filter(condition).annotate(
+        search_rank=Cast(Value(0), FloatField())
+    )
+
+
+def ensure_search_index(connection):
+    """
+    Cria os índices de busca do banco, se ainda não existirem.
+    No SQLite, (re)cria a tabela FTS5 e os triggers e reconstrói o índice
+    quando algum trigger estava faltando (ex.: tabela recriada por migração).
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'payables_accountpayable'"
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if set(SQLITE_TRIGGERS) <= existing:
+                return False
+
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+                "search_document, content='payables_accountpayable', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+            for sql in SQLITE_TRIGGERS.values():
+                cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+            logger.info('Índice de busca FTS5 criado/reconstruído')
+            return True
+
+        if connection.vendor == 'postgresql':
+            for sql in POSTGRES_INDEXES:
+                cursor.execute(sql)
+            return True
+
+    return False
+
+
+def rebuild_search_documents(queryset, chunk_size=1000):
+    """
+    Recalcula o documento de busca das contas do queryset em lotes
+    (bulk_update). Usado quando o nome de um cadastro muda e pelo
+    comando rebuild_search_index.
+
+    Returns:
+        int: Quantidade de contas atualizadas
+    """
+    from .models import AccountPayable
+
+    queryset = queryset.select_related('supplier', 'category', 'branch').order_by('pk')
+    batch = []
+    total = 0
+    for account in queryset.iterator(chunk_size=chunk_size):
+        account.refresh_search_document()
+        batch.append(account)
+        if len(batch) >= chunk_size:
+            AccountPayable.objects.bulk_update(batch, ['search_document'])
+            total += len(batch)
+            batch = []
+    if batch:
+        AccountPayable.objects.bulk_update(batch, ['search_document'])
+        total += len(batch)
+    return total
@@ -1,10 +1,11 @@
 from rest_framework import serializers
+from django.db import transaction
 from decimal import Decimal
-from datetime import timedelta
-from dateutil.relativedelta import relativedelta
 
-from .models import AccountPayable, PayablePayment
+from .models import AccountPayable, PayablePayment, ImportJob
+from .services import create_recurrences
 from core.models import Attachment
+from registrations.models import Filial, PaymentMethod
 from registrations.serializers import (
     FilialListSerializer,
     SupplierListSerializer,
@@ -89,6 +90,9 @@ class AccountPayableListSerializer(serializers.ModelSerializer):
         ]
 
     def get_attachments_count(self, obj):
+        # Usa a anotação feita no queryset da listagem (sem query extra por linha)
+        if hasattr(obj, 'attachments_total'):
+            return obj.attachments_total
         return obj.get_attachments_count()
 
 
@@ -219,10 +223,11 @@ class AccountPayableCreateSerializer(serializers.ModelSerializer):
 
         return attrs
 
+    @transaction.atomic
     def create(self, validated_data):
         """Cria conta a pagar e, se recorrente, cria as recorrências"""
         # Extrair dados extras
-        recurrence_count = validated_data.pop('recurrence_count', None)
+        recurrence_count = validated_data.get('recurrence_count')
         attachment_files = validated_data.pop('attachment_files', [])
 
         # Associar tenant
@@ -253,46 +258,8 @@ class AccountPayableCreateSerializer(serializers.ModelSerializer):
             )
 
     def _create_recurrences(self, parent_account, count):
-        """Cria contas recorrentes baseadas na conta pai"""
-        frequency_map = {
-            'weekly': lambda d, n: d + timedelta(weeks=n),
-            'biweekly': lambda d, n: d + timedelta(weeks=2*n),
-            'monthly': lambda d, n: d + relativedelta(months=n),
-            'bimonthly': lambda d, n: d + relativedelta(months=2*n),
-            'quarterly': lambda d, n: d + relativedelta(months=3*n),
-            'semiannual': lambda d, n: d + relativedelta(months=6*n),
-            'annual': lambda d, n: d + relativedelta(years=n),
-        }
-
-        frequency_func = frequency_map.get(parent_account.recurrence_frequency)
-        if not frequency_func:
-            return
-
-        # Criar as recorrências (a partir da 2ª, pois a 1ª é a conta original)
-        for i in range(1, count):
-            new_due_date = frequency_func(parent_account.due_date, i)
-            new_issue_date = frequency_func(parent_account.issue_date, i)
-
-            AccountPayable.objects.create(
-                tenant=parent_account.tenant,
-                branch=parent_account.branch,
-                supplier=parent_account.supplier,
-                category=parent_account.category,
-                description=f"{parent_account.description} ({i+1}/{count})",
-                original_amount=parent_account.original_amount,
-                discount=parent_account.discount,
-                interest=parent_account.interest,
-                fine=parent_account.fine,
-                issue_date=new_issue_date,
-                due_date=new_due_date,
-                payment_method=parent_account.payment_method,
-                is_recurring=True,
-                recurrence_frequency=parent_account.recurrence_frequency,
-                recurring_parent=parent_account,
-                invoice_numbers=parent_account.invoice_numbers,
-                bank_slip_number=parent_account.bank_slip_number,
-                notes=parent_account.notes,
-            )
+        """Cria contas recorrentes baseadas na conta pai (um único bulk_create)"""
+        create_recurrences(parent_account, count)
 
 
 class PayablePaymentSerializer(serializers.ModelSerializer):
@@ -381,3 +348,131 @@ class PayablePaymentSerializer(serializers.ModelSerializer):
                 )
 
         return payment
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Serializer para importações de planilhas em segundo plano"""
+    percent = serializers.IntegerField(read_only=True)
+    is_finished = serializers.BooleanField(read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            'id',
+            'file',
+            'original_filename',
+            'status',
+            'status_display',
+            'total_rows',
+            'processed_rows',
+            'success_count',
+            'percent',
+            'is_finished',
+            'errors',
+            'warnings',
+            'created_records',
+            'started_at',
+            'finished_at',
+            'created_at',
+        ]
+        read_only_fields = [
+            'id', 'original_filename', 'status', 'total_rows', 'processed_rows',
+            'success_count', 'errors', 'warnings', 'created_records',
+            'started_at', 'finished_at', 'created_at',
+        ]
+        extra_kwargs = {'file': {'write_only': True}}
+
+    def validate_file(self, value):
+        """Aceita apenas planilhas .xlsx"""
+        if not value.name.lower().endswith('.xlsx'):
+            raise serializers.ValidationError("Por favor, envie um arquivo Excel (.xlsx)")
+        return value
+
+
+class BulkPayablePaymentItemSerializer(serializers.Serializer):
+    """Um pagamento dentro do registro em lote (FKs resolvidas em lote)"""
+    account_payable = serializers.IntegerField()
+    payment_date = serializers.DateField()
+    amount = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=Decimal('0.01'))
+    payment_method = serializers.IntegerField()
+    paid_by_branch = serializers.IntegerField(required=False, allow_null=True)
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+    transaction_number = serializers.CharField(required=False, allow_blank=True, max_length=100, default='')
+    interest = serializers.DecimalField(max_digits=12, decimal_places=2, required=False, min_value=Decimal('0'))
+    fine = serializers.DecimalField(max_digits=12, decimal_places=2, required=False, min_value=Decimal('0'))
+
+
+class BulkPayablePaymentSerializer(serializers.Serializer):
+    """
+    Serializer para registro de pagamentos em lote.
+    Valida todos os itens juntos, buscando contas, formas de pagamento e
+    filiais com uma query por tabela.
+    """
+    payments = BulkPayablePaymentItemSerializer(many=True, allow_empty=False)
+
+    MAX_PAYMENTS = 500
+
+    def validate_payments(self, value):
+        if len(value) > self.MAX_PAYMENTS:
+            raise serializers.ValidationError(f"Envie no máximo {self.MAX_PAYMENTS} pagamentos por vez.")
+        return value
+
+    def validate(self, attrs):
+        tenant = self.context['request'].tenant
+        items = attrs['payments']
+
+        accounts = AccountPayable.objects.filter(tenant=tenant, is_active=True).in_bulk(
+            {item['account_payable'] for item in items}
+        )
+        methods = PaymentMethod.objects.filter(tenant=tenant).in_bulk(
+            {item['payment_method'] for item in items}
+        )
+        branches = Filial.objects.filter(tenant=tenant).in_bulk(
+            {item['paid_by_branch'] for item in items if item.get('paid_by_branch')}
+        )
+
+        errors = []
+        for item in items:
+            item_errors = {}
+            account = accounts.get(item['account_payable'])
+            if account is None:
+                item_errors['account_payable'] = 'Conta a pagar não encontrada.'
+            elif account.status == 'cancelled':
+                item_errors['account_payable'] = 'Não é possível pagar uma conta cancelada.'
+            if item['payment_method'] not in methods:
+                item_errors['payment_method'] = 'Forma de pagamento não encontrada.'
+            if item.get('paid_by_branch') and item['paid_by_branch'] not in branches:
+                item_errors['paid_by_branch'] = 'Filial não encontrada.'
+            errors.append(item_errors)
+
+            if not item_errors:
+                item['account_payable'] = account
+                item['payment_method'] = methods[item['payment_method']]
+                item['paid_by_branch'] = branches.get(item.get('paid_by_branch'))
+
+        if any(errors):
+            raise serializers.ValidationError({'payments': errors})
+
+        return attrs
+
+
+class BulkAccountActionSerializer(serializers.Serializer):
+    """Serializer para ações em lote sobre contas a pagar (pagar/cancelar)"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=10000,
+        help_text="IDs das contas"
+    )
+    payment_date = serializers.DateField(required=False)
+    payment_method = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate_payment_method(self, value):
+        if value is None:
+            return None
+        tenant = self.context['request'].tenant
+        method = PaymentMethod.objects.filter(tenant=tenant, pk=value).first()
+        if method is None:
+            raise serializers.ValidationError("Forma de pagamento não encontrada.")
+        return method
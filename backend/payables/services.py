@@ -0,0 +1,296 @@
+"""
+Serviços de contas a pagar
+
+Operações em lote reutilizadas pela API, pelo admin e pela importação.
+Evitam o save() por objeto (que recalcula status e totais linha a linha)
+usando bulk_create/bulk_update e agregações agrupadas. Como esses caminhos
+não disparam signals, cada um recalcula o resumo diário dos dias afetados.
+"""
+import logging
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import DatabaseError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from dateutil.relativedelta import relativedelta
+
+from .models import AccountPayable, PayablePayment, OverdueSweepRun
+from .summary import account_keys, queryset_keys, refresh_daily_summary
+
+logger = logging.getLogger(__name__)
+
+# Última data em que este processo executou/verificou a rotina de vencimento
+_last_sweep_date = None
+
+
+# Funções que calculam a n-ésima data de uma recorrência
+RECURRENCE_STEPS = {
+    'weekly': lambda d, n: d + timedelta(weeks=n),
+    'biweekly': lambda d, n: d + timedelta(weeks=2*n),
+    'monthly': lambda d, n: d + relativedelta(months=n),
+    'bimonthly': lambda d, n: d + relativedelta(months=2*n),
+    'quarterly': lambda d, n: d + relativedelta(months=3*n),
+    'semiannual': lambda d, n: d + relativedelta(months=6*n),
+    'annual': lambda d, n: d + relativedelta(years=n),
+}
+
+
+def build_recurrences(parent_account, count):
+    """
+    Monta em memória (sem salvar) as contas recorrentes da conta pai,
+    a partir da 2ª ocorrência (a 1ª é a própria conta pai), aplicando as
+    regras de uppercase, status e documento de busca do save().
+    """
+    step = RECURRENCE_STEPS.get(parent_account.recurrence_frequency)
+    if not step:
+        return []
+
+    children = []
+    for i in range(1, count):
+        child = AccountPayable(
+            tenant_id=parent_account.tenant_id,
+            branch=parent_account.branch,
+            supplier=parent_account.supplier,
+            category=parent_account.category,
+            description=f"{parent_account.description} ({i+1}/{count})",
+            original_amount=parent_account.original_amount,
+            discount=parent_account.discount,
+            interest=parent_account.interest,
+            fine=parent_account.fine,
+            issue_date=step(parent_account.issue_date, i),
+            due_date=step(parent_account.due_date, i),
+            payment_method_id=parent_account.payment_method_id,
+            is_recurring=True,
+            recurrence_frequency=parent_account.recurrence_frequency,
+            recurring_parent=parent_account,
+            invoice_numbers=parent_account.invoice_numbers,
+            bank_slip_number=parent_account.bank_slip_number,
+            notes=parent_account.notes,
+        )
+        child.apply_uppercase()
+        child.refresh_amounts()
+        child.refresh_status()
+        child.refresh_search_document()
+        children.append(child)
+    return children
+
+
+def create_recurrences(parent_account, count):
+    """
+    Cria as contas recorrentes da conta pai com um único bulk_create
+
+    Returns:
+        list: Contas recorrentes criadas
+    """
+    children = build_recurrences(parent_account, count)
+    with transaction.atomic():
+        if parent_account.recurrence_count != count:
+            parent_account.recurrence_count = count
+            AccountPayable.objects.filter(pk=parent_account.pk).update(recurrence_count=count)
+        AccountPayable.objects.bulk_create(children)
+        refresh_daily_summary(account_keys(children))
+    return children
+
+
+def recalculate_paid_amounts(accounts):
+    """
+    Recalcula paid_amount e status das contas informadas com uma única
+    agregação agrupada (SUM por conta) e um bulk_update.
+
+    As contas ficam bloqueadas (SELECT ... FOR UPDATE, no PostgreSQL) até o
+    fim da transação, então pagamentos simultâneos na mesma conta somam
+    todos os valores já gravados em vez de sobrescrever um ao outro.
+
+    Args:
+        accounts: Lista de instâncias de AccountPayable (já carregadas)
+
+    Returns:
+        list: As mesmas contas, atualizadas
+    """
+    if not accounts:
+        return []
+
+    with transaction.atomic():
+        return _recalculate_paid_amounts(accounts)
+
+
+def _recalculate_paid_amounts(accounts):
+    ids = sorted(account.pk for account in accounts)
+    # Ordem fixa de bloqueio evita deadlock entre transações concorrentes
+    list(
+        AccountPayable.objects.select_for_update().filter(
+            pk__in=ids
+        ).order_by('pk').values_list('pk', flat=True)
+    )
+
+    totals = dict(
+        PayablePayment.objects.filter(
+            account_payable_id__in=ids
+        ).values('account_payable_id').annotate(
+            total=Sum('amount')
+        ).values_list('account_payable_id', 'total').order_by()
+    )
+
+    now = timezone.now()
+    for account in accounts:
+        account.paid_amount = totals.get(account.pk) or Decimal('0.00')
+        account.refresh_amounts()
+        account.refresh_status()
+        account.updated_at = now
+
+    AccountPayable.objects.bulk_update(
+        accounts,
+        ['paid_amount', 'final_amount', 'remaining_amount', 'status', 'payment_date',
+         'interest', 'fine', 'updated_at']
+    )
+    refresh_daily_summary(account_keys(accounts))
+    return accounts
+
+
+def register_payments(tenant, items):
+    """
+    Registra vários pagamentos de uma vez, em uma única transação.
+
+    Args:
+        tenant: Tenant dos pagamentos
+        items: Lista de dicts com account_payable (instância), payment_date,
+            amount, payment_method, paid_by_branch, notes, transaction_number
+            e, opcionalmente, interest/fine a serem gravados na conta
+
+    Returns:
+        tuple: (pagamentos criados, contas atualizadas)
+    """
+    accounts = {}
+    payments = []
+
+    for item in items:
+        item = dict(item)
+        account = accounts.setdefault(item['account_payable'].pk, item['account_payable'])
+        interest = item.pop('interest', None)
+        fine = item.pop('fine', None)
+        if interest is not None:
+            account.interest = interest
+        if fine is not None:
+            account.fine = fine
+
+        item['account_payable'] = account
+        payments.append(PayablePayment(tenant=tenant, **item))
+
+    with transaction.atomic():
+        PayablePayment.objects.bulk_create(payments)
+        updated = recalculate_paid_amounts(list(accounts.values()))
+
+    return payments, updated
+
+
+def bulk_mark_as_paid(queryset, payment_date=None, payment_method=None):
+    """
+    Marca as contas do queryset como pagas com um único UPDATE
+    (paid_amount = valor final, restante zerado).
+    Contas já pagas ou canceladas são ignoradas.
+
+    Returns:
+        int: Quantidade de contas atualizadas
+    """
+    values = {
+        'paid_amount': F('final_amount'),
+        'remaining_amount': Decimal('0.00'),
+        'payment_date': payment_date or date.today(),
+        'status': 'paid',
+        'updated_at': timezone.now(),
+    }
+    if payment_method:
+        values['payment_method'] = payment_method
+
+    queryset = queryset.exclude(status__in=['paid', 'cancelled'])
+    with transaction.atomic():
+        keys = queryset_keys(queryset)
+        updated = queryset.update(**values)
+        refresh_daily_summary(keys)
+    return updated
+
+
+def bulk_cancel(queryset):
+    """
+    Cancela as contas do queryset com um único UPDATE.
+    Contas já canceladas são ignoradas.
+
+    Returns:
+        int: Quantidade de contas canceladas
+    """
+    queryset = queryset.exclude(status='cancelled')
+    with transaction.atomic():
+        keys = queryset_keys(queryset)
+        updated = queryset.update(
+            status='cancelled',
+            updated_at=timezone.now(),
+        )
+        refresh_daily_summary(keys)
+    return updated
+
+
+def sweep_overdue(today=None):
+    """
+    Marca como vencidas ('overdue') todas as contas pendentes/a vencer com
+    vencimento anterior a hoje, de todos os tenants, com um único UPDATE
+    (usa o índice (status, due_date)). Registra a execução em OverdueSweepRun
+    (uma por data; executar de novo no mesmo dia atualiza o registro).
+
+    Returns:
+        OverdueSweepRun: Registro da execução
+    """
+    global _last_sweep_date
+    today = today or date.today()
+    started = time.monotonic()
+
+    queryset = AccountPayable.objects.filter(
+        status__in=['pending', 'due'],
+        due_date__lt=today
+    )
+    with transaction.atomic():
+        keys = queryset_keys(queryset)
+        updated = queryset.update(status='overdue', updated_at=timezone.now())
+        refresh_daily_summary(keys)
+
+    run, _ = OverdueSweepRun.objects.update_or_create(
+        reference_date=today,
+        defaults={
+            'updated_count': updated,
+            'duration_ms': int((time.monotonic() - started) * 1000),
+        },
+    )
+    _last_sweep_date = today
+
+    logger.info('Rotina de vencimento: %s contas marcadas como vencidas em %sms', updated, run.duration_ms)
+    return run
+
+
+def warn_if_sweep_stale():
+    """
+    Registra um aviso (no máximo uma vez por dia em cada processo) se a rotina
+    de vencimento não roda desde ontem: o agendamento do comando sweep_overdue
+    falhou ou não foi configurado, e o status 'overdue' está desatualizado.
+
+    Só lê (1 query por dia) e nunca falha: é chamado no caminho dos requests.
+    """
+    global _last_sweep_date
+    today = date.today()
+    if _last_sweep_date == today:
+        return
+    _last_sweep_date = today
+
+    try:
+        last_run = OverdueSweepRun.objects.order_by('-reference_date').values_list(
+            'reference_date', flat=True
+        ).first()
+    except DatabaseError:
+        logger.exception('Não foi possível verificar a rotina de vencimento')
+        return
+
+    if last_run is None or last_run < today - timedelta(days=1):
+        logger.warning(
+            'Rotina de vencimento atrasada (última execução: %s). Agende o comando '
+            '"python manage.py sweep_overdue" para rodar diariamente.', last_run or 'nunca'
+        )
@@ -0,0 +1,72 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from registrations.models import Category, Filial, Supplier
+
+from .models import AccountPayable
+from .search import ensure_search_index, rebuild_search_documents
+from .summary import SUMMARY_SOURCE_FIELDS, refresh_daily_summary
+
+# Campo da conta que aponta para cada cadastro
+REGISTRATION_FIELDS = {
+    Supplier: 'supplier',
+    Category: 'category',
+    Filial: 'branch',
+}
+
+
+@receiver(pre_save, sender=AccountPayable)
+def update_search_document(sender, instance, update_fields=None, **kwargs):
+    """Atualiza o documento de busca da conta (exceto em saves parciais sem search_document)"""
+    if update_fields is not None and 'search_document' not in update_fields:
+        return
+    instance.refresh_search_document()
+
+
+@receiver(post_save, sender=AccountPayable)
+def update_daily_summary(sender, instance, update_fields=None, **kwargs):
+    """Recalcula o resumo diário do vencimento da conta (e do antigo, se mudou)"""
+    if update_fields is not None and not SUMMARY_SOURCE_FIELDS.intersection(update_fields):
+        return
+    keys = {(instance.tenant_id, instance.due_date)}
+    loaded_due_date = getattr(instance, '_loaded_due_date', None)
+    if loaded_due_date:
+        keys.add((instance.tenant_id, loaded_due_date))
+    refresh_daily_summary(keys)
+    instance._loaded_due_date = instance.due_date
+
+
+@receiver(post_delete, sender=AccountPayable)
+def remove_from_daily_summary(sender, instance, **kwargs):
+    """Recalcula o resumo diário após a exclusão física da conta"""
+    refresh_daily_summary([(instance.tenant_id, instance.due_date)])
+
+
+@receiver(pre_save, sender=Supplier)
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Filial)
+def check_registration_name(sender, instance, **kwargs):
+    """Marca se o nome do cadastro mudou (o documento das contas inclui o nome)"""
+    if not instance.pk:
+        instance._search_name_changed = False
+        return
+    old_name = sender._base_manager.filter(pk=instance.pk).values_list('name', flat=True).first()
+    instance._search_name_changed = old_name is not None and old_name != instance.name
+
+
+@receiver(post_save, sender=Supplier)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Filial)
+def refresh_accounts_search_document(sender, instance, **kwargs):
+    """Recalcula o documento de busca das contas do cadastro renomeado"""
+    if getattr(instance, '_search_name_changed', False):
+        field = REGISTRATION_FIELDS[sender]
+        rebuild_search_documents(AccountPayable.objects.filter(**{field: instance}))
+
+
+def create_search_index(sender, using='default', **kwargs):
+    """post_migrate: garante o índice de busca (FTS5/GIN) no banco migrado"""
+    connection = connections[using]
+    if 'payables_accountpayable' in connection.introspection.table_names():
+        ensure_search_index(connection)
@@ -0,0 +1,144 @@
+"""
+Resumo diário das contas a pagar (PayableDailySummary)
+
+Os dashboards leem algumas centenas de linhas de resumo em vez de varrer
+todas as contas. A manutenção é incremental por dia: cada escrita marca os
+pares (tenant, vencimento) afetados e só esses dias são recalculados a partir
+das contas (índice (tenant, due_date, id)). Assim o resumo fica correto em
+qualquer caminho de escrita (save, bulk_create, bulk_update, update()).
+Os mesmos pontos trocam a versão do cache de análises do tenant.
+
+Reconstrução completa: python manage.py rebuild_daily_summary
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from tenant.models import Tenant
+
+from .cache import invalidate as invalidate_analytics
+from .models import AccountPayable, PayableDailySummary
+
+# Campos da conta que alteram o resumo (saves parciais sem eles são ignorados)
+SUMMARY_SOURCE_FIELDS = frozenset([
+    'tenant', 'branch', 'category', 'supplier', 'due_date', 'status', 'is_active',
+    'original_amount', 'discount', 'interest', 'fine', 'paid_amount',
+    'final_amount', 'remaining_amount',
+])
+
+SUMMARY_KEY_FIELDS = ['tenant', 'branch', 'category', 'supplier', 'date', 'status']
+
+SUMMARY_VALUE_FIELDS = [
+    'count', 'original_amount', 'final_amount', 'paid_amount', 'remaining_amount', 'updated_at',
+]
+
+# Dias recalculados por query (limite de parâmetros do SQLite)
+DAYS_PER_QUERY = 500
+
+# Linhas de resumo inseridas por bulk_create na reconstrução
+REBUILD_BATCH_SIZE = 1000
+
+
+def summarize(queryset):
+    """Agrupa as contas ativas do queryset pela chave do resumo"""
+    return queryset.filter(is_active=True).values(
+        'tenant_id', 'branch_id', 'category_id', 'supplier_id', 'due_date', 'status'
+    ).annotate(
+        total=Count('id'),
+        original=Sum('original_amount'),
+        final=Sum('final_amount'),
+        paid=Sum('paid_amount'),
+        remaining=Sum('remaining_amount'),
+    ).order_by()
+
+
+def build_summary(row):
+    """Monta uma linha de resumo (sem salvar) a partir de um grupo de summarize()"""
+    return PayableDailySummary(
+        tenant_id=row['tenant_id'],
+        branch_id=row['branch_id'],
+        category_id=row['category_id'],
+        supplier_id=row['supplier_id'],
+        date=row['due_date'],
+        status=row['status'],
+        count=row['total'],
+        original_amount=row['original'],
+        final_amount=row['final'],
+        paid_amount=row['paid'],
+        remaining_amount=row['remaining'],
+    )
+
+
+def account_keys(accounts):
+    """Pares (tenant, vencimento) de contas já carregadas/montadas"""
+    return {(account.tenant_id, account.due_date) for account in accounts}
+
+
+def queryset_keys(queryset):
+    """Pares (tenant, vencimento) das contas do queryset (uma query)"""
+    return set(queryset.order_by().values_list('tenant_id', 'due_date').distinct())
+
+
+def refresh_daily_summary(keys):
+    """
+    Recalcula o resumo dos dias informados.
+
+    Args:
+        keys: Iterável de pares (tenant_id, due_date)
+    """
+    days_by_tenant = defaultdict(set)
+    for tenant_id, day in keys:
+        if tenant_id and day:
+            days_by_tenant[tenant_id].add(day)
+
+    with transaction.atomic():
+        for tenant_id, days in days_by_tenant.items():
+            invalidate_analytics(tenant_id)
+            days = sorted(days)
+            for i in range(0, len(days), DAYS_PER_QUERY):
+                batch = days[i:i + DAYS_PER_QUERY]
+                rows = [build_summary(row) for row in summarize(
+                    AccountPayable.objects.filter(tenant_id=tenant_id, due_date__in=batch)
+                )]
+                PayableDailySummary.objects.filter(tenant_id=tenant_id, date__in=batch).delete()
+                # Upsert: outra transação pode ter recalculado o mesmo dia em paralelo
+                PayableDailySummary.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=SUMMARY_KEY_FIELDS,
+                    update_fields=SUMMARY_VALUE_FIELDS,
+                )
+
+
+def rebuild_daily_summary(tenant=None):
+    """
+    Reconstrói todo o resumo (de um tenant ou de todos)
+
+    Returns:
+        int: Quantidade de linhas de resumo criadas
+    """
+    accounts = AccountPayable.objects.all()
+    summaries = PayableDailySummary.objects.all()
+    if tenant is not None:
+        accounts = accounts.filter(tenant=tenant)
+        summaries = summaries.filter(tenant=tenant)
+
+    total = 0
+    batch = []
+    with transaction.atomic():
+        summaries.delete()
+        for row in summarize(accounts).iterator(chunk_size=REBUILD_BATCH_SIZE):
+            batch.append(build_summary(row))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                PayableDailySummary.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            PayableDailySummary.objects.bulk_create(batch)
+            total += len(batch)
+
+    tenant_ids = [tenant.pk] if tenant is not None else Tenant.objects.values_list('pk', flat=True)
+    for tenant_id in tenant_ids:
+        invalidate_analytics(tenant_id)
+    return total
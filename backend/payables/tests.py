@@ -0,0 +1,855 @@
+import csv
+import io
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from openpyxl import Workbook
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from tenant.cache import get_tenant_by_slug
+from tenant.models import Tenant
+from core.models import Attachment
+from registrations.models import Filial, Supplier, Category, PaymentMethod
+from .excel_import import import_excel
+from .cache import get_cache
+from . import services
+from .services import bulk_cancel, bulk_mark_as_paid, create_recurrences, register_payments, sweep_overdue
+from .jobs import claim_job, run_import_job
+from .models import AccountPayable, PayablePayment, OverdueSweepRun, PayableDailySummary, ImportJob
+
+
+class PayablesTestMixin:
+    """Cria tenant, usuário, cadastros básicos e um client autenticado"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name='Empresa Teste', slug='empresa-teste', email='teste@empresa.com')
+        self.user = User.objects.create_user(
+            email='user@empresa.com',
+            password='senha-forte-123',
+            first_name='Usuario',
+            last_name='Teste',
+            tenant=self.tenant,
+        )
+        self.branch = Filial.objects.create(tenant=self.tenant, name='Matriz', cnpj='12345678000190')
+        self.supplier = Supplier.objects.create(tenant=self.tenant, name='Fornecedor', cnpj='98765432000100')
+        self.category = Category.objects.create(tenant=self.tenant, name='Serviços')
+        self.payment_method = PaymentMethod.objects.create(tenant=self.tenant, name='Boleto')
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client.credentials(HTTP_X_TENANT_ID=self.tenant.slug)
+
+        # Marca a rotina de vencimento como executada hoje e aquece o cache de tenants
+        sweep_overdue()
+        get_tenant_by_slug(self.tenant.slug)
+
+    def create_account(self, **kwargs):
+        data = {
+            'tenant': self.tenant,
+            'branch': self.branch,
+            'supplier': self.supplier,
+            'category': self.category,
+            'payment_method': self.payment_method,
+            'description': 'Conta teste',
+            'original_amount': Decimal('100.00'),
+            'due_date': date.today() + timedelta(days=3),
+        }
+        data.update(kwargs)
+        return AccountPayable.objects.create(**data)
+
+
+class SpreadsheetMixin:
+    """Gera planilhas no formato do modelo de importação"""
+
+    def build_sheet(self, rows):
+        wb = Workbook()
+        ws = wb.active
+        ws.append(['cabeçalho'] * 21)
+        for row in rows:
+            ws.append(row)
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+    def row(self, overrides=None):
+        values = {
+            0: 'Matriz', 1: '12345678000190', 2: 'Fornecedor Novo', 3: '',
+            4: 'Aluguel', 5: 'Pix', 6: 'Conta importada', 7: '150.00',
+            13: '25/10/2030', 15: 'due',
+        }
+        values.update(overrides or {})
+        return [values.get(i) for i in range(21)]
+
+
+class DashboardTests(PayablesTestMixin, TestCase):
+    url = '/api/payables/accounts-payable/dashboard/'
+
+    def test_dashboard_kpis_and_buckets(self):
+        today = date.today()
+        self.create_account(original_amount=Decimal('100.00'), due_date=today)
+        self.create_account(original_amount=Decimal('50.00'), due_date=today - timedelta(days=40))
+        self.create_account(
+            original_amount=Decimal('30.00'),
+            paid_amount=Decimal('30.00'),
+            payment_date=today,
+            due_date=today,
+        )
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+
+        self.assertEqual(data['total_pending'], 2)
+        self.assertEqual(data['total_overdue'], 1)
+        self.assertEqual(data['total_paid_this_month'], 1)
+        self.assertEqual(Decimal(str(data['amount_pending'])), Decimal('150.00'))
+        self.assertEqual(data['top_suppliers'][0]['count'], 2)
+
+        day = next(item for item in data['daily'] if item['date'] == today.isoformat())
+        self.assertEqual(day['due_count'], 2)
+        self.assertEqual(day['paid_count'], 1)
+        self.assertEqual(Decimal(str(day['paid_amount'])), Decimal('30.00'))
+        self.assertTrue(data['weekly'])
+
+    def test_dashboard_query_count_is_constant(self):
+        for i in range(20):
+            self.create_account(due_date=date.today() + timedelta(days=i % 5))
+
+        # kpis (resumo + pagos no mês) + top fornecedores + 2 buckets (tenant vem do cache)
+        with self.assertNumQueries(5):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_dashboard_invalid_period(self):
+        response = self.client.get(self.url, {'start': '2025-02-01', 'end': '2025-01-01'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class AccountPayableListTests(PayablesTestMixin, TestCase):
+    url = '/api/payables/accounts-payable/'
+
+    def setUp(self):
+        super().setUp()
+        # Aquece o cache de ContentType para não contar essa query
+        ContentType.objects.get_for_model(AccountPayable)
+
+    def add_attachment(self, account, name='nota.pdf'):
+        return Attachment.objects.create(
+            content_object=account,
+            file=SimpleUploadedFile(name, b'conteudo'),
+            uploaded_by=self.user,
+        )
+
+    def test_list_attachments_count(self):
+        with_attachments = self.create_account()
+        self.create_account()
+        self.add_attachment(with_attachments, 'a.pdf')
+        self.add_attachment(with_attachments, 'b.pdf')
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        counts = {row['id']: row['attachments_count'] for row in response.json()['results']}
+        self.assertEqual(counts[with_attachments.id], 2)
+        self.assertEqual(len([c for c in counts.values() if c == 0]), 1)
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        for _ in range(3):
+            self.create_account()
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url)
+
+        for _ in range(30):
+            self.create_account()
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.json()['count'], 33)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def walk_cursor(self, params):
+        ids, url, pages = [], self.url, 0
+        params = dict(params, cursor='')
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            ids.extend(row['id'] for row in data['results'])
+            url, params, pages = data['next'], None, pages + 1
+        return ids, pages
+
+    def test_cursor_pagination_walks_all_rows(self):
+        # Vários registros no mesmo vencimento (desempate pelo id)
+        accounts = [self.create_account(due_date=date.today() + timedelta(days=i % 3)) for i in range(12)]
+
+        ids, pages = self.walk_cursor({'page_size': 5})
+        self.assertEqual(pages, 3)
+        self.assertEqual(sorted(ids), sorted(a.id for a in accounts))
+
+        expected = sorted(accounts, key=lambda a: (a.due_date, a.id), reverse=True)
+        self.assertEqual(ids, [a.id for a in expected])
+
+        ascending, _ = self.walk_cursor({'page_size': 5, 'ordering': 'due_date'})
+        self.assertEqual(ascending, list(reversed(ids)))
+
+    def test_cursor_pagination_without_count(self):
+        for _ in range(3):
+            self.create_account()
+
+        with CaptureQueriesContext(connection) as context:
+            data = self.client.get(self.url, {'cursor': ''}).json()
+        self.assertNotIn('count', data)
+        self.assertFalse(any(q['sql'].startswith('SELECT COUNT(*)') for q in context.captured_queries))
+
+        data = self.client.get(self.url, {'cursor': '', 'count': 'exact'}).json()
+        self.assertEqual(data['count'], 3)
+
+    def test_cursor_invalid(self):
+        response = self.client.get(self.url, {'cursor': 'invalido'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_rejects_ordering_it_cannot_follow(self):
+        self.create_account(description='Aluguel loja')
+
+        for params in ({'ordering': 'final_amount'}, {'search': 'aluguel'}):
+            response = self.client.get(self.url, dict(params, cursor=''))
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('ordering', response.json())
+
+        response = self.client.get(self.url, {'cursor': '', 'search': 'aluguel', 'ordering': '-due_date'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 1)
+
+
+class ExcelImportTests(SpreadsheetMixin, PayablesTestMixin, TestCase):
+
+    def test_import_creates_missing_registrations_once(self):
+        rows = [self.row({6: f'Conta {i}'}) for i in range(25)]
+        rows.append(self.row({7: None}))  # linha inválida
+
+        resultado = import_excel(None, self.build_sheet(rows), self.tenant, chunk_size=10)
+
+        self.assertEqual(resultado['sucesso'], 25)
+        self.assertEqual(len(resultado['erros']), 1)
+        self.assertEqual(AccountPayable.objects.filter(tenant=self.tenant).count(), 25)
+        self.assertEqual(Supplier.objects.filter(tenant=self.tenant, name='FORNECEDOR NOVO').count(), 1)
+        self.assertEqual(Category.objects.filter(tenant=self.tenant, name='ALUGUEL').count(), 1)
+        # Filial existente encontrada pelo CNPJ
+        self.assertEqual(Filial.objects.filter(tenant=self.tenant).count(), 1)
+        self.assertEqual(resultado['criados']['fornecedores'], ['Fornecedor Novo (sem CNPJ)'])
+
+        account = AccountPayable.objects.filter(tenant=self.tenant).first()
+        self.assertEqual(account.branch, self.branch)
+        self.assertTrue(account.description.startswith('CONTA'))
+
+    def test_import_applies_status_rules(self):
+        rows = [
+            self.row({6: 'Paga', 11: '150.00', 13: '01/01/2020'}),
+            self.row({6: 'Vencida', 13: '01/01/2020'}),
+        ]
+        import_excel(None, self.build_sheet(rows), self.tenant)
+
+        self.assertEqual(AccountPayable.objects.get(description='PAGA').status, 'paid')
+        self.assertEqual(AccountPayable.objects.get(description='VENCIDA').status, 'overdue')
+
+    def test_import_does_not_query_per_row(self):
+        sheet = self.build_sheet([self.row({6: f'Conta {i}'}) for i in range(300)])
+
+        with CaptureQueriesContext(connection) as ctx:
+            resultado = import_excel(None, sheet, self.tenant)
+
+        self.assertEqual(resultado['sucesso'], 300)
+        # Cargas dos caches + criações em lote + poucos INSERTs em lote
+        self.assertLess(len(ctx.captured_queries), 30)
+
+    def test_import_respects_row_limit(self):
+        sheet = self.build_sheet([self.row() for _ in range(5)])
+
+        resultado = import_excel(None, sheet, self.tenant, max_rows=3)
+
+        self.assertEqual(resultado['sucesso'], 0)
+        self.assertIn('limite de 3 linhas', resultado['erros'][0])
+        self.assertFalse(AccountPayable.objects.filter(tenant=self.tenant).exists())
+
+    def test_import_rejects_only_rows_that_do_not_fit_the_fields(self):
+        rows = [
+            self.row({6: 'Válida', 7: 33.333333333333336}),
+            self.row({6: 'X' * 201}),  # description: max_length=200
+            self.row({6: 'Valor alto', 7: '10000000000.00'}),  # max_digits=12
+            self.row({6: 'Final alto', 7: '9999999999.00', 9: '1.00'}),
+            self.row({6: 'Não numérico', 7: 'abc'}),
+        ]
+
+        resultado = import_excel(None, self.build_sheet(rows), self.tenant, chunk_size=10)
+
+        self.assertEqual(resultado['sucesso'], 1)
+        self.assertEqual([erro.split(':')[0] for erro in resultado['erros']],
+                         ['Linha 3', 'Linha 4', 'Linha 5', 'Linha 6'])
+        self.assertIn('200 caracteres', resultado['erros'][0])
+        self.assertEqual(AccountPayable.objects.get(tenant=self.tenant).original_amount, Decimal('33.33'))
+
+    def test_import_rejects_only_rows_with_non_date_cells(self):
+        rows = [
+            self.row({6: 'Válida', 12: date(2030, 10, 1)}),
+            self.row({6: 'Serial', 13: 45000}),  # número de série do Excel sem formato de data
+            self.row({6: 'Emissão', 12: 'ontem'}),
+            self.row({6: 'Pagamento', 14: 1.5}),
+        ]
+
+        resultado = import_excel(None, self.build_sheet(rows), self.tenant)
+
+        self.assertEqual(resultado['sucesso'], 1)
+        self.assertEqual([erro.split(':')[0] for erro in resultado['erros']], ['Linha 3', 'Linha 4', 'Linha 5'])
+        self.assertIn('Data inválida', resultado['erros'][0])
+        self.assertEqual(AccountPayable.objects.get(tenant=self.tenant).issue_date, date(2030, 10, 1))
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), PAYABLES_IMPORT_ASYNC=False)
+class ImportJobTests(SpreadsheetMixin, PayablesTestMixin, TestCase):
+    url = '/api/payables/import-jobs/'
+
+    def upload(self, rows, name='contas.xlsx'):
+        sheet = self.build_sheet(rows)
+        upload = SimpleUploadedFile(name, sheet.read())
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, {'file': upload}, format='multipart')
+
+    def test_upload_processes_job_and_reports_progress(self):
+        rows = [self.row({6: f'Conta {i}'}) for i in range(12)]
+        rows.append(self.row({7: None}))
+
+        response = self.upload(rows)
+        self.assertEqual(response.status_code, 202)
+
+        job = self.client.get(f"{self.url}{response.json()['id']}/").json()
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['percent'], 100)
+        self.assertEqual(job['success_count'], 12)
+        self.assertEqual(job['processed_rows'], 13)
+        self.assertEqual(len(job['errors']), 1)
+        self.assertEqual(AccountPayable.objects.filter(tenant=self.tenant).count(), 12)
+
+    def test_upload_over_row_limit_saves_nothing(self):
+        """O limite é validado antes do primeiro lote (lotes são gravados um a um)"""
+        from . import excel_import
+
+        with patch.object(excel_import, 'IMPORT_MAX_ROWS', 3), patch.object(excel_import, 'IMPORT_CHUNK_SIZE', 2):
+            response = self.upload([self.row({6: f'Conta {i}'}) for i in range(5)])
+
+        job = self.client.get(f"{self.url}{response.json()['id']}/").json()
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['success_count'], 0)
+        self.assertIn('limite de 3 linhas', job['errors'][0])
+        self.assertFalse(AccountPayable.objects.filter(tenant=self.tenant).exists())
+
+    @override_settings(PAYABLES_IMPORT_EXTERNAL_WORKER=True)
+    def test_worker_command_processes_pending_jobs(self):
+        """Com worker externo o upload só cria o job; process_imports o processa uma única vez"""
+        response = self.upload([self.row({6: f'Conta {i}'}) for i in range(3)])
+        job = ImportJob.objects.get(pk=response.json()['id'])
+        self.assertEqual(job.status, 'pending')
+
+        call_command('process_imports', once=True, stdout=io.StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.success_count, 3)
+        # Job já reservado não é processado de novo
+        self.assertFalse(claim_job(job.pk))
+        run_import_job(job.pk)
+        self.assertEqual(AccountPayable.objects.filter(tenant=self.tenant).count(), 3)
+
+    @override_settings(PAYABLES_IMPORT_EXTERNAL_WORKER=True)
+    def test_interrupted_jobs_are_marked_failed(self):
+        """Importação parada no meio (reinício) vira falha em vez de ficar em processamento"""
+        response = self.upload([self.row()])
+        job = ImportJob.objects.get(pk=response.json()['id'])
+        ImportJob.objects.filter(pk=job.pk).update(
+            status='processing', updated_at=timezone.now() - timedelta(hours=1)
+        )
+
+        call_command('process_imports', once=True, stdout=io.StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('interrompida', job.errors[0])
+        self.assertFalse(AccountPayable.objects.filter(tenant=self.tenant).exists())
+
+    def test_upload_rejects_non_xlsx(self):
+        response = self.upload([], name='contas.csv')
+        self.assertEqual(response.status_code, 400)
+
+
+class ExportTests(PayablesTestMixin, TestCase):
+    url = '/api/payables/accounts-payable/export/'
+
+    def test_export_csv_honors_filters(self):
+        self.create_account(description='Aluguel')
+        self.create_account(description='Energia', status='cancelled')
+
+        response = self.client.get(self.url, {'status': 'cancelled'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        lines = list(csv.reader(io.StringIO(content), delimiter=';'))
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[1][6], 'ENERGIA')
+        self.assertEqual(lines[1][15], 'cancelled')
+
+    def test_export_xlsx_can_be_reimported(self):
+        self.create_account(description='Aluguel', due_date=date(2030, 5, 10))
+
+        response = self.client.get(self.url, {'export_format': 'xlsx'})
+        self.assertEqual(response.status_code, 200)
+
+        sheet = io.BytesIO(b''.join(response.streaming_content))
+        resultado = import_excel(None, sheet, self.tenant)
+        self.assertEqual(resultado['sucesso'], 1, resultado['erros'])
+        self.assertEqual(AccountPayable.objects.filter(description='ALUGUEL').count(), 2)
+
+    def test_export_invalid_format(self):
+        response = self.client.get(self.url, {'export_format': 'pdf'})
+        self.assertEqual(response.status_code, 400)
+
+
+class BulkPaymentTests(PayablesTestMixin, TestCase):
+    url = '/api/payables/payable-payments/bulk/'
+
+    def payment(self, account, amount, **kwargs):
+        data = {
+            'account_payable': account.pk,
+            'payment_date': date.today().isoformat(),
+            'amount': str(amount),
+            'payment_method': self.payment_method.pk,
+            'paid_by_branch': self.branch.pk,
+        }
+        data.update(kwargs)
+        return data
+
+    def test_bulk_registers_payments_and_updates_accounts(self):
+        full = self.create_account(original_amount=Decimal('100.00'))
+        partial = self.create_account(original_amount=Decimal('200.00'))
+        with_fine = self.create_account(original_amount=Decimal('50.00'))
+
+        response = self.client.post(self.url, {'payments': [
+            self.payment(full, '60.00'),
+            self.payment(full, '40.00'),
+            self.payment(partial, '50.00'),
+            self.payment(with_fine, '55.00', fine='5.00'),
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['created'], 4)
+
+        full.refresh_from_db()
+        partial.refresh_from_db()
+        with_fine.refresh_from_db()
+        self.assertEqual(full.status, 'paid')
+        self.assertEqual(full.paid_amount, Decimal('100.00'))
+        self.assertEqual(partial.status, 'partially_paid')
+        self.assertEqual(with_fine.fine, Decimal('5.00'))
+        self.assertEqual(with_fine.status, 'paid')
+
+    def test_bulk_is_all_or_nothing(self):
+        account = self.create_account()
+        other_tenant = Tenant.objects.create(name='Outra', slug='outra', email='o@o.com')
+        foreign_method = PaymentMethod.objects.create(tenant=other_tenant, name='Pix')
+
+        response = self.client.post(self.url, {'payments': [
+            self.payment(account, '10.00'),
+            self.payment(account, '10.00', payment_method=foreign_method.pk),
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('payment_method', response.json()['payments'][1])
+        self.assertFalse(PayablePayment.objects.exists())
+
+    def test_bulk_query_count_is_constant(self):
+        accounts = [self.create_account() for _ in range(3)]
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, {'payments': [self.payment(a, '10.00') for a in accounts]}, format='json')
+
+        accounts = [self.create_account() for _ in range(30)]
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self.url, {'payments': [self.payment(a, '10.00') for a in accounts]}, format='json')
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+
+class BulkAccountActionTests(PayablesTestMixin, TestCase):
+
+    def test_bulk_mark_as_paid_single_update(self):
+        first = self.create_account(original_amount=Decimal('100.00'), fine=Decimal('10.00'))
+        second = self.create_account(original_amount=Decimal('50.00'), discount=Decimal('5.00'))
+        cancelled = self.create_account(status='cancelled')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/payables/accounts-payable/bulk_mark_as_paid/', {
+                'ids': [first.pk, second.pk, cancelled.pk],
+                'payment_date': '2025-01-10',
+                'payment_method': self.payment_method.pk,
+            }, format='json')
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['updated'], 2)
+        self.assertEqual(len([q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]), 1)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        cancelled.refresh_from_db()
+        self.assertEqual(first.paid_amount, Decimal('110.00'))
+        self.assertEqual(second.paid_amount, Decimal('45.00'))
+        self.assertEqual(first.status, 'paid')
+        self.assertEqual(first.payment_date, date(2025, 1, 10))
+        self.assertEqual(cancelled.status, 'cancelled')
+
+    def test_bulk_cancel(self):
+        accounts = [self.create_account() for _ in range(3)]
+        other_tenant = Tenant.objects.create(name='Outra', slug='outra', email='o@o.com')
+        foreign = self.create_account(tenant=other_tenant)
+
+        response = self.client.post('/api/payables/accounts-payable/bulk_cancel/', {
+            'ids': [a.pk for a in accounts] + [foreign.pk],
+        }, format='json')
+
+        self.assertEqual(response.json()['updated'], 3)
+        foreign.refresh_from_db()
+        self.assertNotEqual(foreign.status, 'cancelled')
+
+
+class OverdueSweepTests(PayablesTestMixin, TestCase):
+
+    def test_sweep_marks_only_past_due_open_accounts(self):
+        today = date.today()
+        past_due = self.create_account(due_date=today)
+        future = self.create_account(due_date=today + timedelta(days=5))
+        paid = self.create_account(due_date=today, paid_amount=Decimal('100.00'))
+
+        run = sweep_overdue(today + timedelta(days=1))
+
+        self.assertEqual(run.updated_count, 1)
+        past_due.refresh_from_db()
+        future.refresh_from_db()
+        paid.refresh_from_db()
+        self.assertEqual(past_due.status, 'overdue')
+        self.assertEqual(future.status, 'due')
+        self.assertEqual(paid.status, 'paid')
+
+    def test_command_records_run(self):
+        out = io.StringIO()
+        call_command('sweep_overdue', '--date', '2030-01-01', stdout=out)
+        self.assertTrue(OverdueSweepRun.objects.filter(reference_date=date(2030, 1, 1)).exists())
+        self.assertIn('contas marcadas como vencidas', out.getvalue())
+
+        call_command('sweep_overdue', '--date', '2030-01-01', stdout=io.StringIO())
+        self.assertEqual(OverdueSweepRun.objects.filter(reference_date=date(2030, 1, 1)).count(), 1)
+
+    def test_requests_do_not_sweep_and_only_warn_when_stale(self):
+        account = self.create_account(due_date=date.today() - timedelta(days=1))
+        AccountPayable.objects.filter(pk=account.pk).update(status='due')
+        OverdueSweepRun.objects.all().delete()
+
+        with patch.object(services, '_last_sweep_date', None), \
+                self.assertLogs('payables.services', 'WARNING') as logs:
+            response = self.client.get('/api/payables/accounts-payable/')
+            self.client.get('/api/payables/accounts-payable/')  # uma verificação por dia
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('sweep_overdue', logs.output[0])
+        account.refresh_from_db()
+        self.assertEqual(account.status, 'due')
+        self.assertFalse(OverdueSweepRun.objects.exists())
+
+
+class RecurrenceTests(PayablesTestMixin, TestCase):
+    url = '/api/payables/accounts-payable/'
+
+    def test_create_recurring_account_bulk_creates_children(self):
+        data = {
+            'branch': self.branch.pk,
+            'supplier': self.supplier.pk,
+            'category': self.category.pk,
+            'payment_method': self.payment_method.pk,
+            'description': 'Aluguel',
+            'original_amount': '1000.00',
+            'issue_date': '2030-01-05',
+            'due_date': '2030-01-31',
+            'is_recurring': True,
+            'recurrence_frequency': 'monthly',
+            'recurrence_count': 12,
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, 201, response.content)
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "payables_accountpayable"')]
+        self.assertEqual(len(inserts), 2)  # conta pai + um bulk_create
+
+        parent = AccountPayable.objects.get(recurring_parent__isnull=True, description='ALUGUEL')
+        children = list(parent.recurring_children.order_by('due_date'))
+        self.assertEqual(len(children), 11)
+        self.assertEqual(children[0].description, 'ALUGUEL (2/12)')
+        self.assertEqual(children[0].due_date, date(2030, 2, 28))
+        self.assertEqual(children[-1].due_date, date(2030, 12, 31))
+        self.assertEqual(parent.recurrence_count, 12)
+
+
+class AccountPayableSearchTests(PayablesTestMixin, TestCase):
+    url = '/api/payables/accounts-payable/'
+
+    def search(self, value, **params):
+        response = self.client.get(self.url, {'search': value, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.json()['results']]
+
+    def test_search_document_includes_registration_names(self):
+        account = self.create_account(description='Manutenção elétrica', invoice_numbers='4521')
+        account.refresh_from_db()
+        self.assertEqual(account.search_document, 'manutencao eletrica 4521 fornecedor servicos matriz')
+
+    def test_search_prefix_and_accents(self):
+        account = self.create_account(description='Manutenção elétrica')
+        self.create_account(description='Aluguel')
+
+        self.assertEqual(self.search('manutencao'), [account.id])
+        self.assertEqual(self.search('ELÉTR'), [account.id])
+        self.assertEqual(self.search('manut eletr'), [account.id])
+        self.assertEqual(self.search('manutencao aluguel'), [])
+
+    def test_search_by_registration_name_and_rename(self):
+        account = self.create_account()
+        self.assertEqual(self.search('fornecedor'), [account.id])
+
+        self.supplier.name = 'Companhia de Energia'
+        self.supplier.save()
+
+        self.assertEqual(self.search('fornecedor'), [])
+        self.assertEqual(self.search('energia'), [account.id])
+
+    def test_search_orders_by_relevance(self):
+        weak = self.create_account(description='Energia', due_date=date.today() + timedelta(days=30))
+        strong = self.create_account(description='Energia energia energia', notes='energia')
+
+        self.assertEqual(self.search('energia'), [strong.id, weak.id])
+        self.assertEqual(self.search('energia', ordering='-due_date'), [weak.id, strong.id])
+
+    def test_bulk_created_accounts_are_indexed(self):
+        payload = {
+            'branch': self.branch.id,
+            'supplier': self.supplier.id,
+            'category': self.category.id,
+            'description': 'Licença software',
+            'issue_date': str(date.today()),
+            'original_amount': '50.00',
+            'due_date': str(date.today() + timedelta(days=5)),
+            'is_recurring': True,
+            'recurrence_frequency': 'monthly',
+            'recurrence_count': 3,
+        }
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.search('licenca')), 3)
+
+    def test_rebuild_command(self):
+        account = self.create_account(description='Internet')
+        AccountPayable.objects.filter(pk=account.pk).update(search_document='')
+        self.assertEqual(self.search('internet'), [])
+
+        call_command('rebuild_search_index', stdout=io.StringIO())
+        self.assertEqual(self.search('internet'), [account.id])
+
+
+class StoredAmountsTests(PayablesTestMixin, TestCase):
+    url = '/api/payables/accounts-payable/'
+
+    def test_amounts_are_stored_and_follow_payments(self):
+        account = self.create_account(
+            original_amount=Decimal('100.00'),
+            discount=Decimal('10.00'),
+            fine=Decimal('5.00'),
+        )
+        self.assertEqual(account.final_amount, Decimal('95.00'))
+        self.assertEqual(account.remaining_amount, Decimal('95.00'))
+
+        register_payments(self.tenant, [{
+            'account_payable': account,
+            'payment_date': date.today(),
+            'amount': Decimal('30.00'),
+            'payment_method': self.payment_method,
+            'interest': Decimal('2.00'),
+        }])
+        account.refresh_from_db()
+        self.assertEqual(account.final_amount, Decimal('97.00'))
+        self.assertEqual(account.remaining_amount, Decimal('67.00'))
+
+        bulk_mark_as_paid(AccountPayable.objects.filter(pk=account.pk))
+        account.refresh_from_db()
+        self.assertEqual(account.paid_amount, Decimal('97.00'))
+        self.assertEqual(account.remaining_amount, Decimal('0.00'))
+
+    def test_filter_and_order_by_remaining_amount(self):
+        small = self.create_account(original_amount=Decimal('50.00'))
+        large = self.create_account(original_amount=Decimal('500.00'))
+        self.create_account(original_amount=Decimal('300.00'), paid_amount=Decimal('300.00'))
+
+        response = self.client.get(self.url, {'remaining_amount__gte': '40', 'ordering': '-remaining_amount'})
+        self.assertEqual([item['id'] for item in response.json()['results']], [large.pk, small.pk])
+
+        total = AccountPayable.objects.filter(tenant=self.tenant).aggregate(total=Sum('remaining_amount'))['total']
+        self.assertEqual(total, Decimal('550.00'))
+
+
+class DailySummaryTests(SpreadsheetMixin, PayablesTestMixin, TestCase):
+
+    def summary(self):
+        return {
+            (row.date, row.status): (row.count, row.original_amount, row.final_amount, row.paid_amount)
+            for row in PayableDailySummary.objects.filter(tenant=self.tenant)
+        }
+
+    def test_summary_follows_account_writes(self):
+        day = date.today() + timedelta(days=3)
+        other_day = day + timedelta(days=1)
+        first = self.create_account(due_date=day, fine=Decimal('10.00'))
+        second = self.create_account(due_date=day)
+
+        self.assertEqual(self.summary(), {
+            (day, 'due'): (2, Decimal('200.00'), Decimal('210.00'), Decimal('0.00')),
+        })
+
+        account = AccountPayable.objects.get(pk=second.pk)
+        account.due_date = other_day
+        account.save()
+        PayablePayment.objects.create(
+            tenant=self.tenant,
+            account_payable=first,
+            payment_date=date.today(),
+            amount=Decimal('110.00'),
+            payment_method=self.payment_method,
+        )
+
+        self.assertEqual(self.summary(), {
+            (day, 'paid'): (1, Decimal('100.00'), Decimal('110.00'), Decimal('110.00')),
+            (other_day, 'due'): (1, Decimal('100.00'), Decimal('100.00'), Decimal('0.00')),
+        })
+
+        account.delete()
+        self.assertNotIn((other_day, 'due'), self.summary())
+
+    def test_bulk_paths_match_rebuild(self):
+        today = date.today()
+        accounts = [self.create_account(due_date=today + timedelta(days=i)) for i in range(6)]
+        queryset = AccountPayable.objects.filter(tenant=self.tenant)
+
+        bulk_mark_as_paid(queryset.filter(pk=accounts[0].pk))
+        bulk_cancel(queryset.filter(pk=accounts[1].pk))
+        register_payments(self.tenant, [{
+            'account_payable': accounts[2],
+            'payment_date': today,
+            'amount': Decimal('40.00'),
+            'payment_method': self.payment_method,
+        }])
+        sweep_overdue(today + timedelta(days=4))
+
+        incremental = self.summary()
+        self.assertEqual(incremental[(today + timedelta(days=2), 'partially_paid')][3], Decimal('40.00'))
+        self.assertEqual(incremental[(today + timedelta(days=3), 'overdue')][0], 1)
+
+        out = io.StringIO()
+        call_command('rebuild_daily_summary', stdout=out)
+        self.assertEqual(self.summary(), incremental)
+        self.assertIn('linhas de resumo', out.getvalue())
+
+    def test_import_updates_summary(self):
+        resultado = import_excel(None, self.build_sheet([self.row()]), self.tenant)
+
+        self.assertEqual(resultado['sucesso'], 1)
+        self.assertEqual(self.summary()[(date(2030, 10, 25), 'due')][1], Decimal('150.00'))
+
+
+class CashFlowTests(PayablesTestMixin, TestCase):
+    url = '/api/payables/accounts-payable/cash_flow/'
+
+    def setUp(self):
+        super().setUp()
+        get_cache().clear()
+
+    def test_monthly_buckets_include_future_recurrences(self):
+        today = date.today()
+        self.create_account(original_amount=Decimal('80.00'), due_date=today - timedelta(days=10))
+        self.create_account(original_amount=Decimal('100.00'), paid_amount=Decimal('40.00'), due_date=today)
+        self.create_account(status='cancelled', due_date=today)
+        parent = self.create_account(
+            original_amount=Decimal('200.00'),
+            due_date=today,
+            is_recurring=True,
+            recurrence_frequency='monthly',
+        )
+        create_recurrences(parent, 2)
+        # Série sem quantidade definida (ex.: importada): projeta sem fim
+        self.create_account(
+            original_amount=Decimal('200.00'),
+            due_date=today,
+            is_recurring=True,
+            recurrence_frequency='monthly',
+        )
+
+        response = self.client.get(self.url, {'granularity': 'month', 'months': 4})
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+
+        self.assertEqual(data['overdue']['count'], 1)
+        self.assertEqual(Decimal(str(data['overdue']['amount'])), Decimal('80.00'))
+
+        first = data['buckets'][0]
+        self.assertEqual(first['start'], today.replace(day=1).isoformat())
+        self.assertEqual(first['scheduled_count'], 3)
+        self.assertEqual(Decimal(str(first['scheduled_amount'])), Decimal('460.00'))
+
+        # Série de 2 já gerada por completo (pai + 1 filha): nada a projetar.
+        # Série sem fim: 2ª, 3ª e 4ª ocorrências projetadas dentro de 4 meses
+        self.assertEqual(sum(item['recurring_count'] for item in data['buckets']), 3)
+        self.assertEqual(sum(item['scheduled_count'] for item in data['buckets']), 4)
+        self.assertEqual(Decimal(str(data['total_amount'])), Decimal('1260.00'))
+
+    def test_response_is_cached_until_accounts_change(self):
+        self.create_account(due_date=date.today() + timedelta(days=1))
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        with self.assertNumQueries(0):
+            data = self.client.get(self.url).json()
+        self.assertEqual(sum(item['scheduled_count'] for item in data['buckets']), 1)
+
+        self.create_account(due_date=date.today() + timedelta(days=2))
+        data = self.client.get(self.url).json()
+        self.assertEqual(sum(item['scheduled_count'] for item in data['buckets']), 2)
+
+    def test_filters_are_part_of_the_cache_key(self):
+        other = Supplier.objects.create(tenant=self.tenant, name='Outro', cnpj='11111111000111')
+        self.create_account(due_date=date.today())
+        self.create_account(due_date=date.today(), supplier=other)
+
+        all_accounts = self.client.get(self.url, {'granularity': 'day'}).json()
+        filtered = self.client.get(self.url, {'granularity': 'day', 'supplier': other.pk}).json()
+
+        self.assertEqual(all_accounts['buckets'][0]['scheduled_count'], 2)
+        self.assertEqual(filtered['buckets'][0]['scheduled_count'], 1)
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get(self.url, {'granularity': 'year'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'months': 25}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'months': 'abc'}).status_code, 400)
@@ -3,11 +3,13 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     AccountPayableViewSet,
     PayablePaymentViewSet,
+    ImportJobViewSet,
 )
 
 router = DefaultRouter()
 router.register(r'accounts-payable', AccountPayableViewSet, basename='accountpayable')
 router.register(r'payable-payments', PayablePaymentViewSet, basename='payablepayment')
+router.register(r'import-jobs', ImportJobViewSet, basename='importjob')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,53 +1,109 @@
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, filters, status, mixins
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Sum
-from datetime import date, timedelta
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from datetime import date
+import hashlib
 
-from .models import AccountPayable, PayablePayment
+from .models import AccountPayable, PayablePayment, ImportJob, PayableDailySummary
 from .serializers import (
     AccountPayableListSerializer,
     AccountPayableDetailSerializer,
     AccountPayableCreateSerializer,
     PayablePaymentSerializer,
+    ImportJobSerializer,
+    BulkPayablePaymentSerializer,
+    BulkAccountActionSerializer,
 )
-from .filters import AccountPayableFilter, PayablePaymentFilter
+from .filters import AccountPayableFilter, PayablePaymentFilter, SearchRankOrderingFilter
+from .cache import get_cache, get_timeout, get_version
+from .dashboard import build_dashboard
+from .forecast import DEFAULT_GRANULARITY, DEFAULT_MONTHS, GRANULARITIES, build_cash_flow, get_horizon
+from .jobs import enqueue_import
+from .services import register_payments, bulk_mark_as_paid, bulk_cancel, warn_if_sweep_stale
+from .excel_import import export_csv, export_excel
+from core.authentication import TenantTokenUserAuthentication
 from core.models import Attachment
-from core.pagination import LargeResultsSetPagination
+from core.pagination import CursorOrPageNumberPagination
+from core.replicas import ReplicaReadMixin, read_from_primary
 
 
-class AccountPayableViewSet(viewsets.ModelViewSet):
+class AccountPayableViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciar Contas a Pagar
 
     Endpoints:
-    - GET /api/accounts-payable/ - Lista contas a pagar
+    - GET /api/accounts-payable/ - Lista contas a pagar (?page=N ou ?cursor= para keyset)
     - GET /api/accounts-payable/dashboard/ - Dashboard com estatísticas
+    - GET /api/accounts-payable/cash_flow/ - Projeção de saídas por dia/semana/mês
     - GET /api/accounts-payable/overdue/ - Lista contas vencidas
+    - GET /api/accounts-payable/export/ - Exporta contas filtradas (CSV/XLSX)
     - POST /api/accounts-payable/ - Cria nova conta (com suporte a recorrência)
     - GET /api/accounts-payable/{id}/ - Detalhes de uma conta
     - PUT/PATCH /api/accounts-payable/{id}/ - Atualiza conta
     - DELETE /api/accounts-payable/{id}/ - Soft delete
     - POST /api/accounts-payable/{id}/mark_as_paid/ - Marca como paga
     - POST /api/accounts-payable/{id}/cancel/ - Cancela conta
+    - POST /api/accounts-payable/bulk_mark_as_paid/ - Marca várias contas como pagas
+    - POST /api/accounts-payable/bulk_cancel/ - Cancela várias contas
     - POST /api/accounts-payable/{id}/add_attachment/ - Adiciona anexo
+
+    Listagem, dashboard, fluxo de caixa, vencidas e exportação leem da réplica
+    (quando configurada).
     """
+    authentication_classes = [TenantTokenUserAuthentication]
+    replica_actions = ('list', 'dashboard', 'overdue', 'export')
     parser_classes = (MultiPartParser, FormParser, JSONParser)
-    pagination_class = LargeResultsSetPagination  # Permite page_size customizado
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    pagination_class = CursorOrPageNumberPagination  # page_size customizado e ?cursor= (keyset)
+    keyset_field = 'due_date'
+    filter_backends = [DjangoFilterBackend, SearchRankOrderingFilter]
     filterset_class = AccountPayableFilter
-    ordering_fields = ['due_date', 'created_at', 'original_amount', 'payment_date', 'paid_amount']
+    ordering_fields = [
+        'due_date', 'created_at', 'original_amount', 'final_amount',
+        'remaining_amount', 'payment_date', 'paid_amount',
+    ]
     ordering = ['-due_date']
 
+    def initial(self, request, *args, **kwargs):
+        """
+        Avisa no log se a rotina de vencimento (comando agendado sweep_overdue)
+        está atrasada; o request só lê, nunca executa a rotina
+        """
+        super().initial(request, *args, **kwargs)
+        warn_if_sweep_stale()
+
     def get_queryset(self):
         """Retorna apenas contas do tenant do usuário"""
-        return AccountPayable.objects.filter(
+        queryset = AccountPayable.objects.filter(
             tenant=self.request.tenant,
             is_active=True
         ).select_related('branch', 'supplier', 'category', 'payment_method')
 
+        if self.action in ['list', 'overdue']:
+            queryset = self._annotate_attachments_count(queryset)
+
+        return queryset
+
+    def _annotate_attachments_count(self, queryset):
+        """
+        Anota a quantidade de anexos via subquery, evitando um COUNT(*)
+        por linha no AccountPayableListSerializer
+        """
+        attachments = Attachment.objects.filter(
+            content_type=ContentType.objects.get_for_model(AccountPayable),
+            object_id=OuterRef('pk')
+        ).order_by().values('object_id').annotate(
+            total=Count('id')
+        ).values('total')
+
+        return queryset.annotate(
+            attachments_total=Coalesce(Subquery(attachments, output_field=IntegerField()), 0)
+        )
+
     def get_serializer_class(self):
         """Retorna serializer adequado para cada ação"""
         if self.action == 'create':
@@ -63,73 +119,110 @@ class AccountPayableViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
         """
-        Retorna estatísticas para dashboard
-        """
-        queryset = self.get_queryset()
-        today = date.today()
-
-        # Estatísticas gerais
-        stats = {
-            'total_pending': queryset.filter(status__in=['pending', 'due', 'overdue']).count(),
-            'total_overdue': queryset.filter(status='overdue').count(),
-            'total_paid_this_month': queryset.filter(
-                status='paid',
-                payment_date__year=today.year,
-                payment_date__month=today.month
-            ).count(),
-
-            # Valores
-            'amount_pending': queryset.filter(
-                status__in=['pending', 'due', 'overdue']
-            ).aggregate(
-                total=Sum('original_amount')
-            )['total'] or 0,
-
-            'amount_overdue': queryset.filter(
-                status='overdue'
-            ).aggregate(
-                total=Sum('original_amount')
-            )['total'] or 0,
-
-            'amount_paid_this_month': queryset.filter(
-                status='paid',
-                payment_date__year=today.year,
-                payment_date__month=today.month
-            ).aggregate(
-                total=Sum('paid_amount')
-            )['total'] or 0,
-
-            # Próximos vencimentos (próximos 7 dias)
-            'due_next_7_days': queryset.filter(
-                status__in=['pending', 'due'],
-                due_date__gte=today,
-                due_date__lte=today + timedelta(days=7)
-            ).count(),
-
-            'amount_due_next_7_days': queryset.filter(
-                status__in=['pending', 'due'],
-                due_date__gte=today,
-                due_date__lte=today + timedelta(days=7)
-            ).aggregate(
-                total=Sum('original_amount')
-            )['total'] or 0,
-        }
-
-        # Top 5 fornecedores com mais contas pendentes
-        top_suppliers = queryset.filter(
-            status__in=['pending', 'due', 'overdue']
-        ).values(
-            'supplier__id',
-            'supplier__name'
-        ).annotate(
-            count=Sum('id'),
-            total_amount=Sum('original_amount')
-        ).order_by('-total_amount')[:5]
-
-        stats['top_suppliers'] = list(top_suppliers)
+        Retorna estatísticas para dashboard em uma única chamada:
+        indicadores, top fornecedores e buckets diários/semanais de
+        vencimentos e pagamentos. Lê o resumo diário (PayableDailySummary)
+        sempre que possível.
+
+        Query params opcionais:
+        - start: início do período dos gráficos (YYYY-MM-DD, padrão: início do mês)
+        - end: fim do período dos gráficos (YYYY-MM-DD, padrão: fim do mês)
+        """
+        try:
+            start = self._parse_date_param(request, 'start')
+            end = self._parse_date_param(request, 'end')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if start and end and start > end:
+            return Response(
+                {'error': 'A data inicial deve ser anterior à data final.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
+        stats = build_dashboard(
+            self.get_queryset(),
+            start=start,
+            end=end,
+            summary=PayableDailySummary.objects.filter(tenant=request.tenant)
+        )
         return Response(stats)
 
+    @action(detail=False, methods=['get'])
+    def cash_flow(self, request):
+        """
+        Projeção de saídas (valor restante das contas em aberto e recorrências
+        ainda não geradas) por dia, semana ou mês. Aceita os filtros da
+        listagem; a resposta fica em cache por tenant e parâmetros.
+
+        Query params opcionais:
+        - granularity: day, week (padrão) ou month
+        - start: início da projeção (YYYY-MM-DD, padrão: hoje)
+        - months: horizonte em meses (padrão: 3, máximo: 24)
+        """
+        granularity = request.query_params.get('granularity', DEFAULT_GRANULARITY)
+        if granularity not in GRANULARITIES:
+            return Response(
+                {'error': "Granularidade inválida. Use 'day', 'week' ou 'month'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            start = self._parse_date_param(request, 'start')
+            months = request.query_params.get('months') or DEFAULT_MONTHS
+            if not str(months).isdigit():
+                raise ValueError("Parâmetro 'months' inválido. Use um número de meses.")
+            start, end = get_horizon(start, int(months))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        tenant_id = request.tenant.pk
+        params = hashlib.md5(request.query_params.urlencode().encode()).hexdigest()
+        key = f'payables:cash_flow:{tenant_id}:{get_version(tenant_id)}:{start}:{end}:{params}'
+
+        cache = get_cache()
+        data = cache.get(key)
+        if data is None:
+            # Fica no cache sob a versão atual: lê do principal, não da réplica atrasada
+            with read_from_primary():
+                queryset = self.filter_queryset(self.get_queryset())
+                data = build_cash_flow(queryset, granularity, start, end)
+            cache.set(key, data, get_timeout())
+        return Response(data)
+
+    def _parse_date_param(self, request, name):
+        """Converte um query param YYYY-MM-DD em date (ou None)"""
+        value = request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"Parâmetro '{name}' inválido. Use o formato YYYY-MM-DD.")
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Exporta as contas filtradas (aceita todos os filtros e a ordenação
+        da listagem) em streaming, com as mesmas colunas da planilha modelo.
+
+        Query params:
+        - export_format: csv (padrão) ou xlsx
+        """
+        export_format = request.query_params.get('export_format', 'csv').lower()
+        if export_format not in ['csv', 'xlsx']:
+            return Response(
+                {'error': "Formato inválido. Use 'csv' ou 'xlsx'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # O streaming roda depois do fim da view: fixa agora o banco da leitura
+        queryset = queryset.using(queryset.db)
+        if export_format == 'xlsx':
+            return export_excel(queryset)
+        return export_csv(queryset)
+
     @action(detail=False, methods=['get'])
     def overdue(self, request):
         """Retorna apenas contas vencidas"""
@@ -170,6 +263,39 @@ class AccountPayableViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(account)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post'])
+    def bulk_mark_as_paid(self, request):
+        """
+        Marca várias contas como pagas com um único UPDATE
+
+        Body: {"ids": [1, 2, 3], "payment_date": "2025-01-10", "payment_method": 2}
+        """
+        serializer = BulkAccountActionSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        updated = bulk_mark_as_paid(
+            AccountPayable.objects.filter(tenant=request.tenant, is_active=True, pk__in=data['ids']),
+            payment_date=data.get('payment_date'),
+            payment_method=data.get('payment_method'),
+        )
+        return Response({'updated': updated})
+
+    @action(detail=False, methods=['post'])
+    def bulk_cancel(self, request):
+        """
+        Cancela várias contas com um único UPDATE
+
+        Body: {"ids": [1, 2, 3]}
+        """
+        serializer = BulkAccountActionSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+
+        updated = bulk_cancel(
+            AccountPayable.objects.filter(tenant=request.tenant, is_active=True, pk__in=serializer.validated_data['ids'])
+        )
+        return Response({'updated': updated})
+
     @action(detail=True, methods=['post'])
     def add_attachment(self, request, pk=None):
         """Adiciona anexo a uma conta"""
@@ -200,13 +326,17 @@ class PayablePaymentViewSet(viewsets.ModelViewSet):
     ViewSet para gerenciar Pagamentos de Contas a Pagar
 
     Endpoints:
-    - GET /api/payable-payments/ - Lista pagamentos
+    - GET /api/payable-payments/ - Lista pagamentos (?page=N ou ?cursor= para keyset)
     - POST /api/payable-payments/ - Registra novo pagamento
     - GET /api/payable-payments/{id}/ - Detalhes de um pagamento
+    - POST /api/payable-payments/bulk/ - Registra pagamentos em lote
     - DELETE /api/payable-payments/{id}/ - Remove pagamento
     """
     serializer_class = PayablePaymentSerializer
+    authentication_classes = [TenantTokenUserAuthentication]
     parser_classes = (MultiPartParser, FormParser, JSONParser)
+    pagination_class = CursorOrPageNumberPagination
+    keyset_field = 'payment_date'
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = PayablePaymentFilter
     ordering_fields = ['payment_date', 'created_at', 'amount']
@@ -218,17 +348,74 @@ class PayablePaymentViewSet(viewsets.ModelViewSet):
             tenant=self.request.tenant
         ).select_related('account_payable', 'payment_method', 'paid_by_branch')
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Registra vários pagamentos de uma vez (pagamento em lote).
+        Tudo ou nada: se algum item for inválido, nenhum é gravado.
+
+        Body: {"payments": [{account_payable, payment_date, amount,
+               payment_method, paid_by_branch, interest, fine, notes}, ...]}
+        """
+        serializer = BulkPayablePaymentSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+
+        payments, accounts = register_payments(request.tenant, serializer.validated_data['payments'])
+
+        return Response({
+            'created': len(payments),
+            'payments': [payment.pk for payment in payments],
+            'accounts': [
+                {
+                    'id': account.pk,
+                    'paid_amount': account.paid_amount,
+                    'status': account.status,
+                }
+                for account in accounts
+            ],
+        }, status=status.HTTP_201_CREATED)
+
     def perform_destroy(self, instance):
         """
         Ao deletar um pagamento, recalcula o valor pago da conta
         """
-        account = instance.account_payable
         instance.delete()  # Delete físico mesmo
 
         # Recalcular total pago
-        total_paid = account.payments.aggregate(
-            total=Sum('amount')
-        )['total'] or 0
+        instance.update_account_paid_amount()
+
+
+class ImportJobViewSet(mixins.CreateModelMixin,
+                       mixins.RetrieveModelMixin,
+                       mixins.ListModelMixin,
+                       viewsets.GenericViewSet):
+    """
+    ViewSet para importações de planilhas em segundo plano
+
+    Endpoints:
+    - GET /api/payables/import-jobs/ - Lista importações
+    - POST /api/payables/import-jobs/ - Envia planilha (multipart, campo "file")
+    - GET /api/payables/import-jobs/{id}/ - Progresso/resultado da importação
+    """
+    serializer_class = ImportJobSerializer
+    parser_classes = (MultiPartParser, FormParser)
+
+    def get_queryset(self):
+        """Retorna apenas importações do tenant do usuário"""
+        return ImportJob.objects.filter(tenant=self.request.tenant)
+
+    def perform_create(self, serializer):
+        """Salva a planilha e agenda o processamento"""
+        file = serializer.validated_data['file']
+        job = serializer.save(
+            tenant=self.request.tenant,
+            created_by=self.request.user,
+            original_filename=file.name,
+        )
+        enqueue_import(job)
 
-        account.paid_amount = total_paid
-        account.save()
+    def create(self, request, *args, **kwargs):
+        """Retorna 202 - a importação segue em segundo plano"""
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
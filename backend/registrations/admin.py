@@ -4,6 +4,7 @@ from django.utils.html import format_html
 from django.http import HttpResponseRedirect
 from django.urls import reverse
 from django.db.models import Q
+from .cache import update_and_invalidate
 from .models import Supplier, Category, PaymentMethod, Filial
 from core.admin import BaseAdmin
 
@@ -112,13 +113,13 @@ class FilialAdmin(BaseAdmin):
 # Ações personalizadas para todos os admins
 def activate_selected(modeladmin, request, queryset):
     """Ativa os registros selecionados"""
-    updated = queryset.update(is_active=True)
+    updated = update_and_invalidate(queryset, is_active=True)
     messages.success(request, f'{updated} registros ativados com sucesso.')
 activate_selected.short_description = "Ativar registros selecionados"
 
 def deactivate_selected(modeladmin, request, queryset):
     """Desativa os registros selecionados"""
-    updated = queryset.update(is_active=False)
+    updated = update_and_invalidate(queryset, is_active=False)
     messages.success(request, f'{updated} registros desativados com sucesso.')
 deactivate_selected.short_description = "Desativar registros selecionados"
 
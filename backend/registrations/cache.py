@@ -0,0 +1,114 @@
+"""
+Cache das listas de dropdown dos cadastros
+
+As respostas de /dropdown/ ficam no cache configurado em REGISTRATIONS_CACHE
+(alias de CACHES: memória local, arquivo, Redis...), separadas por tenant,
+modelo e filtros da URL. Cada (tenant, modelo) tem uma versão; qualquer
+alteração troca a versão (signals post_save/post_delete), tornando as
+entradas antigas inacessíveis. Cada resposta leva um ETag: o navegador
+revalida com If-None-Match e recebe 304 se a lista não mudou.
+"""
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.replicas import read_from_primary
+
+
+def get_cache():
+    return caches[getattr(settings, 'REGISTRATIONS_CACHE', 'default')]
+
+
+def _timeout():
+    return getattr(settings, 'REGISTRATIONS_CACHE_TIMEOUT', 3600)
+
+
+def _version_key(model, tenant_id):
+    return f'registrations:version:{model._meta.label_lower}:{tenant_id}'
+
+
+def get_version(model, tenant_id):
+    """Versão atual da lista (criada se ainda não existir)"""
+    cache = get_cache()
+    key = _version_key(model, tenant_id)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key)
+    return version
+
+
+def invalidate(model, tenant_id):
+    """Troca a versão da lista do tenant (descarta o cache)"""
+    get_cache().set(_version_key(model, tenant_id), uuid.uuid4().hex, None)
+
+
+def update_and_invalidate(queryset, **values):
+    """
+    update() em lote que invalida as listas dos tenants afetados.
+    Os tenants são lidos antes do update: depois dele o queryset pode não
+    encontrar mais os registros (ex.: filtrado por is_active).
+
+    Returns:
+        int: Quantidade de registros atualizados
+    """
+    tenant_ids = set(queryset.values_list('tenant_id', flat=True))
+    updated = queryset.update(**values)
+    for tenant_id in tenant_ids:
+        invalidate(queryset.model, tenant_id)
+    return updated
+
+
+def combined_version(models, tenant_id):
+    """Hash das versões de várias listas do tenant (muda se qualquer uma mudar)"""
+    versions = ':'.join(get_version(model, tenant_id) for model in models)
+    return hashlib.md5(versions.encode()).hexdigest()
+
+
+def make_etag(data):
+    raw = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+    return f'"{hashlib.md5(raw).hexdigest()}"'
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in header.split(',')]
+    return '*' in tags or etag in tags
+
+
+def cached_dropdown(view, serializer_class):
+    """
+    Resposta do endpoint dropdown da view, usando o cache e ETag.
+    Sem alterações nos cadastros, não consulta o banco. A lista guardada sob
+    a versão atual é lida do banco principal (a réplica pode estar atrasada).
+    """
+    request = view.request
+    queryset = view.get_queryset()
+    model = queryset.model
+    tenant_id = request.tenant.pk
+
+    params = request.query_params.urlencode()
+    key = f'registrations:dropdown:{model._meta.label_lower}:{tenant_id}:{get_version(model, tenant_id)}:{params}'
+
+    cache = get_cache()
+    entry = cache.get(key)
+    if entry is None:
+        with read_from_primary():
+            queryset = view.filter_queryset(queryset).filter(is_active=True)
+            data = list(serializer_class(queryset, many=True).data)
+        entry = {'etag': make_etag(data), 'data': data}
+        cache.set(key, entry, _timeout())
+
+    headers = {'ETag': entry['etag'], 'Cache-Control': 'private, no-cache'}
+    if etag_matches(request, entry['etag']):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(entry['data'], headers=headers)
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.7 on 2026-10-17 19:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+from core.utils import normalize_name
+
+MODELS = ['Supplier', 'Category', 'PaymentMethod', 'Filial']
+
+
+def populate_normalized_names(apps, schema_editor):
+    """Preenche o nome normalizado dos cadastros existentes"""
+    for model_name in MODELS:
+        model = apps.get_model('registrations', model_name)
+        objects = list(model.objects.only('pk', 'name'))
+        for obj in objects:
+            obj.normalized_name = normalize_name(obj.name)
+        model.objects.bulk_update(objects, ['normalized_name'], batch_size=1000)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """No PostgreSQL, índice trigram para busca aproximada/por trecho do nome"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for model_name in MODELS:
+        table = apps.get_model('registrations', model_name)._meta.db_table
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_name_trgm ON {table} '
+            'USING gin (normalized_name gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name in MODELS:
+        table = apps.get_model('registrations', model_name)._meta.db_table
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_name_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0004_alter_filial_unique_together_and_more'),
+        ('tenant', '0002_alter_tenant_logo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='normalized_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200, verbose_name='Nome Normalizado'),
+        ),
+        migrations.AddField(
+            model_name='filial',
+            name='normalized_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200, verbose_name='Nome Normalizado'),
+        ),
+        migrations.AddField(
+            model_name='paymentmethod',
+            name='normalized_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200, verbose_name='Nome Normalizado'),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='normalized_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200, verbose_name='Nome Normalizado'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['tenant', 'normalized_name'], name='registratio_tenant__5f2154_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filial',
+            index=models.Index(fields=['tenant', 'normalized_name'], name='registratio_tenant__fb13e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentmethod',
+            index=models.Index(fields=['tenant', 'normalized_name'], name='registratio_tenant__772a7b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['tenant', 'normalized_name'], name='registratio_tenant__2f9c58_idx'),
+        ),
+        migrations.RunPython(populate_normalized_names, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
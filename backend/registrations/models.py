@@ -1,9 +1,33 @@
 from django.db import models
 from django.core.validators import MinLengthValidator
 from core.models import TenantAwareModel, SoftDeleteModel, UppercaseMixin
+from core.utils import normalize_name
 
 
-class Supplier(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
+class NormalizedNameMixin(models.Model):
+    """Mantém o nome normalizado (sem acentos, maiúsculo) usado no autocomplete"""
+
+    normalized_name = models.CharField('Nome Normalizado', max_length=200, blank=True, default='', editable=False)
+
+    class Meta:
+        abstract = True
+
+    def refresh_normalized_name(self):
+        """
+        Atualiza normalized_name a partir do nome.
+        Chamado no save() e pelas operações em lote (bulk_create).
+        """
+        self.normalized_name = normalize_name(self.name)
+
+    def save(self, *args, **kwargs):
+        self.refresh_normalized_name()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'normalized_name'}
+        super().save(*args, **kwargs)
+
+
+class Supplier(UppercaseMixin, NormalizedNameMixin, TenantAwareModel, SoftDeleteModel):
     """Modelo para Fornecedores"""
 
     uppercase_fields = ['name', 'address', 'notes']
@@ -28,6 +52,7 @@ class Supplier(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
         ordering = ['name']
         indexes = [
             models.Index(fields=['tenant', 'name']),
+            models.Index(fields=['tenant', 'normalized_name']),
             models.Index(fields=['tenant', 'cnpj']),
             models.Index(fields=['tenant', 'is_active']),
         ]
@@ -43,7 +68,7 @@ class Supplier(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
         return f"{self.name} ({self.cnpj})"
 
 
-class Category(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
+class Category(UppercaseMixin, NormalizedNameMixin, TenantAwareModel, SoftDeleteModel):
     """Modelo para Categorias de Despesas"""
 
     uppercase_fields = ['name', 'description']
@@ -59,6 +84,7 @@ class Category(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
         unique_together = [['tenant', 'name']]
         indexes = [
             models.Index(fields=['tenant', 'name']),
+            models.Index(fields=['tenant', 'normalized_name']),
             models.Index(fields=['tenant', 'is_active']),
         ]
 
@@ -66,7 +92,7 @@ class Category(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
         return self.name
 
 
-class PaymentMethod(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
+class PaymentMethod(UppercaseMixin, NormalizedNameMixin, TenantAwareModel, SoftDeleteModel):
     """Modelo para Métodos de Pagamento"""
 
     uppercase_fields = ['name', 'description']
@@ -81,6 +107,7 @@ class PaymentMethod(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
         unique_together = [['tenant', 'name']]
         indexes = [
             models.Index(fields=['tenant', 'name']),
+            models.Index(fields=['tenant', 'normalized_name']),
             models.Index(fields=['tenant', 'is_active']),
         ]
 
@@ -88,7 +115,7 @@ class PaymentMethod(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
         return self.name
 
 
-class Filial(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
+class Filial(UppercaseMixin, NormalizedNameMixin, TenantAwareModel, SoftDeleteModel):
     """Modelo para Filiais"""
 
     uppercase_fields = ['name', 'notes', 'bank_account_name', 'bank_account_description']
@@ -123,6 +150,7 @@ class Filial(UppercaseMixin, TenantAwareModel, SoftDeleteModel):
         ordering = ['name']
         indexes = [
             models.Index(fields=['tenant', 'name']),
+            models.Index(fields=['tenant', 'normalized_name']),
             models.Index(fields=['tenant', 'cnpj']),
             models.Index(fields=['tenant', 'is_active']),
         ]
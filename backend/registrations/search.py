@@ -0,0 +1,104 @@
+"""
+Autocomplete dos cadastros
+
+Busca pelo nome normalizado (normalized_name: sem acentos, maiúsculo,
+indexado por (tenant, normalized_name)), em etapas, parando assim que o
+limite é atingido:
+1. Prefixo do nome: faixa no índice (>= 'ABC' e < 'ABD'), sem LIKE
+2. Trecho em qualquer posição (índice trigram no PostgreSQL)
+3. Aproximada (erros de digitação): similaridade trigram no PostgreSQL;
+   nos demais bancos, difflib sobre os nomes com a mesma letra inicial
+"""
+import difflib
+
+from django.db import connections
+
+from core.utils import normalize_name
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# Tamanho mínimo do termo para a busca aproximada
+FUZZY_MIN_LENGTH = 3
+FUZZY_CUTOFF = 0.75  # difflib (0 a 1)
+TRIGRAM_THRESHOLD = 0.3  # pg_trgm (0 a 1)
+
+
+def prefix_range(prefix):
+    """Faixa (início, fim) de strings que começam com o prefixo"""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def fuzzy_matches(queryset, term, fields, limit):
+    """Nomes parecidos com o termo (tolera erros de digitação)"""
+    if connections[queryset.db].vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        return list(
+            queryset.annotate(
+                similarity=TrigramSimilarity('normalized_name', term)
+            ).filter(
+                similarity__gt=TRIGRAM_THRESHOLD
+            ).order_by('-similarity').values(*fields)[:limit]
+        )
+
+    start, end = prefix_range(term[0])
+    candidates = queryset.filter(
+        normalized_name__gte=start,
+        normalized_name__lt=end
+    ).values_list('pk', 'normalized_name')
+
+    scored = []
+    for pk, name in candidates.iterator():
+        # Compara com o início do nome (o usuário ainda está digitando)
+        score = difflib.SequenceMatcher(None, term, name[:len(term)]).ratio()
+        if score >= FUZZY_CUTOFF:
+            scored.append((-score, name, pk))
+
+    best = [pk for _, _, pk in sorted(scored)[:limit]]
+    rows = {row['id']: row for row in queryset.filter(pk__in=best).values(*fields)}
+    return [rows[pk] for pk in best if pk in rows]
+
+
+def autocomplete(queryset, term, fields, limit=DEFAULT_LIMIT):
+    """
+    Cadastros ativos que combinam com o termo, na ordem: prefixo, trecho,
+    aproximados. Sem termo, retorna os primeiros em ordem alfabética.
+
+    Args:
+        queryset: Cadastros do tenant
+        term: Texto digitado
+        fields: Campos retornados (.values), deve incluir 'id'
+        limit: Quantidade máxima de resultados
+    """
+    queryset = queryset.filter(is_active=True)
+    term = normalize_name(term)
+    if not term:
+        return list(queryset.order_by('normalized_name').values(*fields)[:limit])
+
+    start, end = prefix_range(term)
+    results = list(
+        queryset.filter(
+            normalized_name__gte=start,
+            normalized_name__lt=end
+        ).order_by('normalized_name').values(*fields)[:limit]
+    )
+
+    if len(results) < limit:
+        results += list(
+            queryset.filter(
+                normalized_name__contains=term
+            ).exclude(
+                pk__in=[row['id'] for row in results]
+            ).order_by('normalized_name').values(*fields)[:limit - len(results)]
+        )
+
+    if len(results) < limit and len(term) >= FUZZY_MIN_LENGTH:
+        results += fuzzy_matches(
+            queryset.exclude(pk__in=[row['id'] for row in results]),
+            term,
+            fields,
+            limit - len(results)
+        )
+
+    return results
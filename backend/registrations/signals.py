@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate
+from .models import Category, Filial, PaymentMethod, Supplier
+
+
+@receiver(post_save, sender=Filial)
+@receiver(post_save, sender=Supplier)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=PaymentMethod)
+@receiver(post_delete, sender=Filial)
+@receiver(post_delete, sender=Supplier)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=PaymentMethod)
+def invalidate_dropdown_cache(sender, instance, **kwargs):
+    """Invalida o cache do dropdown do tenant ao salvar ou excluir um cadastro"""
+    invalidate(sender, instance.tenant_id)
@@ -1,3 +1,173 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from tenant.cache import get_tenant_by_slug
+from tenant.models import Tenant
+from .cache import get_cache
+from .models import Category, Supplier
+
+User = get_user_model()
+
+
+class RegistrationsTestMixin:
+    """Cria dois tenants com uma categoria cada e um client autenticado no primeiro"""
+
+    def setUp(self):
+        get_cache().clear()
+        self.tenant = Tenant.objects.create(name='Empresa', slug='empresa-dropdown', email='a@empresa.com')
+        self.other_tenant = Tenant.objects.create(name='Outra', slug='outra-dropdown', email='b@empresa.com')
+        self.user = User.objects.create_user(
+            email='dropdown@empresa.com', password='senha123',
+            first_name='Usuario', last_name='Teste', tenant=self.tenant
+        )
+        Category.objects.create(tenant=self.tenant, name='Aluguel')
+        Category.objects.create(tenant=self.other_tenant, name='Energia')
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client.credentials(HTTP_X_TENANT_ID=self.tenant.slug)
+        get_tenant_by_slug(self.tenant.slug)
+
+
+class DropdownCacheTests(RegistrationsTestMixin, TestCase):
+    """Testes do cache por tenant dos endpoints dropdown"""
+
+    url = '/api/registrations/categories/dropdown/'
+
+    def names(self, response):
+        return [row['name'] for row in response.json()]
+
+    def test_second_request_hits_cache(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(self.names(response), ['ALUGUEL'])
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_save_invalidates_only_own_tenant(self):
+        etag = self.client.get(self.url)['ETag']
+        other_version = get_cache().get(f'registrations:version:registrations.category:{self.other_tenant.pk}')
+
+        category = Category.objects.create(tenant=self.tenant, name='Bancos')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.names(response), ['ALUGUEL', 'BANCOS'])
+        self.assertEqual(
+            get_cache().get(f'registrations:version:registrations.category:{self.other_tenant.pk}'),
+            other_version
+        )
+
+        category.delete()  # soft delete (inativa)
+        self.assertEqual(self.names(self.client.get(self.url)), ['ALUGUEL'])
+
+    def test_filters_are_part_of_the_key(self):
+        Supplier.objects.create(tenant=self.tenant, name='Alfa')
+        Supplier.objects.create(tenant=self.tenant, name='Beta')
+        url = '/api/registrations/suppliers/dropdown/'
+
+        self.assertEqual(len(self.client.get(url).json()), 2)
+        self.assertEqual(self.names(self.client.get(url, {'search': 'beta'})), ['BETA'])
+
+
+class BootstrapTests(RegistrationsTestMixin, TestCase):
+    """Testes do endpoint que retorna todos os cadastros de uma vez"""
+
+    url = '/api/registrations/bootstrap/'
+
+    def test_returns_all_lists(self):
+        Supplier.objects.create(tenant=self.tenant, name='Alfa')
+        response = self.client.get(self.url)
+        data = response.json()
+        self.assertEqual(data['categories'], [{'id': data['categories'][0]['id'], 'name': 'ALUGUEL', 'color': ''}])
+        self.assertEqual([s['name'] for s in data['suppliers']], ['ALFA'])
+        self.assertEqual(data['filials'], [])
+        self.assertEqual(data['payment_methods'], [])
+        self.assertEqual(response['ETag'], f'"{data["version"]}"')
+
+    def test_revalidation_without_queries(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Category.objects.create(tenant=self.tenant, name='Bancos')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.json()['categories']), 2)
+
+
+class AdminActionsTests(RegistrationsTestMixin, TestCase):
+    """Ações em lote do admin também invalidam os dropdowns"""
+
+    def test_deactivate_from_filtered_list_invalidates_dropdown(self):
+        url = '/api/registrations/categories/dropdown/'
+        etag = self.client.get(url)['ETag']
+        admin_user = User.objects.create_superuser(
+            email='admin@empresa.com', password='senha123',
+            first_name='Admin', last_name='Teste', tenant=self.tenant
+        )
+        admin_client = Client()
+        admin_client.force_login(admin_user)
+        category = Category.objects.get(tenant=self.tenant)
+
+        # Listagem filtrada por ativos: após o update o queryset fica vazio
+        response = admin_client.post('/admin/registrations/category/?is_active__exact=1', {
+            'action': 'deactivate_selected',
+            '_selected_action': [category.pk],
+        })
+        self.assertEqual(response.status_code, 302)
+        category.refresh_from_db()
+        self.assertFalse(category.is_active)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+
+class AutocompleteTests(RegistrationsTestMixin, TestCase):
+    """Testes do autocomplete pelo nome normalizado"""
+
+    url = '/api/registrations/suppliers/autocomplete/'
+
+    def setUp(self):
+        super().setUp()
+        for name in ['Elétrica Paulista', 'Eletro Sul', 'Água Limpa', 'Manutenção Elétrica', 'Papelaria Central']:
+            Supplier.objects.create(tenant=self.tenant, name=name)
+        Supplier.objects.create(tenant=self.other_tenant, name='Eletro Norte')
+
+    def names(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [row['name'] for row in response.json()['results']]
+
+    def test_normalized_name(self):
+        supplier = Supplier.objects.get(tenant=self.tenant, name='ÁGUA LIMPA')
+        self.assertEqual(supplier.normalized_name, 'AGUA LIMPA')
+
+        supplier.name = 'Água Viva'
+        supplier.save(update_fields=['name'])
+        supplier.refresh_from_db()
+        self.assertEqual(supplier.normalized_name, 'AGUA VIVA')
+
+    def test_prefix_then_contains(self):
+        self.assertEqual(self.names(search='agua'), ['ÁGUA LIMPA'])
+        self.assertEqual(
+            self.names(search='eletr'),
+            ['ELÉTRICA PAULISTA', 'ELETRO SUL', 'MANUTENÇÃO ELÉTRICA']
+        )
+        self.assertEqual(self.names(search='eletr', limit=1), ['ELÉTRICA PAULISTA'])
+
+    def test_fuzzy_match(self):
+        self.assertEqual(self.names(search='papelria'), ['PAPELARIA CENTRAL'])
+        self.assertEqual(self.names(search='xyzw'), [])
+
+    def test_without_search_returns_first_names(self):
+        self.assertEqual(len(self.names()), 5)
+        self.assertEqual(self.names(limit=2), ['ÁGUA LIMPA', 'ELÉTRICA PAULISTA'])
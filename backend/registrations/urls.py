@@ -5,6 +5,7 @@ from .views import (
     SupplierViewSet,
     CategoryViewSet,
     PaymentMethodViewSet,
+    RegistrationsBootstrapView,
 )
 
 router = DefaultRouter()
@@ -14,5 +15,6 @@ router.register(r'categories', CategoryViewSet, basename='category')
 router.register(r'payment-methods', PaymentMethodViewSet, basename='paymentmethod')
 
 urlpatterns = [
+    path('bootstrap/', RegistrationsBootstrapView.as_view(), name='registrations-bootstrap'),
     path('', include(router.urls)),
 ]
@@ -1,8 +1,15 @@
+from django.conf import settings
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 
+from core.authentication import TenantTokenUserAuthentication
+from core.replicas import read_from_primary
+
+from .cache import cached_dropdown, combined_version, etag_matches, get_cache
+from .search import DEFAULT_LIMIT, MAX_LIMIT, autocomplete as search_autocomplete
 from .models import Supplier, Category, PaymentMethod, Filial
 from .serializers import (
     SupplierSerializer,
@@ -16,18 +23,31 @@ from .serializers import (
 )
 
 
+def autocomplete_response(view, fields):
+    """Resposta do endpoint autocomplete: {'results': [...]} (formato do DataComboBox)"""
+    params = view.request.query_params
+    try:
+        limit = min(max(int(params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        limit = DEFAULT_LIMIT
+    results = search_autocomplete(view.get_queryset(), params.get('search', ''), fields, limit)
+    return Response({'results': results})
+
+
 class FilialViewSet(viewsets.ModelViewSet):
     """
     ViewSet para gerenciar Filiais
     Endpoints:
     - GET /api/filials/ - Lista todas as filiais
     - GET /api/filials/dropdown/ - Lista simplificada para dropdown
+    - GET /api/filials/autocomplete/?search= - Busca por prefixo/aproximada
     - POST /api/filials/ - Cria nova filial
     - GET /api/filials/{id}/ - Detalhes de uma filial
     - PUT/PATCH /api/filials/{id}/ - Atualiza filial
     - DELETE /api/filials/{id}/ - Soft delete (inativa)
     """
     serializer_class = FilialSerializer
+    authentication_classes = [TenantTokenUserAuthentication]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['is_active']
     search_fields = ['name', 'cnpj']
@@ -49,10 +69,13 @@ class FilialViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def dropdown(self, request):
-        """Retorna lista simplificada para usar em dropdowns"""
-        queryset = self.filter_queryset(self.get_queryset()).filter(is_active=True)
-        serializer = FilialListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        """Retorna lista simplificada para usar em dropdowns (cache por tenant + ETag)"""
+        return cached_dropdown(self, FilialListSerializer)
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Busca por prefixo/aproximada para autocomplete (?search=&limit=)"""
+        return autocomplete_response(self, ['id', 'name', 'cnpj', 'bank_account_name'])
 
 
 class SupplierViewSet(viewsets.ModelViewSet):
@@ -61,12 +84,14 @@ class SupplierViewSet(viewsets.ModelViewSet):
     Endpoints:
     - GET /api/suppliers/ - Lista todos os fornecedores
     - GET /api/suppliers/dropdown/ - Lista simplificada para dropdown
+    - GET /api/suppliers/autocomplete/?search= - Busca por prefixo/aproximada
     - POST /api/suppliers/ - Cria novo fornecedor
     - GET /api/suppliers/{id}/ - Detalhes de um fornecedor
     - PUT/PATCH /api/suppliers/{id}/ - Atualiza fornecedor
     - DELETE /api/suppliers/{id}/ - Soft delete (inativa)
     """
     serializer_class = SupplierSerializer
+    authentication_classes = [TenantTokenUserAuthentication]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['is_active']
     search_fields = ['name', 'cnpj', 'email']
@@ -87,10 +112,13 @@ class SupplierViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def dropdown(self, request):
-        """Retorna lista simplificada para usar em dropdowns"""
-        queryset = self.filter_queryset(self.get_queryset()).filter(is_active=True)
-        serializer = SupplierListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        """Retorna lista simplificada para usar em dropdowns (cache por tenant + ETag)"""
+        return cached_dropdown(self, SupplierListSerializer)
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Busca por prefixo/aproximada para autocomplete (?search=&limit=)"""
+        return autocomplete_response(self, ['id', 'name', 'cnpj'])
 
 
 class CategoryViewSet(viewsets.ModelViewSet):
@@ -99,12 +127,14 @@ class CategoryViewSet(viewsets.ModelViewSet):
     Endpoints:
     - GET /api/categories/ - Lista todas as categorias
     - GET /api/categories/dropdown/ - Lista simplificada para dropdown
+    - GET /api/categories/autocomplete/?search= - Busca por prefixo/aproximada
     - POST /api/categories/ - Cria nova categoria
     - GET /api/categories/{id}/ - Detalhes de uma categoria
     - PUT/PATCH /api/categories/{id}/ - Atualiza categoria
     - DELETE /api/categories/{id}/ - Soft delete (inativa)
     """
     serializer_class = CategorySerializer
+    authentication_classes = [TenantTokenUserAuthentication]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['is_active']
     search_fields = ['name', 'description']
@@ -125,10 +155,13 @@ class CategoryViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def dropdown(self, request):
-        """Retorna lista simplificada para usar em dropdowns"""
-        queryset = self.filter_queryset(self.get_queryset()).filter(is_active=True)
-        serializer = CategoryListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        """Retorna lista simplificada para usar em dropdowns (cache por tenant + ETag)"""
+        return cached_dropdown(self, CategoryListSerializer)
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Busca por prefixo/aproximada para autocomplete (?search=&limit=)"""
+        return autocomplete_response(self, ['id', 'name', 'color'])
 
 
 class PaymentMethodViewSet(viewsets.ModelViewSet):
@@ -137,12 +170,14 @@ class PaymentMethodViewSet(viewsets.ModelViewSet):
     Endpoints:
     - GET /api/payment-methods/ - Lista todas as formas de pagamento
     - GET /api/payment-methods/dropdown/ - Lista simplificada para dropdown
+    - GET /api/payment-methods/autocomplete/?search= - Busca por prefixo/aproximada
     - POST /api/payment-methods/ - Cria nova forma de pagamento
     - GET /api/payment-methods/{id}/ - Detalhes de uma forma de pagamento
     - PUT/PATCH /api/payment-methods/{id}/ - Atualiza forma de pagamento
     - DELETE /api/payment-methods/{id}/ - Soft delete (inativa)
     """
     serializer_class = PaymentMethodSerializer
+    authentication_classes = [TenantTokenUserAuthentication]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['is_active']
     search_fields = ['name', 'description']
@@ -163,7 +198,61 @@ class PaymentMethodViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def dropdown(self, request):
-        """Retorna lista simplificada para usar em dropdowns"""
-        queryset = self.filter_queryset(self.get_queryset()).filter(is_active=True)
-        serializer = PaymentMethodListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        """Retorna lista simplificada para usar em dropdowns (cache por tenant + ETag)"""
+        return cached_dropdown(self, PaymentMethodListSerializer)
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Busca por prefixo/aproximada para autocomplete (?search=&limit=)"""
+        return autocomplete_response(self, ['id', 'name'])
+
+
+# Listas do bootstrap: (modelo, campos) - mesmos campos dos serializers de dropdown
+BOOTSTRAP_LISTS = {
+    'filials': (Filial, ['id', 'name', 'cnpj', 'bank_account_name', 'bank_account_description']),
+    'suppliers': (Supplier, ['id', 'name', 'cnpj']),
+    'categories': (Category, ['id', 'name', 'color']),
+    'payment_methods': (PaymentMethod, ['id', 'name']),
+}
+
+
+class RegistrationsBootstrapView(APIView):
+    """
+    Retorna filiais, fornecedores, categorias e formas de pagamento ativas
+    em uma única resposta (4 queries .values(), sem instanciar models)
+
+    Endpoint:
+    - GET /api/registrations/bootstrap/
+
+    A resposta traz 'version' (hash das versões das quatro listas) também no
+    ETag; com If-None-Match igual, retorna 304 sem consultar o banco.
+    """
+    authentication_classes = [TenantTokenUserAuthentication]
+
+    def get(self, request):
+        tenant_id = request.tenant.pk
+        version = combined_version([model for model, _ in BOOTSTRAP_LISTS.values()], tenant_id)
+        headers = {'ETag': f'"{version}"', 'Cache-Control': 'private, no-cache'}
+
+        if etag_matches(request, headers['ETag']):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        cache = get_cache()
+        key = f'registrations:bootstrap:{tenant_id}:{version}'
+        data = cache.get(key)
+        if data is None:
+            # Fica no cache sob a versão atual: lê do principal, não da réplica atrasada
+            with read_from_primary():
+                data = {
+                    name: list(
+                        model.objects.filter(
+                            tenant_id=tenant_id,
+                            is_active=True
+                        ).order_by('name').values(*fields)
+                    )
+                    for name, (model, fields) in BOOTSTRAP_LISTS.items()
+                }
+            data['version'] = version
+            cache.set(key, data, getattr(settings, 'REGISTRATIONS_CACHE_TIMEOUT', 3600))
+
+        return Response(data, headers=headers)
@@ -0,0 +1,76 @@
+"""
+Cache em memória dos tenants ativos
+
+Cache por processo (slug -> Tenant e id -> Tenant) com validade definida em
+TENANT_CACHE_TTL (segundos). Usado pelo TenantMiddleware para não consultar o
+banco a cada requisição. Alterações no Tenant (save/desativação/exclusão)
+invalidam o cache do processo atual via signals; nos demais processos a
+entrada expira pelo TTL.
+"""
+import threading
+import time
+
+from django.conf import settings
+
+from .models import Tenant
+
+_lock = threading.Lock()
+_by_slug = {}
+_by_id = {}
+
+
+def _ttl():
+    return getattr(settings, 'TENANT_CACHE_TTL', 300)
+
+
+def _get(store, key):
+    entry = store.get(key)
+    if entry and entry[1] > time.monotonic():
+        return entry[0]
+    return None
+
+
+def _store(tenant):
+    expires = time.monotonic() + _ttl()
+    with _lock:
+        _by_slug[tenant.slug] = (tenant, expires)
+        _by_id[tenant.pk] = (tenant, expires)
+
+
+def get_tenant_by_slug(slug):
+    """Retorna o tenant ativo com o slug informado (ou None)"""
+    tenant = _get(_by_slug, slug)
+    if tenant is None:
+        tenant = Tenant.objects.filter(slug=slug, is_active=True).first()
+        if tenant is not None:
+            _store(tenant)
+    return tenant
+
+
+def get_tenant_by_id(tenant_id):
+    """Retorna o tenant ativo com o id informado (ou None)"""
+    if tenant_id is None:
+        return None
+    tenant = _get(_by_id, tenant_id)
+    if tenant is None:
+        tenant = Tenant.objects.filter(pk=tenant_id, is_active=True).first()
+        if tenant is not None:
+            _store(tenant)
+    return tenant
+
+
+def invalidate_tenant(tenant):
+    """Remove o tenant do cache (inclusive por um slug antigo)"""
+    with _lock:
+        _by_id.pop(tenant.pk, None)
+        _by_slug.pop(tenant.slug, None)
+        for slug, (cached, _) in list(_by_slug.items()):
+            if cached.pk == tenant.pk:
+                del _by_slug[slug]
+
+
+def clear_tenant_cache():
+    """Limpa todo o cache de tenants do processo"""
+    with _lock:
+        _by_slug.clear()
+        _by_id.clear()
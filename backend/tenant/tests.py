@@ -1,3 +1,132 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
 
-# Create your tests here.
+from accounts.tokens import TenantRefreshToken
+
+from .cache import clear_tenant_cache, get_tenant_by_slug
+from .models import Tenant
+
+User = get_user_model()
+
+
+class TenantCacheTests(TestCase):
+    """Testes do cache de tenants usado pelo TenantMiddleware"""
+
+    def setUp(self):
+        clear_tenant_cache()
+        self.tenant = Tenant.objects.create(
+            name='Empresa Cache', slug='empresa-cache', email='cache@teste.com'
+        )
+        self.user = User.objects.create_user(
+            email='cache@teste.com', password='senha123',
+            first_name='Usuario', last_name='Cache', tenant=self.tenant
+        )
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.client = APIClient()
+
+    def test_slug_em_cache(self):
+        """Segunda resolução do mesmo slug não consulta o banco"""
+        get_tenant_by_slug('empresa-cache')
+        with self.assertNumQueries(0):
+            tenant = get_tenant_by_slug('empresa-cache')
+        self.assertEqual(tenant.pk, self.tenant.pk)
+
+    def test_desativacao_invalida_cache(self):
+        """Desativar o tenant remove do cache imediatamente"""
+        get_tenant_by_slug('empresa-cache')
+        self.tenant.is_active = False
+        self.tenant.save()
+
+        self.assertIsNone(get_tenant_by_slug('empresa-cache'))
+        response = self.client.get('/api/auth/me/', HTTP_X_TENANT_ID='empresa-cache')
+        self.assertEqual(response.status_code, 404)
+
+    def test_troca_de_slug_invalida_slug_antigo(self):
+        get_tenant_by_slug('empresa-cache')
+        self.tenant.slug = 'empresa-nova'
+        self.tenant.save()
+
+        self.assertIsNone(get_tenant_by_slug('empresa-cache'))
+        self.assertEqual(get_tenant_by_slug('empresa-nova').pk, self.tenant.pk)
+
+    def test_jwt_validado_uma_unica_vez(self):
+        """Middleware e DRF compartilham o usuário: só a busca do usuário vai ao banco"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.client.get('/api/auth/me/')
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['tenant_name'], 'EMPRESA CACHE')
+
+    def test_jwt_com_header_de_tenant(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {self.token}',
+            HTTP_X_TENANT_ID='empresa-cache'
+        )
+        self.client.get('/api/auth/me/')
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_token_invalido(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer invalido')
+        response = self.client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(JWT_STATELESS_USER=True)
+class StatelessTokenTests(TestCase):
+    """Testes do modo stateless (usuário e tenant vindos das claims do token)"""
+
+    url = '/api/registrations/categories/'
+
+    def setUp(self):
+        clear_tenant_cache()
+        self.tenant = Tenant.objects.create(
+            name='Empresa Claims', slug='empresa-claims', email='claims@teste.com'
+        )
+        self.user = User.objects.create_user(
+            email='claims@teste.com', password='senha123',
+            first_name='Usuario', last_name='Claims', tenant=self.tenant
+        )
+        self.client = APIClient()
+        token = TenantRefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def _user_queries(self, context):
+        return [q for q in context.captured_queries if 'accounts_user' in q['sql']]
+
+    def test_token_com_claims_do_tenant(self):
+        token = TenantRefreshToken.for_user(self.user).access_token
+        self.assertEqual(token['tenant_id'], self.tenant.pk)
+        self.assertEqual(token['tenant_slug'], 'empresa-claims')
+        self.assertFalse(token['is_tenant_admin'])
+
+    def test_leitura_nao_consulta_usuarios(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._user_queries(context), [])
+
+    def test_escrita_carrega_usuario(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, {'name': 'Aluguel'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self._user_queries(context)), 1)
+
+    def test_view_sem_token_user_carrega_usuario(self):
+        response = self.client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['email'], 'claims@teste.com')
+
+    def test_tenant_desativado(self):
+        self.tenant.is_active = False
+        self.tenant.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
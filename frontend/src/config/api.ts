@@ -13,24 +13,31 @@ export const API_CONFIG = {
     // REGISTRATIONS (Cadastros)
     // ====================================
     
+    // Todos os cadastros (dropdowns) de uma vez
+    REGISTRATIONS_BOOTSTRAP: '/api/registrations/bootstrap/',
+
     // Filiais
     FILIALS: '/api/registrations/filials/',
     FILIALS_DROPDOWN: '/api/registrations/filials/dropdown/',
+    FILIALS_AUTOCOMPLETE: '/api/registrations/filials/autocomplete/',
     FILIAL_DETAIL: (id: number) => `/api/registrations/filials/${id}/`,
 
     // Fornecedores
     SUPPLIERS: '/api/registrations/suppliers/',
     SUPPLIERS_DROPDOWN: '/api/registrations/suppliers/dropdown/',
+    SUPPLIERS_AUTOCOMPLETE: '/api/registrations/suppliers/autocomplete/',
     SUPPLIER_DETAIL: (id: number) => `/api/registrations/suppliers/${id}/`,
 
     // Categorias
     CATEGORIES: '/api/registrations/categories/',
     CATEGORIES_DROPDOWN: '/api/registrations/categories/dropdown/',
+    CATEGORIES_AUTOCOMPLETE: '/api/registrations/categories/autocomplete/',
     CATEGORY_DETAIL: (id: number) => `/api/registrations/categories/${id}/`,
 
     // Formas de Pagamento
     PAYMENT_METHODS: '/api/registrations/payment-methods/',
     PAYMENT_METHODS_DROPDOWN: '/api/registrations/payment-methods/dropdown/',
+    PAYMENT_METHODS_AUTOCOMPLETE: '/api/registrations/payment-methods/autocomplete/',
     PAYMENT_METHOD_DETAIL: (id: number) => `/api/registrations/payment-methods/${id}/`,
 
     // ====================================
@@ -40,15 +47,23 @@ export const API_CONFIG = {
     // Contas a Pagar
     ACCOUNTS_PAYABLE: '/api/payables/accounts-payable/',
     ACCOUNTS_PAYABLE_DASHBOARD: '/api/payables/accounts-payable/dashboard/',
+    ACCOUNTS_PAYABLE_CASH_FLOW: '/api/payables/accounts-payable/cash_flow/',
     ACCOUNTS_PAYABLE_OVERDUE: '/api/payables/accounts-payable/overdue/',
     ACCOUNT_PAYABLE_DETAIL: (id: number) => `/api/payables/accounts-payable/${id}/`,
     ACCOUNT_PAYABLE_MARK_AS_PAID: (id: number) => `/api/payables/accounts-payable/${id}/mark_as_paid/`,
     ACCOUNT_PAYABLE_CANCEL: (id: number) => `/api/payables/accounts-payable/${id}/cancel/`,
     ACCOUNT_PAYABLE_ADD_ATTACHMENT: (id: number) => `/api/payables/accounts-payable/${id}/add_attachment/`,
+    ACCOUNTS_PAYABLE_BULK_MARK_AS_PAID: '/api/payables/accounts-payable/bulk_mark_as_paid/',
+    ACCOUNTS_PAYABLE_BULK_CANCEL: '/api/payables/accounts-payable/bulk_cancel/',
 
     // Pagamentos
     PAYABLE_PAYMENTS: '/api/payables/payable-payments/',
+    PAYABLE_PAYMENTS_BULK: '/api/payables/payable-payments/bulk/',
     PAYABLE_PAYMENT_DETAIL: (id: number) => `/api/payables/payable-payments/${id}/`,
+
+    // Importações em segundo plano
+    IMPORT_JOBS: '/api/payables/import-jobs/',
+    IMPORT_JOB_DETAIL: (id: number) => `/api/payables/import-jobs/${id}/`,
   },
   TIMEOUT: 10000, // 10 segundos
 } as const;
@@ -0,0 +1,21 @@
+import { useQuery } from '@tanstack/react-query'
+import { payablesService } from '@/services'
+import type { CashFlowParams } from '@/types/payables'
+
+/**
+ * Hook da projeção de fluxo de caixa (calculada e cacheada no backend)
+ */
+export const useCashFlow = (params: CashFlowParams = {}) => {
+  const query = useQuery({
+    queryKey: ['cash-flow', params],
+    queryFn: () => payablesService.getCashFlow(params),
+    staleTime: 5 * 60 * 1000,
+  })
+
+  return {
+    cashFlow: query.data,
+    isLoading: query.isLoading,
+    isError: query.isError,
+    refetch: query.refetch,
+  }
+}
@@ -37,36 +37,41 @@ export const useBatchPayment = () => {
     const results: number[] = []
     const errors: Array<{ id: number; description: string; message: string }> = []
 
-    // Processa cada conta sequencialmente
-    for (let i = 0; i < paymentsData.length; i++) {
-      const data = paymentsData[i]
+    const payments: PayablePaymentCreate[] = paymentsData.map(data => ({
+      account_payable: data.account.id,
+      payment_date: data.paymentDate,
+      amount: data.amountPaid,
+      payment_method: data.paymentMethod,
+      paid_by_branch: data.paidByBranch,
+      interest: data.interest,
+      fine: data.fine,
+      notes: data.notes
+    }))
 
-      try {
-        const paymentData: PayablePaymentCreate = {
-          account_payable: data.account.id,
-          payment_date: data.paymentDate,
-          amount: data.amountPaid,
-          payment_method: data.paymentMethod,
-          paid_by_branch: data.paidByBranch,
-          interest: data.interest,
-          fine: data.fine,
-          notes: data.notes
-        }
+    // Envia todos os pagamentos em uma única requisição (tudo ou nada)
+    try {
+      await payablesService.createPaymentsBulk(payments)
+      paymentsData.forEach(data => results.push(data.account.id))
+    } catch (error: any) {
+      const itemErrors: Array<Record<string, string | string[]>> | undefined =
+        error.response?.data?.payments
 
-        await payablesService.createPayment(paymentData)
-        results.push(data.account.id)
-      } catch (error: any) {
+      paymentsData.forEach((data, index) => {
+        const itemError = Array.isArray(itemErrors) ? itemErrors[index] : undefined
+        const message = itemError && Object.keys(itemError).length > 0
+          ? Object.values(itemError).flat().join(' ')
+          : (itemErrors ? 'Não processado: outro pagamento do lote é inválido' : 'Erro desconhecido')
         errors.push({
           id: data.account.id,
           description: data.account.description,
-          message: error.response?.data?.message || 'Erro desconhecido'
+          message
         })
-      }
-
-      // Atualiza progresso
-      setProgress({ current: i + 1, total: paymentsData.length })
+      })
     }
 
+    // Atualiza progresso
+    setProgress({ current: paymentsData.length, total: paymentsData.length })
+
     setIsProcessing(false)
 
     // Invalida queries
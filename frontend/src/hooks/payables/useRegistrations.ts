@@ -23,18 +23,12 @@ export const useRegistrations = () => {
     setLoading(true);
     setError(null);
     try {
-      const [filiaisData, suppliersData, categoriesData, paymentMethodsData] = 
-        await Promise.all([
-          registrationsService.getFilialDropdown(),
-          registrationsService.getSupplierDropdown(),
-          registrationsService.getCategoryDropdown(),
-          registrationsService.getPaymentMethodDropdown(),
-        ]);
+      const data = await registrationsService.getBootstrap();
 
-      setFiliais(filiaisData);
-      setSuppliers(suppliersData);
-      setCategories(categoriesData);
-      setPaymentMethods(paymentMethodsData);
+      setFiliais(data.filials);
+      setSuppliers(data.suppliers);
+      setCategories(data.categories);
+      setPaymentMethods(data.payment_methods);
     } catch (err) {
       setError('Erro ao carregar cadastros');
       console.error(err);
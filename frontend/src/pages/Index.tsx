@@ -8,10 +8,8 @@ import { RefreshCw } from "lucide-react"
 export default function Index() {
   const {
     stats,
-    contas,
+    daily,
     isLoading,
-    isLoadingStats,
-    isLoadingContas,
     refetch
   } = useDashboard()
 
@@ -38,16 +36,16 @@ export default function Index() {
         </div>
 
         {/* Métricas Principais */}
-        <DashboardMetrics stats={stats} isLoading={isLoadingStats} />
+        <DashboardMetrics stats={stats} isLoading={isLoading} />
 
         {/* Gráfico de Pagamentos por Dia */}
-        <GraficoSemanasCard contas={contas} loading={isLoadingContas} />
+        <GraficoSemanasCard dias={daily} loading={isLoading} />
 
         {/* Top Fornecedores */}
         <div className="grid gap-6 md:grid-cols-2">
           <TopSuppliers
             suppliers={stats?.top_suppliers}
-            isLoading={isLoadingStats}
+            isLoading={isLoading}
           />
 
           {/* Espaço reservado para futuras funcionalidades */}
@@ -1,5 +1,5 @@
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card";
-import type { AccountPayable } from "@/types/payables";
+import type { DashboardDailyBucket } from "@/types/payables";
 import { useDadosDiarios } from "@/hooks/dashboard/useDadosDiarios";
 import { formatCurrency } from "@/utils/formatters";
 import { BarChart3, TrendingUp } from "lucide-react";
@@ -18,15 +18,15 @@ import { format } from "date-fns";
 import { ptBR } from "date-fns/locale";
 
 interface GraficoSemanasCardProps {
-  contas: AccountPayable[];
+  dias: DashboardDailyBucket[];
   loading?: boolean;
 }
 
 // Cores para as barras (gradiente)
 const CORES = ['#3b82f6', '#22c55e', '#ce472f', '#ef4444', '#8b5cf6', '#ec4899', '#14b8a6', '#f59e0b'];
 
-export function GraficoSemanasCard({ contas, loading }: GraficoSemanasCardProps) {
-  const { dadosDiarios, estatisticas } = useDadosDiarios(contas);
+export function GraficoSemanasCard({ dias, loading }: GraficoSemanasCardProps) {
+  const { dadosDiarios, estatisticas } = useDadosDiarios(dias);
   const mesAtual = format(new Date(), "MMMM 'de' yyyy", { locale: ptBR });
 
   // Tooltip customizado
@@ -40,17 +40,19 @@ export function GraficoSemanasCard({ contas, loading }: GraficoSemanasCardProps)
             {formatCurrency(data.valor)}
           </p>
           <div className="space-y-1 border-t pt-2">
-            <p className="text-xs font-semibold text-muted-foreground mb-2">
-              {data.quantidade} {data.quantidade === 1 ? 'conta' : 'contas'}:
+            <p className="text-xs font-semibold text-muted-foreground">
+              {data.quantidade} {data.quantidade === 1 ? 'conta vence' : 'contas vencem'} no dia
             </p>
-            {data.contas.map((conta: any, idx: number) => (
-              <div key={idx} className="text-xs flex justify-between gap-2 py-1">
-                <span className="font-medium truncate flex-1">{conta.fornecedor}</span>
+            {data.quantidadePaga > 0 && (
+              <div className="text-xs flex justify-between gap-2 py-1">
+                <span className="font-medium">
+                  {data.quantidadePaga} {data.quantidadePaga === 1 ? 'pagamento' : 'pagamentos'}
+                </span>
                 <span className="text-primary font-semibold whitespace-nowrap">
-                  {formatCurrency(conta.valor)}
+                  {formatCurrency(data.valorPago)}
                 </span>
               </div>
-            ))}
+            )}
           </div>
         </div>
       );
@@ -255,7 +255,7 @@ export default function PayablesCreate() {
                 ref={filialComboRef}
                 value={selectedFilialId}
                 onValueChange={(value) => setSelectedFilialId(value)}
-                fetchData={(params) => registrationsService.listFilials(params)}
+                fetchData={(params) => registrationsService.autocompleteFilials(params)}
                 mapItem={(filial) => ({
                   value: filial.id,
                   label: filial.name,
@@ -283,7 +283,7 @@ export default function PayablesCreate() {
                 ref={fornecedorComboRef}
                 value={selectedFornecedorId}
                 onValueChange={(value) => setSelectedFornecedorId(value)}
-                fetchData={(params) => registrationsService.listSuppliers(params)}
+                fetchData={(params) => registrationsService.autocompleteSuppliers(params)}
                 mapItem={(fornecedor) => ({
                   value: fornecedor.id,
                   label: fornecedor.fantasy_name || fornecedor.name,
@@ -304,7 +304,7 @@ export default function PayablesCreate() {
                 ref={categoriaComboRef}
                 value={selectedCategoriaId}
                 onValueChange={(value) => setSelectedCategoriaId(value)}
-                fetchData={(params) => registrationsService.listCategories(params)}
+                fetchData={(params) => registrationsService.autocompleteCategories(params)}
                 mapItem={(categoria) => ({
                   value: categoria.id,
                   label: categoria.name,
@@ -325,7 +325,7 @@ export default function PayablesCreate() {
                 ref={metodoComboRef}
                 value={selectedMetodoId}
                 onValueChange={(value) => setSelectedMetodoId(value)}
-                fetchData={(params) => registrationsService.listPaymentMethods(params)}
+                fetchData={(params) => registrationsService.autocompletePaymentMethods(params)}
                 mapItem={(metodo) => ({
                   value: metodo.id,
                   label: metodo.name,
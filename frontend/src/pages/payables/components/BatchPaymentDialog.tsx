@@ -262,7 +262,7 @@ export function BatchPaymentDialog({
                         <DataComboBox
                           value={accountData.bankAccountId}
                           onValueChange={(value) => updateAccountData(account.id, 'bankAccountId', value)}
-                          fetchData={(params) => registrationsService.listFilials(params)}
+                          fetchData={(params) => registrationsService.autocompleteFilials(params)}
                           mapItem={(filial) => ({
                             value: filial.id,
                             label: `${filial.name} - ${filial.bank_account_name || 'S/ Conta'}`
@@ -276,7 +276,7 @@ export function BatchPaymentDialog({
                         <DataComboBox
                           value={accountData.paymentMethodId}
                           onValueChange={(value) => updateAccountData(account.id, 'paymentMethodId', value)}
-                          fetchData={(params) => registrationsService.listPaymentMethods(params)}
+                          fetchData={(params) => registrationsService.autocompletePaymentMethods(params)}
                           mapItem={(method) => ({
                             value: method.id,
                             label: method.name
@@ -107,7 +107,7 @@ export function PayablesFilters({
           <DataComboBox
             value={selectedSupplierId}
             onValueChange={onSupplierChange}
-            fetchData={(params) => registrationsService.listSuppliers(params)}
+            fetchData={(params) => registrationsService.autocompleteSuppliers(params)}
             mapItem={(supplier) => ({
               value: supplier.id,
               label: supplier.fantasy_name || supplier.name,
@@ -125,7 +125,7 @@ export function PayablesFilters({
           <DataComboBox
             value={selectedCategoryId}
             onValueChange={onCategoryChange}
-            fetchData={(params) => registrationsService.listCategories(params)}
+            fetchData={(params) => registrationsService.autocompleteCategories(params)}
             mapItem={(category) => ({
               value: category.id,
               label: category.name,
@@ -143,7 +143,7 @@ export function PayablesFilters({
           <DataComboBox
             value={selectedBranchId}
             onValueChange={onBranchChange}
-            fetchData={(params) => registrationsService.listFilials(params)}
+            fetchData={(params) => registrationsService.autocompleteFilials(params)}
             mapItem={(branch) => ({
               value: branch.id,
               label: branch.name,
@@ -161,7 +161,7 @@ export function PayablesFilters({
           <DataComboBox
             value={selectedPaymentMethodId}
             onValueChange={onPaymentMethodChange}
-            fetchData={(params) => registrationsService.listPaymentMethods(params)}
+            fetchData={(params) => registrationsService.autocompletePaymentMethods(params)}
             mapItem={(method) => ({
               value: method.id,
               label: method.name,
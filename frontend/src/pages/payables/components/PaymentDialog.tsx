@@ -292,7 +292,7 @@ export function PaymentDialog({ open, onOpenChange, account }: PaymentDialogProp
                 <DataComboBox
                   value={selectedBankAccountId}
                   onValueChange={setSelectedBankAccountId}
-                  fetchData={(params) => registrationsService.listFilials(params)}
+                  fetchData={(params) => registrationsService.autocompleteFilials(params)}
                   mapItem={(filial) => ({
                     value: filial.id,
                     label: `${filial.name} - ${filial.bank_account_name || 'S/ Conta'}`
@@ -306,7 +306,7 @@ export function PaymentDialog({ open, onOpenChange, account }: PaymentDialogProp
                 <DataComboBox
                   value={selectedPaymentMethodId}
                   onValueChange={setSelectedPaymentMethodId}
-                  fetchData={(params) => registrationsService.listPaymentMethods(params)}
+                  fetchData={(params) => registrationsService.autocompletePaymentMethods(params)}
                   mapItem={(method) => ({
                     value: method.id,
                     label: method.name
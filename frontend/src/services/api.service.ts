@@ -18,6 +18,8 @@ class ApiService {
     this.api = axios.create({
       baseURL: API_CONFIG.BASE_URL,
       timeout: API_CONFIG.TIMEOUT,
+      // Envia o cookie de read-your-writes da réplica (a autenticação segue no header)
+      withCredentials: true,
       headers: {
         'Content-Type': 'application/json',
       },
@@ -8,10 +8,15 @@ import type {
   PayablePayment,
   PayablePaymentCreate,
   DashboardStats,
+  CashFlow,
+  CashFlowParams,
   MarkAsPaidResponse,
   CancelResponse,
   AddAttachmentResponse,
   PaginatedResponse,
+  CursorPaginatedResponse,
+  ImportJob,
+  BulkPaymentResponse,
 } from '../types/payables';
 
 /**
@@ -37,6 +42,25 @@ class PayablesService {
     );
   }
 
+  /**
+   * Lista contas a pagar por cursor (scroll infinito).
+   * Sem cursor retorna a primeira página; as seguintes usam o link `next`.
+   */
+  async listAccountsPayableCursor(
+    filters?: AccountPayableFilters,
+    next?: string | null
+  ): Promise<CursorPaginatedResponse<AccountPayable>> {
+    if (next) {
+      return apiService.get<CursorPaginatedResponse<AccountPayable>>(next);
+    }
+
+    const params = { ...this.prepareFilters(filters), cursor: '' };
+    return apiService.get<CursorPaginatedResponse<AccountPayable>>(
+      API_CONFIG.ENDPOINTS.ACCOUNTS_PAYABLE,
+      { params }
+    );
+  }
+
   /**
    * Busca estatísticas do dashboard
    */
@@ -46,6 +70,17 @@ class PayablesService {
     );
   }
 
+  /**
+   * Projeção de saídas por dia, semana ou mês (até 24 meses),
+   * com os mesmos filtros da listagem
+   */
+  async getCashFlow(params?: CashFlowParams): Promise<CashFlow> {
+    return apiService.get<CashFlow>(
+      API_CONFIG.ENDPOINTS.ACCOUNTS_PAYABLE_CASH_FLOW,
+      { params: this.prepareFilters(params) }
+    );
+  }
+
   /**
    * Lista apenas contas vencidas
    */
@@ -142,6 +177,30 @@ class PayablesService {
     );
   }
 
+  /**
+   * Marca várias contas como pagas (valor final integral)
+   */
+  async bulkMarkAsPaid(data: {
+    ids: number[];
+    payment_date?: string;
+    payment_method?: number;
+  }): Promise<{ updated: number }> {
+    return apiService.post<{ updated: number }>(
+      API_CONFIG.ENDPOINTS.ACCOUNTS_PAYABLE_BULK_MARK_AS_PAID,
+      data
+    );
+  }
+
+  /**
+   * Cancela várias contas
+   */
+  async bulkCancel(ids: number[]): Promise<{ updated: number }> {
+    return apiService.post<{ updated: number }>(
+      API_CONFIG.ENDPOINTS.ACCOUNTS_PAYABLE_BULK_CANCEL,
+      { ids }
+    );
+  }
+
   /**
    * Adiciona anexo a uma conta
    */
@@ -199,6 +258,16 @@ class PayablesService {
     );
   }
 
+  /**
+   * Registra vários pagamentos em uma única requisição (tudo ou nada)
+   */
+  async createPaymentsBulk(payments: PayablePaymentCreate[]): Promise<BulkPaymentResponse> {
+    return apiService.post<BulkPaymentResponse>(
+      API_CONFIG.ENDPOINTS.PAYABLE_PAYMENTS_BULK,
+      { payments }
+    );
+  }
+
   /**
    * Remove um pagamento (recalcula total pago)
    */
@@ -208,6 +277,38 @@ class PayablesService {
     );
   }
 
+  // ====================================
+  // IMPORTAÇÃO DE PLANILHAS
+  // ====================================
+
+  /**
+   * Envia uma planilha para importação em segundo plano
+   * Retorna o job imediatamente; use getImportJob para acompanhar o progresso
+   */
+  async createImportJob(file: File): Promise<ImportJob> {
+    const formData = new FormData();
+    formData.append('file', file);
+
+    return apiService.post<ImportJob>(
+      API_CONFIG.ENDPOINTS.IMPORT_JOBS,
+      formData,
+      {
+        headers: {
+          'Content-Type': 'multipart/form-data',
+        },
+      }
+    );
+  }
+
+  /**
+   * Busca o progresso/resultado de uma importação
+   */
+  async getImportJob(id: number): Promise<ImportJob> {
+    return apiService.get<ImportJob>(
+      API_CONFIG.ENDPOINTS.IMPORT_JOB_DETAIL(id)
+    );
+  }
+
   // ====================================
   // HELPERS PRIVADOS
   // ====================================
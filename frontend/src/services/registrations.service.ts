@@ -14,12 +14,23 @@ import type {
   PaymentMethodCreate,
   PaymentMethodDropdown,
   PaginatedResponse,
+  RegistrationsBootstrap,
 } from '../types/payables';
 
 /**
  * Serviço de Cadastros (Registrations)
  */
 class RegistrationsService {
+  /**
+   * Lista filiais, fornecedores, categorias e formas de pagamento
+   * ativas em uma única requisição (revalidada via ETag)
+   */
+  async getBootstrap(): Promise<RegistrationsBootstrap> {
+    return apiService.get<RegistrationsBootstrap>(
+      API_CONFIG.ENDPOINTS.REGISTRATIONS_BOOTSTRAP
+    );
+  }
+
   // ====================================
   // FILIAIS
   // ====================================
@@ -46,6 +57,19 @@ class RegistrationsService {
     );
   }
 
+  /**
+   * Autocomplete de filiais (prefixo, trecho e busca aproximada)
+   */
+  async autocompleteFilials(params?: {
+    search?: string;
+    limit?: number;
+  }): Promise<{ results: FilialDropdown[] }> {
+    return apiService.get<{ results: FilialDropdown[] }>(
+      API_CONFIG.ENDPOINTS.FILIALS_AUTOCOMPLETE,
+      { params: { search: params?.search, limit: params?.limit } }
+    );
+  }
+
   /**
    * Busca uma filial por ID
    */
@@ -120,6 +144,19 @@ class RegistrationsService {
     );
   }
 
+  /**
+   * Autocomplete de fornecedores (prefixo, trecho e busca aproximada)
+   */
+  async autocompleteSuppliers(params?: {
+    search?: string;
+    limit?: number;
+  }): Promise<{ results: SupplierDropdown[] }> {
+    return apiService.get<{ results: SupplierDropdown[] }>(
+      API_CONFIG.ENDPOINTS.SUPPLIERS_AUTOCOMPLETE,
+      { params: { search: params?.search, limit: params?.limit } }
+    );
+  }
+
   /**
    * Busca um fornecedor por ID
    */
@@ -194,6 +231,19 @@ class RegistrationsService {
     );
   }
 
+  /**
+   * Autocomplete de categorias (prefixo, trecho e busca aproximada)
+   */
+  async autocompleteCategories(params?: {
+    search?: string;
+    limit?: number;
+  }): Promise<{ results: CategoryDropdown[] }> {
+    return apiService.get<{ results: CategoryDropdown[] }>(
+      API_CONFIG.ENDPOINTS.CATEGORIES_AUTOCOMPLETE,
+      { params: { search: params?.search, limit: params?.limit } }
+    );
+  }
+
   /**
    * Busca uma categoria por ID
    */
@@ -268,6 +318,19 @@ class RegistrationsService {
     );
   }
 
+  /**
+   * Autocomplete de formas de pagamento (prefixo, trecho e busca aproximada)
+   */
+  async autocompletePaymentMethods(params?: {
+    search?: string;
+    limit?: number;
+  }): Promise<{ results: PaymentMethodDropdown[] }> {
+    return apiService.get<{ results: PaymentMethodDropdown[] }>(
+      API_CONFIG.ENDPOINTS.PAYMENT_METHODS_AUTOCOMPLETE,
+      { params: { search: params?.search, limit: params?.limit } }
+    );
+  }
+
   /**
    * Busca uma forma de pagamento por ID
    */
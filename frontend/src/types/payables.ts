@@ -100,6 +100,15 @@ export interface PaymentMethodDropdown {
   name: string;
 }
 
+/** Todos os cadastros ativos em uma única resposta (GET /registrations/bootstrap/) */
+export interface RegistrationsBootstrap {
+  filials: FilialDropdown[];
+  suppliers: SupplierDropdown[];
+  categories: CategoryDropdown[];
+  payment_methods: PaymentMethodDropdown[];
+  version: string;
+}
+
 export interface PaymentMethodCreate {
   name: string;
   description?: string;
@@ -237,6 +246,36 @@ export interface PayablePaymentCreate {
   notes?: string;
 }
 
+export interface BulkPaymentResponse {
+  created: number;
+  payments: number[];
+  accounts: Array<{ id: number; paid_amount: string; status: AccountPayableStatus }>;
+}
+
+// ========================================
+// IMPORTAÇÃO EM SEGUNDO PLANO
+// ========================================
+
+export type ImportJobStatus = 'pending' | 'processing' | 'completed' | 'failed';
+
+export interface ImportJob {
+  id: number;
+  original_filename: string;
+  status: ImportJobStatus;
+  status_display: string;
+  total_rows: number;
+  processed_rows: number;
+  success_count: number;
+  percent: number;
+  is_finished: boolean;
+  errors: string[];
+  warnings: string[];
+  created_records: Record<string, string[]>;
+  started_at: string | null;
+  finished_at: string | null;
+  created_at: string;
+}
+
 // ========================================
 // DASHBOARD & STATISTICS
 // ========================================
@@ -248,6 +287,25 @@ export interface TopSupplier {
   total_amount: string;
 }
 
+/** Vencimentos (due_*) e pagamentos (paid_*) de um dia do período, agregados no backend */
+export interface DashboardDailyBucket {
+  date: string;
+  due_count: number;
+  due_amount: string;
+  paid_count: number;
+  paid_amount: string;
+}
+
+/** Mesmos totais consolidados por semana (segunda a domingo) */
+export interface DashboardWeeklyBucket {
+  week_start: string;
+  week_end: string;
+  due_count: number;
+  due_amount: string;
+  paid_count: number;
+  paid_amount: string;
+}
+
 export interface DashboardStats {
   total_pending: number;
   total_overdue: number;
@@ -258,6 +316,37 @@ export interface DashboardStats {
   due_next_7_days: number;
   amount_due_next_7_days: string;
   top_suppliers: TopSupplier[];
+  period: { start: string; end: string };
+  daily: DashboardDailyBucket[];
+  weekly: DashboardWeeklyBucket[];
+}
+
+export type CashFlowGranularity = 'day' | 'week' | 'month';
+
+export interface CashFlowBucket {
+  start: string;
+  end: string;
+  scheduled_count: number;
+  scheduled_amount: string;
+  recurring_count: number;
+  recurring_amount: string;
+  total_amount: string;
+}
+
+/** Projeção de saídas (contas em aberto + recorrências ainda não geradas) */
+export interface CashFlow {
+  granularity: CashFlowGranularity;
+  start: string;
+  end: string;
+  overdue: { count: number; amount: string };
+  total_amount: string;
+  buckets: CashFlowBucket[];
+}
+
+export interface CashFlowParams extends AccountPayableFilters {
+  granularity?: CashFlowGranularity;
+  start?: string;
+  months?: number;
 }
 
 // ========================================
@@ -293,6 +382,10 @@ export interface AccountPayableFilters {
   original_amount__lte?: string | number;
   paid_amount__gte?: string | number;
   paid_amount__lte?: string | number;
+  final_amount__gte?: string | number;
+  final_amount__lte?: string | number;
+  remaining_amount__gte?: string | number;
+  remaining_amount__lte?: string | number;
   is_recurring?: boolean;
   recurrence_frequency?: RecurrenceFrequency;
   is_overdue?: boolean;
@@ -309,6 +402,13 @@ export interface PaginatedResponse<T> {
   results: T[];
 }
 
+/** Resposta da paginação por cursor (?cursor=); count só com ?count=exact|estimate */
+export interface CursorPaginatedResponse<T> {
+  next: string | null;
+  count?: number;
+  results: T[];
+}
+
 // ========================================
 // API RESPONSES
 // ========================================